@@ -1,12 +1,23 @@
 from __future__ import unicode_literals
 
+from django.db.models.signals import (
+    m2m_changed, post_delete, post_save, pre_delete
+)
 from django.utils.translation import ugettext_lazy as _
 
 from common import MayanAppConfig, menu_object, menu_sidebar
+from mayan.celery import app
 from navigation import SourceColumn
+from permissions.handlers import handler_invalidate_permission_snapshots
 from rest_api.classes import APIEndPoint
 
+from .handlers import (
+    handler_access_control_list_delete,
+    handler_access_control_list_permissions_change,
+    handler_access_control_list_pre_delete
+)
 from .links import link_acl_create, link_acl_delete, link_acl_permissions
+from .queues import *  # NOQA
 
 
 class ACLsApp(MayanAppConfig):
@@ -21,6 +32,17 @@ class ACLsApp(MayanAppConfig):
 
         AccessControlList = self.get_model('AccessControlList')
 
+        app.conf.CELERY_ROUTES.update(
+            {
+                'acls.tasks.task_update_access_control_list_visibility': {
+                    'queue': 'tools'
+                },
+                'acls.tasks.task_update_object_visibility': {
+                    'queue': 'tools'
+                },
+            }
+        )
+
         SourceColumn(
             source=AccessControlList, label=_('Permissions'),
             attribute='get_permission_titles'
@@ -36,3 +58,34 @@ class ACLsApp(MayanAppConfig):
         menu_sidebar.bind_links(
             links=(link_acl_create,), sources=('acls:acl_list',)
         )
+
+        m2m_changed.connect(
+            handler_access_control_list_permissions_change,
+            dispatch_uid='acls_handler_access_control_list_permissions_change',
+            sender=AccessControlList.permissions.through
+        )
+        m2m_changed.connect(
+            handler_invalidate_permission_snapshots,
+            dispatch_uid='acls_handler_invalidate_permission_snapshots_permissions',
+            sender=AccessControlList.permissions.through
+        )
+        post_delete.connect(
+            handler_access_control_list_delete,
+            dispatch_uid='acls_handler_access_control_list_delete',
+            sender=AccessControlList
+        )
+        post_delete.connect(
+            handler_invalidate_permission_snapshots,
+            dispatch_uid='acls_handler_invalidate_permission_snapshots_delete',
+            sender=AccessControlList
+        )
+        post_save.connect(
+            handler_invalidate_permission_snapshots,
+            dispatch_uid='acls_handler_invalidate_permission_snapshots_save',
+            sender=AccessControlList
+        )
+        pre_delete.connect(
+            handler_access_control_list_pre_delete,
+            dispatch_uid='acls_handler_access_control_list_pre_delete',
+            sender=AccessControlList
+        )
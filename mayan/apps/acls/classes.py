@@ -11,6 +11,8 @@ class ModelPermission(object):
     _registry = {}
     _proxies = {}
     _inheritances = {}
+    _inheritance_queries = {}
+    _visibility_models = []
 
     @classmethod
     def register(cls, model, permissions):
@@ -76,9 +78,52 @@ class ModelPermission(object):
         cls._proxies[model] = source
 
     @classmethod
-    def register_inheritance(cls, model, related):
+    def register_inheritance(cls, model, related, query=None):
+        """
+        Make the instances of model inherit the access granted to the
+        object returned by the related accessor. Accessors that are not a
+        path of fields, like methods, need a query function. It receives
+        the queryset of the access control lists granting the permission
+        to the roles of the user and returns the Q object matching the
+        instances of model that inherit the access.
+        """
         cls._inheritances[model] = related
+        if query:
+            cls._inheritance_queries[model] = query
 
     @classmethod
     def get_inheritance(cls, model):
         return cls._inheritances[model]
+
+    @classmethod
+    def get_inheritance_query(cls, model):
+        return cls._inheritance_queries.get(model)
+
+    @classmethod
+    def get_visibility_models(cls):
+        return cls._visibility_models
+
+    @classmethod
+    def register_visibility(cls, model):
+        """
+        Precompute the access of each role to the instances of model in
+        the visibility table, when enabled.
+        """
+        from django.db.models.signals import post_delete, post_save
+
+        from .handlers import handler_delete_visibility, handler_update_visibility
+
+        cls._visibility_models.append(model)
+
+        post_delete.connect(
+            handler_delete_visibility,
+            dispatch_uid='acls_handler_delete_visibility_{}'.format(
+                model._meta.label_lower
+            ), sender=model
+        )
+        post_save.connect(
+            handler_update_visibility,
+            dispatch_uid='acls_handler_update_visibility_{}'.format(
+                model._meta.label_lower
+            ), sender=model
+        )
@@ -0,0 +1,90 @@
+from __future__ import unicode_literals
+
+from django.apps import apps
+from django.contrib.contenttypes.models import ContentType
+
+from .settings import setting_visibility_table
+from .tasks import (
+    task_update_access_control_list_visibility, task_update_object_visibility
+)
+
+
+def _queue_access_control_list_visibility(access_control_list, stored_permission_ids):
+    for stored_permission_id in stored_permission_ids:
+        task_update_access_control_list_visibility.apply_async(
+            kwargs=dict(
+                content_type_id=access_control_list.content_type_id,
+                object_id=access_control_list.object_id,
+                role_id=access_control_list.role_id,
+                stored_permission_id=stored_permission_id
+            )
+        )
+
+
+def handler_access_control_list_delete(sender, instance, **kwargs):
+    if setting_visibility_table.value:
+        _queue_access_control_list_visibility(
+            access_control_list=instance,
+            stored_permission_ids=getattr(instance, '_visibility_pk_set', ())
+        )
+
+
+def handler_access_control_list_permissions_change(sender, instance, action, reverse, pk_set, **kwargs):
+    AccessControlList = apps.get_model(
+        app_label='acls', model_name='AccessControlList'
+    )
+
+    if not setting_visibility_table.value:
+        return
+
+    if action == 'pre_clear':
+        # The cleared relations are not known after the clear
+        if reverse:
+            instance._visibility_pk_set = list(
+                instance.acls.values_list('pk', flat=True)
+            )
+        else:
+            instance._visibility_pk_set = list(
+                instance.permissions.values_list('pk', flat=True)
+            )
+        return
+    elif action == 'post_clear':
+        pk_set = getattr(instance, '_visibility_pk_set', ())
+    elif action not in ('post_add', 'post_remove'):
+        return
+
+    if reverse:
+        for access_control_list in AccessControlList.objects.filter(pk__in=pk_set):
+            _queue_access_control_list_visibility(
+                access_control_list=access_control_list,
+                stored_permission_ids=(instance.pk,)
+            )
+    else:
+        _queue_access_control_list_visibility(
+            access_control_list=instance, stored_permission_ids=pk_set
+        )
+
+
+def handler_access_control_list_pre_delete(sender, instance, **kwargs):
+    if setting_visibility_table.value:
+        # The permissions are deleted along with the access control list
+        instance._visibility_pk_set = list(
+            instance.permissions.values_list('pk', flat=True)
+        )
+
+
+def handler_delete_visibility(sender, instance, **kwargs):
+    Visibility = apps.get_model(app_label='acls', model_name='Visibility')
+
+    if setting_visibility_table.value:
+        Visibility.objects.delete_for_object(obj=instance)
+
+
+def handler_update_visibility(sender, instance, **kwargs):
+    if setting_visibility_table.value:
+        task_update_object_visibility.apply_async(
+            kwargs=dict(
+                content_type_id=ContentType.objects.get_for_model(instance).pk,
+                object_id=instance.pk
+            )
+        )
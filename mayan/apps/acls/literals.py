@@ -0,0 +1,4 @@
+from __future__ import unicode_literals
+
+VISIBILITY_BATCH_SIZE = 1000
+VISIBILITY_UPDATE_RETRY_DELAY = 5
@@ -0,0 +1,229 @@
+from __future__ import division, unicode_literals
+
+import random
+import time
+
+from django.contrib.auth import get_user_model
+from django.contrib.auth.models import Group
+from django.contrib.contenttypes.models import ContentType
+from django.core import management
+from django.db import connection, transaction
+from django.test.utils import CaptureQueriesContext
+
+from documents.models import (
+    Document, DocumentPage, DocumentType, DocumentVersion
+)
+from documents.permissions import permission_document_view
+from permissions.models import Role
+
+from ...models import AccessControlList
+
+BENCHMARK_PREFIX = 'aclbenchmark'
+
+
+class Command(management.BaseCommand):
+    help = (
+        'Measure the filtering of documents, versions and pages by access '
+        'for a user without global permissions. The benchmark data is '
+        'created in a transaction that is rolled back at the end.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size', action='store', default=10000, dest='batch_size',
+            help='Number of rows inserted per query.', type=int
+        )
+        parser.add_argument(
+            '--document-acls', action='store', default=10,
+            dest='document_acls',
+            help='Number of document access control lists per role.',
+            type=int
+        )
+        parser.add_argument(
+            '--document-types', action='store', default=100,
+            dest='document_types', help='Number of document types.', type=int
+        )
+        parser.add_argument(
+            '--documents', action='store', default=1000000, dest='documents',
+            help='Number of documents, each with one version and one page.',
+            type=int
+        )
+        parser.add_argument(
+            '--repeat', action='store', default=3, dest='repeat',
+            help='Number of times each measurement is repeated.', type=int
+        )
+        parser.add_argument(
+            '--roles', action='store', default=10000, dest='roles',
+            help='Number of roles.', type=int
+        )
+        parser.add_argument(
+            '--seed', action='store', default=0, dest='seed',
+            help='Seed of the random assignment of access.', type=int
+        )
+        parser.add_argument(
+            '--user-roles', action='store', default=10, dest='user_roles',
+            help='Number of roles of the benchmark user.', type=int
+        )
+
+    def handle(self, *args, **options):
+        self.batch_size = options['batch_size']
+        self.random = random.Random(options['seed'])
+
+        with transaction.atomic():
+            user = self.create_data(options=options)
+
+            for label, queryset in (
+                ('documents', Document.objects.all()),
+                ('document versions', DocumentVersion.objects.all()),
+                ('document pages', DocumentPage.objects.all()),
+            ):
+                self.measure(
+                    label=label, queryset=queryset, repeat=options['repeat'],
+                    user=user
+                )
+
+            transaction.set_rollback(True)
+
+    def bulk_create(self, model, objects):
+        batch = []
+        for instance in objects:
+            batch.append(instance)
+            if len(batch) == self.batch_size:
+                model.objects.bulk_create(batch)
+                batch = []
+
+        if batch:
+            model.objects.bulk_create(batch)
+
+    def create_data(self, options):
+        self.stdout.write('Creating document types and documents')
+        self.bulk_create(
+            model=DocumentType, objects=(
+                DocumentType(
+                    label='{} {}'.format(BENCHMARK_PREFIX, number)
+                ) for number in range(options['document_types'])
+            )
+        )
+        document_type_ids = list(
+            DocumentType.objects.filter(
+                label__startswith=BENCHMARK_PREFIX
+            ).values_list('pk', flat=True)
+        )
+
+        self.bulk_create(
+            model=Document, objects=(
+                Document(
+                    document_type_id=document_type_ids[
+                        number % len(document_type_ids)
+                    ], label='{} {}'.format(BENCHMARK_PREFIX, number)
+                ) for number in range(options['documents'])
+            )
+        )
+        document_ids = list(
+            Document.passthrough.filter(
+                document_type_id__in=document_type_ids
+            ).values_list('pk', flat=True)
+        )
+
+        self.stdout.write('Creating document versions and pages')
+        self.bulk_create(
+            model=DocumentVersion, objects=(
+                DocumentVersion(document_id=document_id)
+                for document_id in document_ids
+            )
+        )
+        self.bulk_create(
+            model=DocumentPage, objects=(
+                DocumentPage(document_version_id=document_version_id)
+                for document_version_id in DocumentVersion.objects.filter(
+                    document_id__in=Document.passthrough.filter(
+                        document_type_id__in=document_type_ids
+                    ).values('pk')
+                ).values_list('pk', flat=True).iterator()
+            )
+        )
+
+        self.stdout.write('Creating roles and access control lists')
+        self.bulk_create(
+            model=Role, objects=(
+                Role(label='{} {}'.format(BENCHMARK_PREFIX, number))
+                for number in range(options['roles'])
+            )
+        )
+        role_ids = list(
+            Role.objects.filter(
+                label__startswith=BENCHMARK_PREFIX
+            ).values_list('pk', flat=True)
+        )
+
+        document_content_type = ContentType.objects.get_for_model(Document)
+        document_type_content_type = ContentType.objects.get_for_model(
+            DocumentType
+        )
+
+        def get_access_control_lists():
+            for role_id in role_ids:
+                yield AccessControlList(
+                    content_type=document_type_content_type,
+                    object_id=self.random.choice(document_type_ids),
+                    role_id=role_id
+                )
+                sample = self.random.sample(
+                    document_ids, min(options['document_acls'], len(document_ids))
+                )
+                for document_id in sample:
+                    yield AccessControlList(
+                        content_type=document_content_type,
+                        object_id=document_id, role_id=role_id
+                    )
+
+        self.bulk_create(
+            model=AccessControlList, objects=get_access_control_lists()
+        )
+
+        AccessControlListPermission = AccessControlList.permissions.through
+        self.bulk_create(
+            model=AccessControlListPermission, objects=(
+                AccessControlListPermission(
+                    accesscontrollist_id=access_control_list_id,
+                    storedpermission_id=permission_document_view.stored_permission.pk
+                ) for access_control_list_id in AccessControlList.objects.filter(
+                    role_id__in=role_ids
+                ).values_list('pk', flat=True).iterator()
+            )
+        )
+
+        user = get_user_model().objects.create(
+            username='{}_user'.format(BENCHMARK_PREFIX)
+        )
+        group = Group.objects.create(name='{}_group'.format(BENCHMARK_PREFIX))
+        group.user_set.add(user)
+        user_role_ids = self.random.sample(
+            role_ids, min(options['user_roles'], len(role_ids))
+        )
+        for role in Role.objects.filter(pk__in=user_role_ids):
+            role.groups.add(group)
+
+        return user
+
+    def measure(self, label, queryset, repeat, user):
+        timings = []
+
+        for iteration in range(repeat):
+            start_time = time.time()
+            with CaptureQueriesContext(connection) as context:
+                queryset_filtered = AccessControlList.objects.filter_by_access(
+                    permission=permission_document_view, user=user,
+                    queryset=queryset
+                )
+                count = queryset_filtered.count()
+                list(queryset_filtered[:20])
+
+            timings.append(time.time() - start_time)
+
+        self.stdout.write(
+            '{}: {} results; {} queries; best {:.3f} s; mean {:.3f} s'.format(
+                label, count, len(context), min(timings),
+                sum(timings) / len(timings)
+            )
+        )
@@ -0,0 +1,18 @@
+from __future__ import unicode_literals
+
+from django.core import management
+
+from ...models import Visibility
+
+
+class Command(management.BaseCommand):
+    help = (
+        'Recalculate the table of the objects each role can access, used '
+        'when the ACLS_VISIBILITY_TABLE setting is enabled.'
+    )
+
+    def handle(self, *args, **options):
+        Visibility.objects.rebuild()
+        self.stdout.write(
+            'Visibility entries: {}'.format(Visibility.objects.count())
+        )
@@ -2,18 +2,25 @@ from __future__ import absolute_import, unicode_literals
 
 import logging
 
+from django.apps import apps
+from django.contrib.contenttypes.fields import GenericForeignKey
 from django.contrib.contenttypes.models import ContentType
-from django.core.exceptions import PermissionDenied
-from django.db import models
+from django.core.exceptions import (
+    FieldDoesNotExist, ImproperlyConfigured, PermissionDenied
+)
+from django.db import models, transaction
 from django.db.models import Q
+from django.db.models.constants import LOOKUP_SEP
 from django.utils.translation import ugettext, ugettext_lazy as _
 
 from common.utils import return_attrib
-from permissions import Permission
+from permissions import Permission, PermissionSnapshot
 from permissions.models import StoredPermission
 
 from .exceptions import PermissionNotValidForClass
 from .classes import ModelPermission
+from .literals import VISIBILITY_BATCH_SIZE
+from .settings import setting_visibility_table
 
 logger = logging.getLogger(__name__)
 
@@ -58,27 +65,26 @@ class AccessControlListManager(models.Manager):
             except KeyError:
                 pass
             else:
-                try:
-                    return self.check_access(
-                        obj=getattr(obj, parent_accessor),
-                        permissions=permissions, user=user
-                    )
-                except PermissionDenied:
-                    pass
-
-            user_roles = []
-            for group in user.groups.all():
-                for role in group.roles.all():
-                    if set(stored_permissions).intersection(set(self.get_inherited_permissions(role=role, obj=obj))):
-                        logger.debug(
-                            'Permissions "%s" on "%s" granted to user "%s" through role "%s" via inherited ACL',
-                            permissions, obj, user, role
+                # Resolve callable accessors too, the access to the parent
+                # includes its own inherited access.
+                parent_object = return_attrib(
+                    obj, parent_accessor.replace(LOOKUP_SEP, '.')
+                )
+                if parent_object != obj:
+                    try:
+                        return self.check_access(
+                            obj=parent_object, permissions=permissions,
+                            user=user
                         )
-                        return True
+                    except PermissionDenied:
+                        pass
 
-                    user_roles.append(role)
+            snapshot = PermissionSnapshot.get_for_user(user=user)
+            stored_permission_ids = set(
+                stored_permission.pk for stored_permission in stored_permissions
+            )
 
-            if not self.filter(content_type=ContentType.objects.get_for_model(obj), object_id=obj.pk, permissions__in=stored_permissions, role__in=user_roles).exists():
+            if not stored_permission_ids.intersection(self._get_acl_permission_ids(obj=obj, snapshot=snapshot)):
                 logger.debug(
                     'Permissions "%s" on "%s" denied for user "%s"',
                     permissions, obj, user
@@ -87,8 +93,29 @@ class AccessControlListManager(models.Manager):
 
             logger.debug(
                 'Permissions "%s" on "%s" granted to user "%s" through roles "%s" by direct ACL',
-                permissions, obj, user, user_roles
+                permissions, obj, user, snapshot.role_ids
+            )
+
+    def _get_acl_permission_ids(self, obj, snapshot):
+        """
+        Return the primary keys of the permissions granted by access control
+        lists to the roles of a permission snapshot for an object. The result
+        is kept in the snapshot.
+        """
+        content_type = ContentType.objects.get_for_model(obj)
+        key = (content_type.pk, obj.pk)
+
+        try:
+            return snapshot.acl_permission_ids[key]
+        except KeyError:
+            result = frozenset(
+                self.filter(
+                    content_type=content_type, object_id=obj.pk,
+                    permissions__isnull=False, role__in=snapshot.role_ids
+                ).values_list('permissions', flat=True)
             )
+            snapshot.acl_permission_ids[key] = result
+            return result
 
     def filter_by_access(self, permission, user, queryset):
         if user.is_superuser or user.is_staff:
@@ -101,73 +128,127 @@ class AccessControlListManager(models.Manager):
                 requester=user, permissions=(permission,)
             )
         except PermissionDenied:
-            user_roles = []
-            for group in user.groups.all():
-                for role in group.roles.all():
-                    user_roles.append(role)
+            user_roles = PermissionSnapshot.get_for_user(user=user).role_ids
+
+            logger.debug(
+                'Filtered queryset returned to user "%s" based on roles "%s"',
+                user, user_roles
+            )
+
+            return queryset.filter(
+                self.get_acl_query(
+                    model=queryset.model, permission=permission,
+                    roles=user_roles
+                )
+            )
+        else:
+            return queryset
+
+    def get_acl_query(self, model, permission, roles, use_visibility=True):
+        """
+        Return a Q object matching the instances of model to which the
+        roles have access, directly or inherited from their related
+        objects, as database subqueries. The precomputed visibility of the
+        models that have it is used when enabled.
+        """
+        if use_visibility and setting_visibility_table.value and model in ModelPermission.get_visibility_models():
+            Visibility = apps.get_model(
+                app_label='acls', model_name='Visibility'
+            )
+
+            return Q(
+                pk__in=Visibility.objects.filter(
+                    content_type=ContentType.objects.get_for_model(model),
+                    permission=permission.stored_permission, role__in=roles
+                ).values('object_id')
+            )
+
+        acl_queryset = self.filter(
+            permissions=permission.stored_permission, role__in=roles
+        )
+
+        # Directly granted access
+        query = Q(
+            pk__in=acl_queryset.filter(
+                content_type=ContentType.objects.get_for_model(model)
+            ).values('object_id')
+        )
 
+        try:
+            parent_accessor = ModelPermission.get_inheritance(model=model)
+        except KeyError:
+            return query
+
+        inheritance_query = ModelPermission.get_inheritance_query(model=model)
+        if inheritance_query:
+            return query | inheritance_query(acl_queryset=acl_queryset)
+
+        return query | self._get_inherited_acl_query(
+            model=model, parent_accessor=parent_accessor,
+            permission=permission, roles=roles, use_visibility=use_visibility
+        )
+
+    def _get_inherited_acl_query(self, model, parent_accessor, permission, roles, use_visibility):
+        lookup_parts = parent_accessor.replace('.', LOOKUP_SEP).split(
+            LOOKUP_SEP
+        )
+        multiple = False
+        related_model = model
+
+        for index, lookup_part in enumerate(lookup_parts):
             try:
-                parent_accessor = ModelPermission.get_inheritance(
-                    model=queryset.model
+                field = related_model._meta.get_field(lookup_part)
+            except FieldDoesNotExist:
+                field = None
+
+            if not field or not field.is_relation:
+                raise ImproperlyConfigured(
+                    'Inherited access of model "{}" from "{}" needs a '
+                    'query function.'.format(
+                        model._meta.label, parent_accessor
+                    )
                 )
-            except KeyError:
-                parent_acl_query = Q()
-            else:
-                instance = queryset.first()
-                if instance:
-                    parent_object = getattr(instance, parent_accessor)
 
-                    try:
-                        # Try to see if parent_object is a function
-                        parent_object()
-                    except TypeError:
-                        # Is not a function, try it as a field
-                        parent_content_type = ContentType.objects.get_for_model(
-                            parent_object
-                        )
-                        parent_queryset = self.filter(
-                            content_type=parent_content_type, role__in=user_roles,
-                            permissions=permission.stored_permission
-                        )
-                        parent_acl_query = Q(
-                            **{
-                                '{}__pk__in'.format(
-                                    parent_accessor
-                                ): parent_queryset.values_list(
-                                    'object_id', flat=True
+            if isinstance(field, GenericForeignKey):
+                # The parents can be of any model, match each of the models
+                # that can have access control lists.
+                prefix = LOOKUP_SEP.join(lookup_parts[:index] + [''])
+                query = Q(pk__in=[])
+                for parent_model in ModelPermission.get_classes():
+                    query |= Q(
+                        **{
+                            '{}{}'.format(prefix, field.ct_field): ContentType.objects.get_for_model(parent_model),
+                            '{}{}__in'.format(prefix, field.fk_field): parent_model._base_manager.filter(
+                                self.get_acl_query(
+                                    model=parent_model, permission=permission,
+                                    roles=roles, use_visibility=use_visibility
                                 )
-                            }
+                            ).values('pk')
+                        }
+                    )
+                break
+
+            if field.many_to_many or field.one_to_many:
+                multiple = True
+
+            related_model = field.related_model
+        else:
+            query = Q(
+                **{
+                    '{}__in'.format(LOOKUP_SEP.join(lookup_parts)): related_model._base_manager.filter(
+                        self.get_acl_query(
+                            model=related_model, permission=permission,
+                            roles=roles, use_visibility=use_visibility
                         )
-                    else:
-                        # Is a function. Can't perform Q object filtering.
-                        # Perform iterative filtering.
-                        result = []
-                        for entry in queryset:
-                            try:
-                                self.check_access(permissions=permission, user=user, obj=entry)
-                            except PermissionDenied:
-                                pass
-                            else:
-                                result.append(entry.pk)
-
-                        return queryset.filter(pk__in=result)
-                else:
-                    parent_acl_query = Q()
-
-            # Directly granted access
-            content_type = ContentType.objects.get_for_model(queryset.model)
-            acl_query = Q(pk__in=self.filter(
-                content_type=content_type, role__in=user_roles,
-                permissions=permission.stored_permission
-            ).values_list('object_id', flat=True))
-            logger.debug(
-                'Filtered queryset returned to user "%s" based on roles "%s"',
-                user, user_roles
+                    ).values('pk')
+                }
             )
 
-            return queryset.filter(parent_acl_query | acl_query)
+        if multiple:
+            # Avoid repeating the rows with more than one related object
+            return Q(pk__in=model._base_manager.filter(query).values('pk'))
         else:
-            return queryset
+            return query
 
     def get_inherited_permissions(self, role, obj):
         try:
@@ -183,7 +264,9 @@ class AccessControlListManager(models.Manager):
         except KeyError:
             return StoredPermission.objects.none()
         else:
-            parent_object = return_attrib(instance, parent_accessor)
+            parent_object = return_attrib(
+                instance, parent_accessor.replace(LOOKUP_SEP, '.')
+            )
             content_type = ContentType.objects.get_for_model(parent_object)
             try:
                 return self.get(
@@ -217,3 +300,202 @@ class AccessControlListManager(models.Manager):
 
         if acl.permissions.count() == 0:
             acl.delete()
+
+
+class VisibilityManager(models.Manager):
+    def _bulk_insert(self, content_type, object_ids, role_id, stored_permission_id):
+        batch = []
+        for object_id in object_ids:
+            batch.append(
+                self.model(
+                    content_type=content_type, object_id=object_id,
+                    permission_id=stored_permission_id, role_id=role_id
+                )
+            )
+            if len(batch) == VISIBILITY_BATCH_SIZE:
+                self.bulk_create(batch)
+                batch = []
+
+        if batch:
+            self.bulk_create(batch)
+
+    def _get_inheritance_lookups(self, model):
+        """
+        Return the lookups from model to each of the models it inherits
+        access from. Only accessors that are paths of relation fields are
+        followed.
+        """
+        result = {}
+        lookup_parts = []
+
+        while True:
+            try:
+                parent_accessor = ModelPermission.get_inheritance(model=model)
+            except KeyError:
+                break
+
+            accessor_parts = parent_accessor.replace('.', LOOKUP_SEP).split(
+                LOOKUP_SEP
+            )
+            for accessor_part in accessor_parts:
+                try:
+                    field = model._meta.get_field(accessor_part)
+                except FieldDoesNotExist:
+                    return result
+
+                if not field.is_relation or isinstance(field, GenericForeignKey):
+                    return result
+
+                model = field.related_model
+
+            if model in result:
+                # Inheritance cycle
+                break
+
+            lookup_parts.extend(accessor_parts)
+            result[model] = LOOKUP_SEP.join(lookup_parts)
+
+        return result
+
+    def _update(self, model, queryset, role_id, stored_permission):
+        AccessControlList = apps.get_model(
+            app_label='acls', model_name='AccessControlList'
+        )
+
+        content_type = ContentType.objects.get_for_model(model)
+
+        with transaction.atomic():
+            self.filter(
+                content_type=content_type,
+                object_id__in=queryset.values('pk'),
+                permission=stored_permission, role_id=role_id
+            ).delete()
+
+            self._bulk_insert(
+                content_type=content_type, object_ids=queryset.filter(
+                    AccessControlList.objects.get_acl_query(
+                        model=model,
+                        permission=stored_permission.volatile_permission,
+                        roles=(role_id,), use_visibility=False
+                    )
+                ).values_list('pk', flat=True).iterator(), role_id=role_id,
+                stored_permission_id=stored_permission.pk
+            )
+
+    def delete_for_object(self, obj):
+        self.filter(
+            content_type=ContentType.objects.get_for_model(obj),
+            object_id=obj.pk
+        ).delete()
+
+    def rebuild(self):
+        """
+        Recalculate the visibility of all the instances of the models with
+        visibility.
+        """
+        AccessControlList = apps.get_model(
+            app_label='acls', model_name='AccessControlList'
+        )
+
+        role_permission_ids = AccessControlList.objects.filter(
+            permissions__isnull=False
+        ).values_list('role_id', 'permissions').distinct()
+
+        self.all().delete()
+
+        for model in ModelPermission.get_visibility_models():
+            stored_permissions = dict(
+                (permission.stored_permission.pk, permission.stored_permission)
+                for permission in ModelPermission.get_for_class(klass=model)
+            )
+
+            for role_id, stored_permission_id in role_permission_ids:
+                if stored_permission_id in stored_permissions:
+                    self._update(
+                        model=model, queryset=model._base_manager.all(),
+                        role_id=role_id,
+                        stored_permission=stored_permissions[
+                            stored_permission_id
+                        ]
+                    )
+
+    def update_for_access_control_list(self, obj, role_id, stored_permission):
+        """
+        Recalculate the visibility of the instances that can inherit the
+        access granted to a role for an object.
+        """
+        if not hasattr(stored_permission, 'volatile_permission'):
+            # Obsolete permission
+            return
+
+        for model in ModelPermission.get_visibility_models():
+            if stored_permission.volatile_permission not in ModelPermission.get_for_class(klass=model):
+                continue
+
+            if isinstance(obj, model):
+                queryset = model._base_manager.filter(pk=obj.pk)
+            else:
+                lookups = self._get_inheritance_lookups(model=model)
+                try:
+                    lookup = lookups[obj._meta.model]
+                except KeyError:
+                    continue
+
+                queryset = model._base_manager.filter(**{lookup: obj.pk})
+
+            self._update(
+                model=model, queryset=queryset, role_id=role_id,
+                stored_permission=stored_permission
+            )
+
+    def update_for_object(self, obj):
+        """
+        Recalculate the visibility of an instance from the access control
+        lists of the instance and of the objects it inherits access from.
+        """
+        AccessControlList = apps.get_model(
+            app_label='acls', model_name='AccessControlList'
+        )
+
+        acl_query = Q()
+        visited = []
+        current_object = obj
+
+        while hasattr(current_object, '_meta') and current_object not in visited:
+            visited.append(current_object)
+            acl_query |= Q(
+                content_type=ContentType.objects.get_for_model(current_object),
+                object_id=current_object.pk
+            )
+
+            try:
+                parent_accessor = ModelPermission.get_inheritance(
+                    model=current_object._meta.model
+                )
+            except KeyError:
+                break
+
+            current_object = return_attrib(
+                current_object, parent_accessor.replace(LOOKUP_SEP, '.')
+            )
+
+        stored_permission_ids = [
+            permission.stored_permission.pk for permission in ModelPermission.get_for_class(klass=type(obj))
+        ]
+
+        role_permission_ids = AccessControlList.objects.filter(
+            acl_query, permissions__in=stored_permission_ids
+        ).values_list('role_id', 'permissions').distinct()
+
+        content_type = ContentType.objects.get_for_model(obj)
+
+        with transaction.atomic():
+            self.filter(content_type=content_type, object_id=obj.pk).delete()
+            self.bulk_create(
+                [
+                    self.model(
+                        content_type=content_type, object_id=obj.pk,
+                        permission_id=stored_permission_id, role_id=role_id
+                    ) for role_id, stored_permission_id in role_permission_ids
+                ]
+            )
@@ -0,0 +1,39 @@
+# -*- coding: utf-8 -*-
+from __future__ import unicode_literals
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('contenttypes', '0002_remove_content_type_name'),
+        ('permissions', '0003_remove_role_name'),
+        ('acls', '0002_auto_20150703_0513'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Visibility',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('object_id', models.PositiveIntegerField()),
+                ('content_type', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='visibilities', to='contenttypes.ContentType')),
+                ('permission', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='visibilities', to='permissions.StoredPermission', verbose_name='Permission')),
+                ('role', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='visibilities', to='permissions.Role', verbose_name='Role')),
+            ],
+            options={
+                'verbose_name': 'Visibility',
+                'verbose_name_plural': 'Visibilities',
+            },
+        ),
+        migrations.AlterUniqueTogether(
+            name='visibility',
+            unique_together=set([('role', 'permission', 'content_type', 'object_id')]),
+        ),
+        migrations.AlterIndexTogether(
+            name='visibility',
+            index_together=set([('content_type', 'object_id')]),
+        ),
+    ]
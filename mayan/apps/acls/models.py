@@ -10,7 +10,7 @@ from django.utils.translation import ugettext_lazy as _
 
 from permissions.models import Role, StoredPermission
 
-from .managers import AccessControlListManager
+from .managers import AccessControlListManager, VisibilityManager
 
 logger = logging.getLogger(__name__)
 
@@ -74,3 +74,41 @@ class AccessControlList(models.Model):
         )
 
         return result or _('None')
+
+
+@python_2_unicode_compatible
+class Visibility(models.Model):
+    """
+    Precomputed access of a role to an object for a permission, granted
+    directly or inherited from a related object. Kept for the models
+    registered with ModelPermission.register_visibility() when the
+    ACLS_VISIBILITY_TABLE setting is enabled.
+    """
+    role = models.ForeignKey(
+        Role, on_delete=models.CASCADE, related_name='visibilities',
+        verbose_name=_('Role')
+    )
+    permission = models.ForeignKey(
+        StoredPermission, on_delete=models.CASCADE,
+        related_name='visibilities', verbose_name=_('Permission')
+    )
+    content_type = models.ForeignKey(
+        ContentType, on_delete=models.CASCADE, related_name='visibilities'
+    )
+    object_id = models.PositiveIntegerField()
+    content_object = GenericForeignKey(
+        ct_field='content_type', fk_field='object_id',
+    )
+
+    objects = VisibilityManager()
+
+    class Meta:
+        index_together = (('content_type', 'object_id'),)
+        unique_together = ('role', 'permission', 'content_type', 'object_id')
+        verbose_name = _('Visibility')
+        verbose_name_plural = _('Visibilities')
+
+    def __str__(self):
+        return '{}: {}, {}'.format(
+            self.role, self.permission, self.content_object
+        )
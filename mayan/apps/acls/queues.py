@@ -0,0 +1,14 @@
+from __future__ import absolute_import, unicode_literals
+
+from django.utils.translation import ugettext_lazy as _
+
+from common.queues import queue_tools
+
+queue_tools.add_task_type(
+    name='acls.tasks.task_update_access_control_list_visibility',
+    label=_('Update the visibility of an access control list')
+)
+queue_tools.add_task_type(
+    name='acls.tasks.task_update_object_visibility',
+    label=_('Update the visibility of an object')
+)
@@ -0,0 +1,16 @@
+from __future__ import unicode_literals
+
+from django.utils.translation import ugettext_lazy as _
+
+from smart_settings import Namespace
+
+namespace = Namespace(name='acls', label=_('ACLs'))
+
+setting_visibility_table = namespace.add_setting(
+    global_name='ACLS_VISIBILITY_TABLE', default=False, help_text=_(
+        'Filter the documents by access using a precomputed table of the '
+        'documents each role can access, including the access inherited '
+        'from document types. Execute the management command '
+        '"rebuildaclvisibility" after enabling it.'
+    )
+)
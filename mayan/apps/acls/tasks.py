@@ -0,0 +1,82 @@
+from __future__ import unicode_literals
+
+import logging
+
+from django.apps import apps
+from django.core.exceptions import ObjectDoesNotExist
+from django.db import IntegrityError, OperationalError
+
+from mayan.celery import app
+
+from .literals import VISIBILITY_UPDATE_RETRY_DELAY
+
+logger = logging.getLogger(__name__)
+
+
+@app.task(bind=True, default_retry_delay=VISIBILITY_UPDATE_RETRY_DELAY, max_retries=None, ignore_result=True)
+def task_update_access_control_list_visibility(self, content_type_id, object_id, role_id, stored_permission_id):
+    ContentType = apps.get_model(
+        app_label='contenttypes', model_name='ContentType'
+    )
+    Role = apps.get_model(app_label='permissions', model_name='Role')
+    StoredPermission = apps.get_model(
+        app_label='permissions', model_name='StoredPermission'
+    )
+    Visibility = apps.get_model(app_label='acls', model_name='Visibility')
+
+    try:
+        content_type = ContentType.objects.get(pk=content_type_id)
+        obj = content_type.get_object_for_this_type(pk=object_id)
+        role = Role.objects.get(pk=role_id)
+        stored_permission = StoredPermission.objects.get(
+            pk=stored_permission_id
+        )
+    except ObjectDoesNotExist as exception:
+        # Deleted before we could execute, the visibility rows were
+        # deleted with it.
+        logger.debug(
+            'Unable to update the visibility of access control list; %s',
+            exception
+        )
+    else:
+        try:
+            Visibility.objects.update_for_access_control_list(
+                obj=obj, role_id=role.pk, stored_permission=stored_permission
+            )
+        except (IntegrityError, OperationalError) as exception:
+            # Another task updated the visibility of the same objects at
+            # the same time, calculate it again from the current access
+            # control lists.
+            logger.debug(
+                'Unable to update the visibility of access control list; '
+                '%s', exception
+            )
+            raise self.retry(exc=exception)
+
+
+@app.task(bind=True, default_retry_delay=VISIBILITY_UPDATE_RETRY_DELAY, max_retries=None, ignore_result=True)
+def task_update_object_visibility(self, content_type_id, object_id):
+    ContentType = apps.get_model(
+        app_label='contenttypes', model_name='ContentType'
+    )
+    Visibility = apps.get_model(app_label='acls', model_name='Visibility')
+
+    content_type = ContentType.objects.get(pk=content_type_id)
+
+    try:
+        obj = content_type.get_object_for_this_type(pk=object_id)
+    except ObjectDoesNotExist:
+        Visibility.objects.filter(
+            content_type=content_type, object_id=object_id
+        ).delete()
+    else:
+        try:
+            Visibility.objects.update_for_object(obj=obj)
+        except (IntegrityError, OperationalError) as exception:
+            # Another task updated the visibility of the object at the
+            # same time, calculate it again from the current access
+            # control lists.
+            logger.debug(
+                'Unable to update the visibility of object; %s', exception
+            )
+            raise self.retry(exc=exception)
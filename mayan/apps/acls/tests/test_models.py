@@ -1,17 +1,22 @@
 from __future__ import absolute_import, unicode_literals
 
+import mock
+
+from django.contrib.contenttypes.models import ContentType
 from django.core.exceptions import PermissionDenied
+from django.db import IntegrityError
 from django.test import override_settings
 
 from common.tests import BaseTestCase
-from documents.models import Document, DocumentType
+from documents.models import Document, DocumentPage, DocumentType
 from documents.permissions import permission_document_view
 from documents.tests import (
     TEST_SMALL_DOCUMENT_PATH, TEST_DOCUMENT_TYPE_LABEL,
     TEST_DOCUMENT_TYPE_2_LABEL
 )
 
-from ..models import AccessControlList
+from ..models import AccessControlList, Visibility
+from ..tasks import task_update_object_visibility
 
 
 @override_settings(OCR_AUTO_OCR=False)
@@ -159,3 +164,135 @@ class PermissionTestCase(BaseTestCase):
         self.assertTrue(self.document_1 in result)
         self.assertTrue(self.document_2 in result)
         self.assertTrue(self.document_3 in result)
+
+    def test_filtering_with_multiple_level_inherited_permissions(self):
+        acl = AccessControlList.objects.create(
+            content_object=self.document_type_1, role=self.role
+        )
+        acl.permissions.add(permission_document_view.stored_permission)
+
+        result = AccessControlList.objects.filter_by_access(
+            permission=permission_document_view, user=self.user,
+            queryset=DocumentPage.objects.all()
+        )
+
+        self.assertEqual(
+            set(result), set(
+                DocumentPage.objects.filter(
+                    document_version__document__in=(
+                        self.document_1, self.document_2
+                    )
+                )
+            )
+        )
+
+    def test_filtering_queries(self):
+        acl = AccessControlList.objects.create(
+            content_object=self.document_type_1, role=self.role
+        )
+        acl.permissions.add(permission_document_view.stored_permission)
+
+        # Resolve the roles of the user
+        AccessControlList.objects.filter_by_access(
+            permission=permission_document_view, user=self.user,
+            queryset=Document.objects.all()
+        )
+
+        with self.assertNumQueries(1):
+            list(
+                AccessControlList.objects.filter_by_access(
+                    permission=permission_document_view, user=self.user,
+                    queryset=Document.objects.all()
+                )
+            )
+
+
+@override_settings(ACLS_VISIBILITY_TABLE=True)
+class VisibilityPermissionTestCase(PermissionTestCase):
+    def _get_visible_documents(self):
+        return set(
+            Visibility.objects.filter(
+                content_type=ContentType.objects.get_for_model(Document),
+                permission=permission_document_view.stored_permission,
+                role=self.role
+            ).values_list('object_id', flat=True)
+        )
+
+    def test_visibility_inherited_acl_change(self):
+        acl = AccessControlList.objects.create(
+            content_object=self.document_type_1, role=self.role
+        )
+        acl.permissions.add(permission_document_view.stored_permission)
+
+        self.assertEqual(
+            self._get_visible_documents(),
+            set((self.document_1.pk, self.document_2.pk))
+        )
+
+        acl.permissions.remove(permission_document_view.stored_permission)
+
+        self.assertEqual(self._get_visible_documents(), set())
+
+    def test_visibility_document_change(self):
+        acl = AccessControlList.objects.create(
+            content_object=self.document_type_1, role=self.role
+        )
+        acl.permissions.add(permission_document_view.stored_permission)
+
+        self.document_3.document_type = self.document_type_1
+        self.document_3.save()
+
+        self.assertEqual(
+            self._get_visible_documents(), set(
+                (self.document_1.pk, self.document_2.pk, self.document_3.pk)
+            )
+        )
+
+    def test_visibility_rebuild(self):
+        acl = AccessControlList.objects.create(
+            content_object=self.document_3, role=self.role
+        )
+        acl.permissions.add(permission_document_view.stored_permission)
+        Visibility.objects.all().delete()
+
+        Visibility.objects.rebuild()
+
+        self.assertEqual(
+            self._get_visible_documents(), set((self.document_3.pk,))
+        )
+
+    def test_visibility_update_conflict_retry(self):
+        acl = AccessControlList.objects.create(
+            content_object=self.document_3, role=self.role
+        )
+        acl.permissions.add(permission_document_view.stored_permission)
+        Visibility.objects.all().delete()
+
+        update_for_object = Visibility.objects.update_for_object
+        calls = []
+
+        def conflicting_update_for_object(obj):
+            # Fail the first time as if another task had inserted the same
+            # visibility rows
+            calls.append(obj)
+            if len(calls) == 1:
+                raise IntegrityError
+            update_for_object(obj=obj)
+
+        with mock.patch.object(
+            Visibility.objects, 'update_for_object',
+            conflicting_update_for_object
+        ):
+            task_update_object_visibility.apply(
+                kwargs={
+                    'content_type_id': ContentType.objects.get_for_model(
+                        Document
+                    ).pk,
+                    'object_id': self.document_3.pk
+                }
+            )
+
+        self.assertEqual(len(calls), 2)
+        self.assertEqual(
+            self._get_visible_documents(), set((self.document_3.pk,))
+        )
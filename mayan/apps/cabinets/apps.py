@@ -27,6 +27,7 @@ from .permissions import (
     permission_cabinet_edit, permission_cabinet_remove_document,
     permission_cabinet_view
 )
+from .utils import get_cabinet_inherited_acl_query
 from .widgets import widget_document_cabinets
 
 
@@ -71,7 +72,8 @@ class CabinetsApp(MayanAppConfig):
             )
         )
         ModelPermission.register_inheritance(
-            model=Cabinet, related='get_root',
+            model=Cabinet, query=get_cabinet_inherited_acl_query,
+            related='get_root'
         )
 
         SourceColumn(
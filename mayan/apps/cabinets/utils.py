@@ -0,0 +1,20 @@
+from __future__ import unicode_literals
+
+from django.apps import apps
+from django.contrib.contenttypes.models import ContentType
+from django.db.models import Q
+
+
+def get_cabinet_inherited_acl_query(acl_queryset):
+    """
+    Cabinets inherit the access granted to the root cabinet of their tree.
+    """
+    Cabinet = apps.get_model(app_label='cabinets', model_name='Cabinet')
+
+    return Q(
+        tree_id__in=Cabinet.objects.filter(
+            parent=None, pk__in=acl_queryset.filter(
+                content_type=ContentType.objects.get_for_model(Cabinet)
+            ).values('object_id')
+        ).order_by().values('tree_id')
+    )
@@ -1,7 +1,11 @@
 from __future__ import unicode_literals
 
+from collections import OrderedDict
+import threading
+
 from django.apps import apps
 from django.db import models
+from django.template import Template
 from django.urls import reverse
 from django.utils.encoding import force_text, python_2_unicode_compatible
 from django.utils.translation import ugettext
@@ -294,3 +298,65 @@ class PropertyHelper(object):
         by each subclass.
         """
         raise NotImplementedError
+
+
+class TemplateCache(object):
+    """
+    Compiled templates keyed by their source text, shared by the users of
+    user defined template expressions. The least recently used templates
+    are discarded once maximum_size is reached. Templates can be
+    registered with an owner instance to discard them when it changes.
+    """
+    def __init__(self, maximum_size):
+        self.maximum_size = maximum_size
+        self._lock = threading.RLock()
+        self._owners = {}
+        self._template_owners = {}
+        self._templates = OrderedDict()
+
+    def _discard(self, template_string):
+        # Remove the template from the template sets of its owners
+        for owner_key in self._template_owners.pop(template_string, ()):
+            template_strings = self._owners.get(owner_key)
+            if template_strings is not None:
+                template_strings.discard(template_string)
+                if not template_strings:
+                    del self._owners[owner_key]
+
+    def _get_owner_key(self, owner):
+        return (owner._meta.label, owner.pk)
+
+    def clear(self):
+        with self._lock:
+            self._owners.clear()
+            self._template_owners.clear()
+            self._templates.clear()
+
+    def get(self, template_string, owner=None):
+        with self._lock:
+            try:
+                template = self._templates.pop(template_string)
+            except KeyError:
+                template = Template(template_string)
+
+                while len(self._templates) >= self.maximum_size:
+                    self._discard(
+                        template_string=self._templates.popitem(last=False)[0]
+                    )
+
+            self._templates[template_string] = template
+
+            if owner:
+                owner_key = self._get_owner_key(owner=owner)
+                self._owners.setdefault(owner_key, set()).add(template_string)
+                self._template_owners.setdefault(
+                    template_string, set()
+                ).add(owner_key)
+
+            return template
+
+    def invalidate(self, owner):
+        with self._lock:
+            for template_string in self._owners.pop(self._get_owner_key(owner=owner), ()):
+                self._templates.pop(template_string, None)
+                self._discard(template_string=template_string)
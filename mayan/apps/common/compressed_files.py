@@ -1,6 +1,8 @@
 from __future__ import unicode_literals
 
 from io import BytesIO
+import struct
+import time
 import zipfile
 
 try:
@@ -11,6 +13,16 @@ except:
 
 from django.core.files.uploadedfile import SimpleUploadedFile
 
+from .literals import STREAMING_CHUNK_SIZE
+
+ZIP64_LIMIT = (1 << 31) - 1
+ZIP64_VERSION = 45
+ZIP_DEFLATED_VERSION = 20
+ZIP_FLAG_DATA_DESCRIPTOR = 0x08
+ZIP_FLAG_UTF8 = 0x800
+ZIP_MAXIMUM_ENTRIES = 0xFFFF
+ZIP_MAXIMUM_SIZE = 0xFFFFFFFF
+
 
 class NotACompressedFile(Exception):
     pass
@@ -106,3 +118,193 @@ class CompressedFile(object):
 
     def close(self):
         self.zf.close()
+
+
+class StreamingCompressedFile(object):
+    """
+    Write a ZIP archive as a sequence of byte strings, without seeking and
+    keeping only one chunk of one member in memory. Member sizes and
+    checksums follow each member in a data descriptor. ZIP64 records are
+    used when a member or the archive is too large for the basic format.
+
+    Usage: yield the chunks of add_file() for each member and then the
+    chunks of close().
+    """
+    def __init__(self, chunk_size=STREAMING_CHUNK_SIZE):
+        self.chunk_size = chunk_size
+        self.entries = []
+        self.offset = 0
+
+    def _write(self, data):
+        self.offset += len(data)
+        return data
+
+    def add_file(self, file_object, arcname, size=None):
+        """
+        Generator of the chunks of a new member with the content of
+        `file_object`. `size` is the expected uncompressed size, used to
+        decide if the member needs ZIP64 records. When unknown, ZIP64 is
+        used.
+        """
+        try:
+            filename = arcname.encode('ascii')
+            flags = ZIP_FLAG_DATA_DESCRIPTOR
+        except UnicodeEncodeError:
+            filename = arcname.encode('utf-8')
+            flags = ZIP_FLAG_DATA_DESCRIPTOR | ZIP_FLAG_UTF8
+
+        date_time = time.localtime(time.time())[:6]
+        dos_date = (date_time[0] - 1980) << 9 | date_time[1] << 5 | date_time[2]
+        dos_time = date_time[3] << 11 | date_time[4] << 5 | (date_time[5] // 2)
+
+        # Leave room for compression overhead, like zipfile does
+        zip64 = size is None or size * 1.05 > ZIP64_LIMIT
+
+        entry = {
+            'compress_size': 0, 'compress_type': COMPRESSION, 'crc': 0,
+            'dos_date': dos_date, 'dos_time': dos_time, 'file_size': 0,
+            'filename': filename, 'flags': flags,
+            'header_offset': self.offset, 'zip64': zip64
+        }
+
+        if zip64:
+            extra = struct.pack('<HHQQ', 1, 16, 0, 0)
+            version = ZIP64_VERSION
+            header_size = ZIP_MAXIMUM_SIZE
+        else:
+            extra = b''
+            version = ZIP_DEFLATED_VERSION
+            header_size = 0
+
+        yield self._write(
+            struct.pack(
+                '<4s5H3L2H', b'PK\x03\x04', version, flags,
+                entry['compress_type'], dos_time, dos_date, 0, header_size,
+                header_size, len(filename), len(extra)
+            ) + filename + extra
+        )
+
+        if entry['compress_type'] == zipfile.ZIP_DEFLATED:
+            compressor = zlib.compressobj(
+                zlib.Z_DEFAULT_COMPRESSION, zlib.DEFLATED, -15
+            )
+        else:
+            compressor = None
+
+        while True:
+            data = file_object.read(self.chunk_size)
+            if not data:
+                break
+
+            entry['crc'] = zlib.crc32(data, entry['crc']) & 0xFFFFFFFF
+            entry['file_size'] += len(data)
+
+            if compressor:
+                data = compressor.compress(data)
+
+            if data:
+                entry['compress_size'] += len(data)
+                yield self._write(data)
+
+        if compressor:
+            data = compressor.flush()
+            entry['compress_size'] += len(data)
+            yield self._write(data)
+
+        if not zip64 and max(entry['file_size'], entry['compress_size']) > ZIP64_LIMIT:
+            raise RuntimeError(
+                'Size of archive member "{}" exceeds the expected size.'.format(
+                    arcname
+                )
+            )
+
+        if zip64:
+            descriptor_format = '<4sLQQ'
+        else:
+            descriptor_format = '<4sLLL'
+
+        yield self._write(
+            struct.pack(
+                descriptor_format, b'PK\x07\x08', entry['crc'],
+                entry['compress_size'], entry['file_size']
+            )
+        )
+
+        self.entries.append(entry)
+
+    def close(self):
+        """
+        Generator of the chunks of the central directory, which ends the
+        archive.
+        """
+        central_directory_offset = self.offset
+
+        for entry in self.entries:
+            extra_values = []
+            file_size = entry['file_size']
+            compress_size = entry['compress_size']
+            header_offset = entry['header_offset']
+
+            if file_size > ZIP64_LIMIT or compress_size > ZIP64_LIMIT:
+                extra_values.extend((file_size, compress_size))
+                file_size = compress_size = ZIP_MAXIMUM_SIZE
+
+            if header_offset > ZIP64_LIMIT:
+                extra_values.append(header_offset)
+                header_offset = ZIP_MAXIMUM_SIZE
+
+            if extra_values:
+                extra = struct.pack(
+                    '<HH' + 'Q' * len(extra_values), 1,
+                    8 * len(extra_values), *extra_values
+                )
+            else:
+                extra = b''
+
+            if extra_values or entry['zip64']:
+                version = ZIP64_VERSION
+            else:
+                version = ZIP_DEFLATED_VERSION
+
+            # Version made by MS-DOS, for Windows compatibility
+            yield self._write(
+                struct.pack(
+                    '<4s6H3L5H2L', b'PK\x01\x02', version, version,
+                    entry['flags'], entry['compress_type'], entry['dos_time'],
+                    entry['dos_date'], entry['crc'], compress_size, file_size,
+                    len(entry['filename']), len(extra), 0, 0, 0,
+                    0o600 << 16, header_offset
+                ) + entry['filename'] + extra
+            )
+
+        central_directory_size = self.offset - central_directory_offset
+        entry_count = len(self.entries)
+
+        if entry_count > ZIP_MAXIMUM_ENTRIES or central_directory_size > ZIP64_LIMIT or central_directory_offset > ZIP64_LIMIT:
+            zip64_end_offset = self.offset
+
+            yield self._write(
+                struct.pack(
+                    '<4sQ2H2L4Q', b'PK\x06\x06', 44, ZIP64_VERSION,
+                    ZIP64_VERSION, 0, 0, entry_count, entry_count,
+                    central_directory_size, central_directory_offset
+                )
+            )
+            yield self._write(
+                struct.pack('<4sLQL', b'PK\x06\x07', 0, zip64_end_offset, 1)
+            )
+
+            entry_count = min(entry_count, ZIP_MAXIMUM_ENTRIES)
+            central_directory_size = min(
+                central_directory_size, ZIP_MAXIMUM_SIZE
+            )
+            central_directory_offset = min(
+                central_directory_offset, ZIP_MAXIMUM_SIZE
+            )
+
+        yield self._write(
+            struct.pack(
+                '<4s4H2LH', b'PK\x05\x06', 0, 0, entry_count, entry_count,
+                central_directory_size, central_directory_offset, 0
+            )
+        )
@@ -5,6 +5,12 @@ from django.conf import settings
 from django.core import management
 from django.utils import timezone, translation
 
+from .runtime import template_cache
+
+
+def handler_invalidate_template_cache(sender, instance, **kwargs):
+    template_cache.invalidate(owner=instance)
+
 
 def handler_pre_initial_setup(sender, **kwargs):
     management.call_command('migrate', interactive=False)
@@ -2,9 +2,12 @@ from __future__ import unicode_literals
 
 from django.utils.translation import ugettext_lazy as _
 
+COUNTER_FLUSH_INTERVAL = 60  # 1 minute
 DELETE_STALE_UPLOADS_INTERVAL = 60 * 10  # 10 minutes
 MAYAN_PYPI_NAME = 'mayan-edms'
 PYPI_URL = 'https://pypi.python.org/pypi'
+STREAMING_CHUNK_SIZE = 1024 * 1024
+TEMPLATE_CACHE_MAXIMUM_SIZE = 1000
 TIME_DELTA_UNIT_DAYS = 'days'
 TIME_DELTA_UNIT_HOURS = 'hours'
 TIME_DELTA_UNIT_MINUTES = 'minutes'
@@ -1,8 +1,85 @@
 from __future__ import unicode_literals
 
+import threading
+import time
+
 from django.apps import apps
 from django.contrib.contenttypes.fields import GenericRelation
-from django.db import models
+from django.db import IntegrityError, models, transaction
+from django.db.models import F
+
+from .literals import COUNTER_FLUSH_INTERVAL
+
+
+class CounterManager(models.Manager):
+    """
+    Manager for counter models with a unique `name` field and a `value`
+    field. increment() writes to the database right away and is meant for
+    batch jobs. increment_buffered() adds to a per process total that is
+    written at most once every COUNTER_FLUSH_INTERVAL seconds, after the
+    current transaction commits, to keep the counter rows off hot paths.
+    Buffered amounts not yet written are only visible to get_value() in
+    the same process.
+    """
+    _buffer_lock = threading.Lock()
+    _buffers = {}
+    _flush_times = {}
+
+    def _get_buffer_key(self):
+        return self.model._meta.label
+
+    def flush(self):
+        key = self._get_buffer_key()
+
+        with CounterManager._buffer_lock:
+            pending = CounterManager._buffers.pop(key, {})
+            CounterManager._flush_times[key] = time.time()
+
+        for name, amount in pending.items():
+            self.increment(name=name, amount=amount)
+
+    def get_value(self, name):
+        with CounterManager._buffer_lock:
+            value = CounterManager._buffers.get(
+                self._get_buffer_key(), {}
+            ).get(name, 0)
+
+        try:
+            return self.get(name=name).value + value
+        except self.model.DoesNotExist:
+            return value
+
+    def increment(self, name, amount=1):
+        if not amount:
+            return
+
+        if not self.filter(name=name).update(value=F('value') + amount):
+            try:
+                with transaction.atomic():
+                    self.create(name=name, value=amount)
+            except IntegrityError:
+                # Created by another process in the meantime
+                self.filter(name=name).update(value=F('value') + amount)
+
+    def increment_buffered(self, name, amount=1):
+        key = self._get_buffer_key()
+
+        with CounterManager._buffer_lock:
+            buffer = CounterManager._buffers.setdefault(key, {})
+            buffer[name] = buffer.get(name, 0) + amount
+
+            flush_time = CounterManager._flush_times.setdefault(
+                key, time.time()
+            )
+            if time.time() - flush_time < COUNTER_FLUSH_INTERVAL:
+                return
+
+            # Avoid queueing more flushes until this one runs. If the
+            # transaction rolls back, the amounts stay in the buffer for
+            # the next flush.
+            CounterManager._flush_times[key] = time.time()
+
+        transaction.on_commit(self.flush, using=self.db)
 
 
 class ErrorLogEntryManager(models.Manager):
@@ -1,5 +1,8 @@
 from django.utils.module_loading import import_string
 
+from .classes import TemplateCache
+from .literals import TEMPLATE_CACHE_MAXIMUM_SIZE
 from .settings import setting_shared_storage
 
 shared_storage_backend = import_string(setting_shared_storage.value)()
+template_cache = TemplateCache(maximum_size=TEMPLATE_CACHE_MAXIMUM_SIZE)
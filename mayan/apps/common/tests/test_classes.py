@@ -0,0 +1,75 @@
+from __future__ import unicode_literals
+
+from django.template import Context
+
+from ..classes import TemplateCache
+
+from .base import BaseTestCase
+
+TEST_TEMPLATE_STRING = '{{ value }}'
+TEST_TEMPLATE_STRING_2 = '{{ value }}-2'
+TEST_TEMPLATE_STRING_3 = '{{ value }}-3'
+
+
+class TemplateCacheTestCase(BaseTestCase):
+    def setUp(self):
+        super(TemplateCacheTestCase, self).setUp()
+        self.template_cache = TemplateCache(maximum_size=2)
+
+    def test_reuse(self):
+        template = self.template_cache.get(
+            template_string=TEST_TEMPLATE_STRING
+        )
+
+        self.assertTrue(
+            self.template_cache.get(
+                template_string=TEST_TEMPLATE_STRING
+            ) is template
+        )
+        self.assertEqual(
+            template.render(context=Context({'value': 'test'})), 'test'
+        )
+
+    def test_eviction(self):
+        template = self.template_cache.get(
+            template_string=TEST_TEMPLATE_STRING
+        )
+        template_2 = self.template_cache.get(
+            template_string=TEST_TEMPLATE_STRING_2
+        )
+        # Mark the first template as recently used
+        self.template_cache.get(template_string=TEST_TEMPLATE_STRING)
+        self.template_cache.get(template_string=TEST_TEMPLATE_STRING_3)
+
+        self.assertTrue(
+            self.template_cache.get(
+                template_string=TEST_TEMPLATE_STRING
+            ) is template
+        )
+        self.assertFalse(
+            self.template_cache.get(
+                template_string=TEST_TEMPLATE_STRING_2
+            ) is template_2
+        )
+
+    def test_owner_invalidation(self):
+        template = self.template_cache.get(
+            template_string=TEST_TEMPLATE_STRING, owner=self.group
+        )
+        self.template_cache.invalidate(owner=self.group)
+
+        self.assertFalse(
+            self.template_cache.get(
+                template_string=TEST_TEMPLATE_STRING
+            ) is template
+        )
+
+    def test_eviction_owner_cleanup(self):
+        self.template_cache.get(
+            template_string=TEST_TEMPLATE_STRING, owner=self.group
+        )
+        self.template_cache.get(template_string=TEST_TEMPLATE_STRING_2)
+        self.template_cache.get(template_string=TEST_TEMPLATE_STRING_3)
+
+        self.assertEqual(self.template_cache._owners, {})
+        self.assertEqual(self.template_cache._template_owners, {})
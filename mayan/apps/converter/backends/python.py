@@ -12,15 +12,15 @@ import yaml
 from django.utils.encoding import force_text
 from django.utils.translation import ugettext_lazy as _
 
-from common.utils import fs_cleanup, mkstemp
+from common.utils import fs_cleanup, mkdtemp, mkstemp
 
-from ..classes import ConverterBase
+from ..classes import CHUNK_SIZE, ConverterBase
 from ..exceptions import PageCountError
 from ..settings import setting_graphics_backend_config
 
 from ..literals import (
     DEFAULT_PDFTOPPM_DPI, DEFAULT_PDFTOPPM_FORMAT, DEFAULT_PDFTOPPM_PATH,
-    DEFAULT_PDFINFO_PATH
+    DEFAULT_PDFINFO_PATH, PDFTOPPM_OUTPUT_ROOT
 )
 
 try:
@@ -94,6 +94,55 @@ class Python(ConverterBase):
             finally:
                 fs_cleanup(input_filepath)
 
+    def get_pages(self, first_page_number=0, last_page_number=None, output_format=None):
+        if self.mime_type != 'application/pdf' or not pdftoppm:
+            results = super(Python, self).get_pages(
+                first_page_number=first_page_number,
+                last_page_number=last_page_number, output_format=output_format
+            )
+            for result in results:
+                yield result
+            return
+
+        new_file_object, input_filepath = mkstemp()
+        self.file_object.seek(0)
+        while True:
+            data = self.file_object.read(CHUNK_SIZE)
+            if not data:
+                break
+            os.write(new_file_object, data)
+        self.file_object.seek(0)
+        os.close(new_file_object)
+
+        output_directory = mkdtemp()
+
+        kwargs = {'f': first_page_number + 1}
+        if last_page_number is not None:
+            kwargs['l'] = last_page_number + 1
+
+        try:
+            # Rasterize the whole range in a single pass, pdftoppm writes one
+            # file per page named <root>-<page number>.<extension>
+            pdftoppm(
+                input_filepath, os.path.join(
+                    output_directory, PDFTOPPM_OUTPUT_ROOT
+                ), **kwargs
+            )
+
+            for filename in sorted(os.listdir(output_directory)):
+                page_number = int(
+                    os.path.splitext(filename)[0].rsplit('-', 1)[1]
+                ) - 1
+
+                with open(os.path.join(output_directory, filename), 'rb') as file_object:
+                    self.image = Image.open(file_object)
+                    self.image.load()
+
+                yield page_number, self.get_page(output_format=output_format)
+        finally:
+            fs_cleanup(input_filepath)
+            fs_cleanup(output_directory)
+
     def detect_orientation(self, page_number):
         # Default rotation: 0 degrees
         result = 0
@@ -126,6 +175,39 @@ class Python(ConverterBase):
 
         return result
 
+    def detect_orientations(self, page_count):
+        if self.mime_type != 'application/pdf':
+            return super(Python, self).detect_orientations(
+                page_count=page_count
+            )
+
+        # Default rotation: 0 degrees
+        result = [0] * page_count
+
+        # Parse the PDF only once for all the pages
+        self.file_object.seek(0)
+        try:
+            pdf = PyPDF2.PdfFileReader(self.file_object)
+            if pdf.isEncrypted:
+                # File is encrypted, try to decrypt using a blank
+                # password.
+                pdf.decrypt(password=b'')
+
+            for page_index in range(page_count):
+                rotation = pdf.getPage(page_index).get('/Rotate', 0)
+                if isinstance(rotation, PyPDF2.generic.IndirectObject):
+                    rotation = rotation.getObject()
+
+                result[page_index] = rotation
+        except Exception as exception:
+            logger.error(
+                'Unable to detect PDF orientation; %s', exception
+            )
+        finally:
+            self.file_object.seek(0)
+
+        return result
+
     def get_page_count(self):
         super(Python, self).get_page_count()
 
@@ -210,6 +210,19 @@ class ConverterBase(object):
     def convert(self, page_number=DEFAULT_PAGE_NUMBER):
         self.page_number = page_number
 
+    def get_pages(self, first_page_number=0, last_page_number=None, output_format=None):
+        """
+        Generator that yields (page_number, image_buffer) tuples for a range
+        of pages. Page numbers start with #0. Backends able to rasterize
+        several pages in a single pass should override this method.
+        """
+        if last_page_number is None:
+            last_page_number = self.get_page_count() - 1
+
+        for page_number in range(first_page_number, last_page_number + 1):
+            self.seek(page_number=page_number)
+            yield page_number, self.get_page(output_format=output_format)
+
     def transform(self, transformation):
         if not self.image:
             self.seek(0)
@@ -233,6 +246,16 @@ class ConverterBase(object):
         # Must be overrided by subclass
         pass
 
+    def detect_orientations(self, page_count):
+        """
+        Return a list with the rotation in degrees of every page.
+        Subclasses able to inspect all the pages in a single pass should
+        override this method.
+        """
+        return [
+            self.detect_orientation(page_number=page_number) for page_number in range(1, page_count + 1)
+        ]
+
 
 class BaseTransformation(object):
     """
@@ -10,5 +10,6 @@ DEFAULT_PDFTOPPM_DPI = 300
 DEFAULT_PDFTOPPM_FORMAT = 'jpeg'  # Possible values jpeg, png, tiff
 DEFAULT_PDFTOPPM_PATH = '/usr/bin/pdftoppm'
 DEFAULT_PDFINFO_PATH = '/usr/bin/pdfinfo'
+PDFTOPPM_OUTPUT_ROOT = 'page'
 
 DIMENSION_SEPARATOR = 'x'
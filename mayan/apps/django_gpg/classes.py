@@ -1,13 +1,23 @@
 from __future__ import absolute_import, unicode_literals
 
+import atexit
 from datetime import date
+import logging
 import os
 import shutil
+import subprocess
+import threading
 
 import gnupg
 
+from django.utils.encoding import force_text
+
 from common.utils import mkdtemp
 
+from .literals import STATUS_PREFIX
+
+logger = logging.getLogger(__name__)
+
 
 class GPGBackend(object):
     def __init__(self, **kwargs):
@@ -15,6 +25,11 @@ class GPGBackend(object):
 
 
 class PythonGNUPGBackend(GPGBackend):
+    @staticmethod
+    def _export_public_key(gpg, key_data):
+        import_results = gpg.import_keys(key_data=key_data)
+        return gpg.export_keys(keyids=import_results.fingerprints[0])
+
     @staticmethod
     def _import_key(gpg, **kwargs):
         return gpg.import_keys(**kwargs)
@@ -71,6 +86,43 @@ class PythonGNUPGBackend(GPGBackend):
             keyserver=keyserver, query=query
         )
 
+    def __init__(self, **kwargs):
+        super(PythonGNUPGBackend, self).__init__(**kwargs)
+        self.keyring = None
+        self.keyring_fingerprints = set()
+        self.keyring_lock = threading.Lock()
+        self.keyring_pid = None
+
+    def _get_keyring(self):
+        # A keyring created before a fork belongs to the parent process
+        if not self.keyring or self.keyring_pid != os.getpid():
+            temporary_directory = mkdtemp()
+            os.chmod(temporary_directory, 0x1C0)
+
+            self.keyring = gnupg.GPG(
+                gnupghome=temporary_directory,
+                gpgbinary=self.kwargs['binary_path']
+            )
+            self.keyring_fingerprints = set()
+            self.keyring_pid = os.getpid()
+
+            atexit.register(
+                PythonGNUPGBackend._remove_keyring,
+                directory=temporary_directory, pid=self.keyring_pid
+            )
+
+        return self.keyring
+
+    @staticmethod
+    def _remove_keyring(directory, pid):
+        if os.getpid() == pid:
+            shutil.rmtree(directory, ignore_errors=True)
+
+    def export_public_key(self, key_data):
+        return self.gpg_command(
+            function=PythonGNUPGBackend._export_public_key, key_data=key_data
+        )
+
     def gpg_command(self, function, **kwargs):
         temporary_directory = mkdtemp()
         os.chmod(temporary_directory, 0x1C0)
@@ -120,6 +172,93 @@ class PythonGNUPGBackend(GPGBackend):
             keys=keys, data_filename=data_filename
         )
 
+    def keyring_decrypt_file(self, file_object):
+        with self.keyring_lock:
+            gpg = self._get_keyring()
+
+        return gpg.decrypt_file(file=file_object)
+
+    def keyring_sync(self, fingerprints, get_key_data):
+        """
+        Make the process keyring hold exactly the public keys of
+        `fingerprints`. `get_key_data` receives the fingerprints missing from
+        the keyring and returns a dictionary of their public key data.
+        """
+        fingerprints = set(fingerprints)
+
+        with self.keyring_lock:
+            gpg = self._get_keyring()
+
+            for fingerprint in self.keyring_fingerprints - fingerprints:
+                gpg.delete_keys(fingerprints=fingerprint)
+
+            self.keyring_fingerprints &= fingerprints
+            missing = fingerprints - self.keyring_fingerprints
+
+            if missing:
+                for key_data in get_key_data(fingerprints=missing).values():
+                    gpg.import_keys(key_data=key_data)
+
+                self.keyring_fingerprints = set(
+                    key['fingerprint'] for key in gpg.list_keys()
+                ) & fingerprints
+
+    def keyring_verify_file(self, file_object, data_filename=None):
+        with self.keyring_lock:
+            gpg = self._get_keyring()
+
+        return gpg.verify_file(file=file_object, data_filename=data_filename)
+
+    def keyring_verify_files(self, filenames):
+        """
+        Verify the embedded signatures of several files with a single gpg
+        process. Returns one verify result per file, in the same order.
+        """
+        with self.keyring_lock:
+            gpg = self._get_keyring()
+
+        process = subprocess.Popen(
+            gpg.make_args(
+                args=['--batch', '--verify-files'] + list(filenames),
+                passphrase=False
+            ), stderr=subprocess.PIPE, stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE
+        )
+        stdout, stderr = process.communicate()
+        stderr = force_text(stderr, errors='replace')
+
+        results = []
+        result = None
+        for line in stderr.splitlines():
+            if not line.startswith(STATUS_PREFIX):
+                continue
+
+            keyword, separator, value = line[len(STATUS_PREFIX):].partition(' ')
+
+            if keyword == 'FILE_START':
+                result = gnupg.Verify(gpg)
+                result.stderr = stderr
+                results.append(result)
+            elif keyword == 'FILE_DONE':
+                result = None
+            elif result is not None:
+                try:
+                    result.handle_status(keyword, value)
+                except ValueError as exception:
+                    # Status messages newer than python-gnupg
+                    logger.debug('Ignoring gpg status; %s', exception)
+
+        if len(results) != len(filenames):
+            # This gpg version doesn't report the file boundaries, verify
+            # one file at a time
+            logger.debug('gpg did not report file boundaries')
+            results = []
+            for filename in filenames:
+                with open(filename, 'rb') as file_object:
+                    results.append(gpg.verify_file(file=file_object))
+
+        return results
+
     def recv_keys(self, keyserver, key_id):
         return self.gpg_command(
             function=PythonGNUPGBackend._recv_keys, keyserver=keyserver,
@@ -66,3 +66,5 @@ ERROR_MSG_NEED_PASSPHRASE = 'NEED_PASSPHRASE'
 ERROR_MSG_BAD_PASSPHRASE = 'BAD_PASSPHRASE'
 ERROR_MSG_GOOD_PASSPHRASE = 'GOOD_PASSPHRASE'
 OUTPUT_MESSAGE_CONTAINS_PRIVATE_KEY = 'Contains private key'
+STATUS_PREFIX = '[GNUPG:] '
+VERIFICATION_BATCH_SIZE = 100
@@ -12,7 +12,9 @@ from .classes import KeyStub, SignatureVerification
 from .exceptions import (
     DecryptionError, KeyDoesNotExist, KeyFetchingError, VerificationError
 )
-from .literals import KEY_TYPE_PUBLIC, KEY_TYPE_SECRET
+from .literals import (
+    KEY_TYPE_PUBLIC, KEY_TYPE_SECRET, VERIFICATION_BATCH_SIZE
+)
 from .runtime import gpg_backend
 from .settings import setting_keyserver
 
@@ -45,15 +47,54 @@ class KeyManager(models.Manager):
 
         return keys
 
-    def decrypt_file(self, file_object, all_keys=False, key_fingerprint=None, key_id=None):
-        keys = self._preload_keys(
-            all_keys=all_keys, key_fingerprint=key_fingerprint, key_id=key_id
-        )
+    def _get_keyring_key_data(self, fingerprints):
+        result = {}
+
+        for key in self.filter(fingerprint__in=fingerprints):
+            if key.key_type == KEY_TYPE_SECRET:
+                # Keep only the public part in the long lived keyring
+                result[key.fingerprint] = gpg_backend.export_public_key(
+                    key_data=key.key_data
+                )
+            else:
+                result[key.fingerprint] = key.key_data
+
+        return result
+
+    def _get_verification(self, verify_result):
+        if verify_result:
+            # Signed and key present
+            logger.debug('signed and key present')
+            return SignatureVerification(verify_result.__dict__)
+        elif verify_result.key_id:
+            # Signed but key not present
+            logger.debug('signed and key not found')
+            return SignatureVerification(verify_result.__dict__)
+        else:
+            logger.debug('file not signed')
 
-        decrypt_result = gpg_backend.decrypt_file(
-            file_object=file_object, keys=keys
+    def _sync_keyring(self):
+        gpg_backend.keyring_sync(
+            fingerprints=self.values_list('fingerprint', flat=True),
+            get_key_data=self._get_keyring_key_data
         )
 
+    def decrypt_file(self, file_object, all_keys=False, key_fingerprint=None, key_id=None):
+        if all_keys or key_fingerprint or key_id:
+            keys = self._preload_keys(
+                all_keys=all_keys, key_fingerprint=key_fingerprint,
+                key_id=key_id
+            )
+
+            decrypt_result = gpg_backend.decrypt_file(
+                file_object=file_object, keys=keys
+            )
+        else:
+            self._sync_keyring()
+            decrypt_result = gpg_backend.keyring_decrypt_file(
+                file_object=file_object
+            )
+
         logger.debug('decrypt_result.status: %s', decrypt_result.status)
 
         if not decrypt_result.status or decrypt_result.status == 'no data was provided':
@@ -91,9 +132,15 @@ class KeyManager(models.Manager):
         return self.filter(key_type=KEY_TYPE_SECRET)
 
     def verify_file(self, file_object, signature_file=None, all_keys=False, key_fingerprint=None, key_id=None):
-        keys = self._preload_keys(
-            all_keys=all_keys, key_fingerprint=key_fingerprint, key_id=key_id
-        )
+        if all_keys or key_fingerprint or key_id:
+            keys = self._preload_keys(
+                all_keys=all_keys, key_fingerprint=key_fingerprint,
+                key_id=key_id
+            )
+        else:
+            # Use the process keyring, which holds every key
+            keys = None
+            self._sync_keyring()
 
         if signature_file:
             # Save the original data and invert the argument order
@@ -106,12 +153,22 @@ class KeyManager(models.Manager):
             signature_file_buffer.write(signature_file.read())
             signature_file_buffer.seek(0)
             signature_file.seek(0)
-            verify_result = gpg_backend.verify_file(
-                file_object=signature_file_buffer,
-                data_filename=temporary_filename, keys=keys
-            )
+            if keys is None:
+                verify_result = gpg_backend.keyring_verify_file(
+                    file_object=signature_file_buffer,
+                    data_filename=temporary_filename
+                )
+            else:
+                verify_result = gpg_backend.verify_file(
+                    file_object=signature_file_buffer,
+                    data_filename=temporary_filename, keys=keys
+                )
             signature_file_buffer.close()
             os.unlink(temporary_filename)
+        elif keys is None:
+            verify_result = gpg_backend.keyring_verify_file(
+                file_object=file_object
+            )
         else:
             verify_result = gpg_backend.verify_file(
                 file_object=file_object, keys=keys
@@ -119,19 +176,29 @@ class KeyManager(models.Manager):
 
         logger.debug('verify_result.status: %s', verify_result.status)
 
-        if verify_result:
-            # Signed and key present
-            logger.debug('signed and key present')
-            return SignatureVerification(verify_result.__dict__)
-        elif verify_result.status == 'no public key' and not (key_fingerprint or all_keys or key_id):
-            # Signed but key not present, retry with key fetch
-            logger.debug('no public key')
-            file_object.seek(0)
-            return self.verify_file(file_object=file_object, signature_file=signature_file, key_id=verify_result.key_id)
-        elif verify_result.key_id:
-            # Signed, retried and key still not found
-            logger.debug('signed, retried and key still not found')
-            return SignatureVerification(verify_result.__dict__)
-        else:
-            logger.debug('file not signed')
+        result = self._get_verification(verify_result=verify_result)
+
+        if not result:
             raise VerificationError('File not signed')
+
+        return result
+
+    def verify_files(self, filenames):
+        """
+        Verify the embedded signatures of several files with one gpg
+        process per batch. Returns a list with a signature verification
+        per file, or None for the files that are not signed.
+        """
+        self._sync_keyring()
+
+        result = []
+        filenames = list(filenames)
+        for index in range(0, len(filenames), VERIFICATION_BATCH_SIZE):
+            for verify_result in gpg_backend.keyring_verify_files(
+                filenames=filenames[index:index + VERIFICATION_BATCH_SIZE]
+            ):
+                result.append(
+                    self._get_verification(verify_result=verify_result)
+                )
+
+        return result
@@ -115,6 +115,33 @@ class KeyTestCase(BaseTestCase):
             with self.assertRaises(KeyDoesNotExist):
                 Key.objects.verify_file(signed_file, key_fingerprint='999')
 
+    def test_embedded_verification_key_deleted(self):
+        key = Key.objects.create(key_data=TEST_KEY_DATA)
+
+        with open(TEST_SIGNED_FILE) as signed_file:
+            result = Key.objects.verify_file(signed_file)
+
+        self.assertTrue(result.valid)
+
+        key.delete()
+
+        with open(TEST_SIGNED_FILE) as signed_file:
+            result = Key.objects.verify_file(signed_file)
+
+        self.assertFalse(result.valid)
+        self.assertTrue(result.key_id in TEST_KEY_FINGERPRINT)
+
+    def test_embedded_verification_batch(self):
+        Key.objects.create(key_data=TEST_KEY_DATA)
+
+        results = Key.objects.verify_files(
+            filenames=(TEST_SIGNED_FILE, TEST_FILE, TEST_SIGNED_FILE)
+        )
+
+        self.assertEqual(results[0].fingerprint, TEST_KEY_FINGERPRINT)
+        self.assertEqual(results[1], None)
+        self.assertEqual(results[2].fingerprint, TEST_KEY_FINGERPRINT)
+
     def test_signed_file_decryption(self):
         Key.objects.create(key_data=TEST_KEY_DATA)
 
@@ -3,7 +3,13 @@ from __future__ import unicode_literals
 from django.contrib import admin
 from django.utils.translation import ugettext_lazy as _
 
-from .models import Index, IndexTemplateNode
+from .models import DocumentIndexRequest, Index, IndexTemplateNode
+
+
+@admin.register(DocumentIndexRequest)
+class DocumentIndexRequestAdmin(admin.ModelAdmin):
+    list_display = ('document', 'datetime_requested', 'request_count')
+    readonly_fields = ('document', 'datetime_requested', 'request_count')
 
 
 class IndexTemplateNodeInline(admin.StackedInline):
@@ -1,9 +1,11 @@
 from __future__ import absolute_import, unicode_literals
 
+from datetime import timedelta
+
 from kombu import Exchange, Queue
 
 from django.apps import apps
-from django.db.models.signals import post_delete, pre_delete
+from django.db.models.signals import post_delete, post_save, pre_delete
 from django.utils.translation import ugettext_lazy as _
 
 from acls import ModelPermission
@@ -14,6 +16,7 @@ from common import (
     MayanAppConfig, menu_facet, menu_main, menu_object, menu_secondary,
     menu_setup, menu_tools
 )
+from common.handlers import handler_invalidate_template_cache
 from common.widgets import two_state_template
 from documents.signals import post_document_created, post_initial_document_type
 from mayan.celery import app
@@ -21,8 +24,8 @@ from navigation import SourceColumn
 from rest_api.classes import APIEndPoint
 
 from .handlers import (
-    create_default_document_index, handler_delete_empty,
-    handler_index_document, handler_remove_document
+    create_default_document_index, handler_delete_document_index_paths,
+    handler_delete_empty, handler_index_document, handler_remove_document
 )
 from .links import (
     link_document_index_list, link_index_main_menu, link_index_setup,
@@ -33,6 +36,7 @@ from .links import (
     link_template_node_edit
 )
 from .licenses import *  # NOQA
+from .literals import PROCESS_INDEX_REQUESTS_INTERVAL
 from .permissions import (
     permission_document_indexing_create, permission_document_indexing_delete,
     permission_document_indexing_edit, permission_document_indexing_view
@@ -155,6 +159,17 @@ class DocumentIndexingApp(MayanAppConfig):
             )
         )
 
+        app.conf.CELERYBEAT_SCHEDULE.update(
+            {
+                'task_process_index_requests': {
+                    'task': 'document_indexing.tasks.task_process_index_requests',
+                    'schedule': timedelta(
+                        seconds=PROCESS_INDEX_REQUESTS_INTERVAL
+                    ),
+                },
+            }
+        )
+
         app.conf.CELERY_QUEUES.append(
             Queue('indexing', Exchange('indexing'), routing_key='indexing'),
         )
@@ -170,6 +185,9 @@ class DocumentIndexingApp(MayanAppConfig):
                 'document_indexing.tasks.task_index_document': {
                     'queue': 'indexing'
                 },
+                'document_indexing.tasks.task_process_index_requests': {
+                    'queue': 'indexing'
+                },
                 'document_indexing.tasks.task_rebuild_index': {
                     'queue': 'tools'
                 },
@@ -203,10 +221,30 @@ class DocumentIndexingApp(MayanAppConfig):
         menu_setup.bind_links(links=(link_index_setup,))
         menu_tools.bind_links(links=(link_rebuild_index_instances,))
 
+        post_delete.connect(
+            handler_delete_document_index_paths,
+            dispatch_uid='handler_delete_document_index_paths_delete',
+            sender=IndexTemplateNode
+        )
         post_delete.connect(
             handler_delete_empty, dispatch_uid='handler_delete_empty',
             sender=Document
         )
+        post_delete.connect(
+            handler_invalidate_template_cache,
+            dispatch_uid='document_indexing_handler_invalidate_template_cache_delete',
+            sender=IndexTemplateNode
+        )
+        post_save.connect(
+            handler_delete_document_index_paths,
+            dispatch_uid='handler_delete_document_index_paths_save',
+            sender=IndexTemplateNode
+        )
+        post_save.connect(
+            handler_invalidate_template_cache,
+            dispatch_uid='document_indexing_handler_invalidate_template_cache_save',
+            sender=IndexTemplateNode
+        )
         pre_delete.connect(
             handler_remove_document, dispatch_uid='handler_remove_document',
             sender=Document
@@ -0,0 +1,54 @@
+from __future__ import unicode_literals
+
+from collections import OrderedDict
+
+
+class IndexRebuildPrefetch(object):
+    """
+    Document relationships prefetched in bulk when rebuilding the indexes.
+    Apps register the relationships used by the document attributes they
+    provide to the index templates.
+    """
+    _registry = []
+
+    @classmethod
+    def get_lookups(cls):
+        return [entry.lookup for entry in cls._registry]
+
+    def __init__(self, lookup):
+        self.lookup = lookup
+        self.__class__._registry.append(self)
+
+
+class IndexInstanceTreeNode(object):
+    """
+    In memory index instance node used to build a complete index instance
+    tree before writing it to the database.
+    """
+    def __init__(self, index_template_node_id, value=''):
+        self.children = OrderedDict()
+        self.document_ids = set()
+        self.index_template_node_id = index_template_node_id
+        self.pk = None
+        self.value = value
+
+    def get_child(self, index_template_node_id, value):
+        key = (index_template_node_id, value)
+        try:
+            return self.children[key]
+        except KeyError:
+            child = IndexInstanceTreeNode(
+                index_template_node_id=index_template_node_id, value=value
+            )
+            self.children[key] = child
+            return child
+
+    def get_paths(self, path=()):
+        """
+        Yield the path of this node and of each of its descendants, as
+        tuples of template node and value pairs, along with the node.
+        """
+        yield path, self
+        for key, child in self.children.items():
+            for result in child.get_paths(path=path + (key,)):
+                yield result
@@ -3,9 +3,7 @@ from __future__ import unicode_literals
 from django.apps import apps
 from django.utils.translation import ugettext_lazy as _
 
-from .tasks import (
-    task_delete_empty, task_index_document, task_remove_document
-)
+from .tasks import task_delete_empty, task_remove_document
 
 
 def create_default_document_index(sender, **kwargs):
@@ -33,13 +31,29 @@ def create_default_document_index(sender, **kwargs):
     )
 
 
+def handler_delete_document_index_paths(sender, **kwargs):
+    DocumentIndexPath = apps.get_model(
+        app_label='document_indexing', model_name='DocumentIndexPath'
+    )
+
+    # The index paths of the documents were evaluated with the previous
+    # templates.
+    DocumentIndexPath.objects.filter(
+        index_id=kwargs['instance'].index_id
+    ).delete()
+
+
 def handler_delete_empty(sender, **kwargs):
     task_delete_empty.apply_async()
 
 
 def handler_index_document(sender, **kwargs):
-    task_index_document.apply_async(
-        kwargs=dict(document_id=kwargs['instance'].pk)
+    DocumentIndexRequest = apps.get_model(
+        app_label='document_indexing', model_name='DocumentIndexRequest'
+    )
+
+    DocumentIndexRequest.objects.request_document(
+        document=kwargs['instance']
     )
 
 
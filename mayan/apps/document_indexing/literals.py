@@ -1 +1,8 @@
+DEFAULT_INDEX_REQUEST_DELAY = 5
+INDEX_REBUILD_CHUNK_SIZE = 1000
+INDEX_REBUILD_LOCK_TIMEOUT = 60 * 10
+INDEX_REQUEST_BATCH_SIZE = 100
+INDEX_REQUEST_COUNTER_COLLAPSED = 'collapsed'
+INDEX_REQUEST_COUNTER_PROCESSED = 'processed'
+PROCESS_INDEX_REQUESTS_INTERVAL = 60
 RETRY_DELAY = 5  # TODO: convert this into a config option
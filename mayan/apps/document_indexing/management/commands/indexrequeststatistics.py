@@ -0,0 +1,28 @@
+from __future__ import unicode_literals
+
+from django.core import management
+
+from ...models import DocumentIndexRequest
+
+
+class Command(management.BaseCommand):
+    help = (
+        'Show the pending document index requests and how many requests '
+        'were collapsed into already pending ones.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--process', action='store_true', dest='process',
+            help='Process a batch of pending requests before showing the '
+            'counters.'
+        )
+
+    def handle(self, *args, **options):
+        if options['process']:
+            DocumentIndexRequest.objects.process_requests()
+
+        statistics = DocumentIndexRequest.objects.get_statistics()
+
+        for key in sorted(statistics):
+            self.stdout.write('{}: {}'.format(key, statistics[key]))
@@ -1,6 +1,21 @@
 from __future__ import unicode_literals
 
-from django.db import models
+import logging
+
+from django.apps import apps
+from django.db import IntegrityError, OperationalError, models, transaction
+from django.db.models import Count, F, Sum
+
+from lock_manager import LockError
+
+from .literals import (
+    INDEX_REQUEST_BATCH_SIZE, INDEX_REQUEST_COUNTER_COLLAPSED,
+    INDEX_REQUEST_COUNTER_PROCESSED
+)
+from .settings import setting_index_request_delay
+from .tasks import task_process_index_requests
+
+logger = logging.getLogger(__name__)
 
 
 class DocumentIndexInstanceNodeManager(models.Manager):
@@ -8,6 +23,138 @@ class DocumentIndexInstanceNodeManager(models.Manager):
         return self.filter(documents=document)
 
 
+class DocumentIndexRequestManager(models.Manager):
+    def _add_request(self, document, request_count=1):
+        """
+        Create a pending request for the document or add to the existing
+        one. Returns True if a new request was created.
+        """
+        if self.filter(document=document).update(request_count=F('request_count') + request_count):
+            return False
+
+        try:
+            with transaction.atomic():
+                self.create(document=document, request_count=request_count)
+        except IntegrityError:
+            # Created by another process in the meantime
+            self.filter(document=document).update(
+                request_count=F('request_count') + request_count
+            )
+            return False
+        else:
+            task_process_index_requests.apply_async(
+                countdown=setting_index_request_delay.value
+            )
+            return True
+
+    def get_statistics(self):
+        """
+        Requests are not counted as they are received, to keep the counter
+        rows out of the transactions of the callers. Every request received
+        is either still pending, was processed or was collapsed.
+        """
+        DocumentIndexRequestCounter = apps.get_model(
+            app_label='document_indexing',
+            model_name='DocumentIndexRequestCounter'
+        )
+
+        collapsed = DocumentIndexRequestCounter.objects.get_value(
+            name=INDEX_REQUEST_COUNTER_COLLAPSED
+        )
+        processed = DocumentIndexRequestCounter.objects.get_value(
+            name=INDEX_REQUEST_COUNTER_PROCESSED
+        )
+        pending = self.aggregate(
+            count=Count('pk'), request_count=Sum('request_count')
+        )
+
+        return {
+            'collapsed': collapsed,
+            'pending': pending['count'],
+            'processed': processed,
+            'requests': collapsed + processed + (
+                pending['request_count'] or 0
+            ),
+        }
+
+    def process_requests(self, batch_size=INDEX_REQUEST_BATCH_SIZE):
+        """
+        Index the documents of the oldest pending requests. Returns True
+        if the batch was full and more requests could be pending. A request
+        that fails to be indexed is added back with its request count.
+        """
+        DocumentIndexRequestCounter = apps.get_model(
+            app_label='document_indexing',
+            model_name='DocumentIndexRequestCounter'
+        )
+        Index = apps.get_model(
+            app_label='document_indexing', model_name='Index'
+        )
+
+        collapsed = 0
+        processed = 0
+
+        queryset = self.select_related('document').order_by(
+            'datetime_requested', 'pk'
+        )
+        index_requests = list(queryset[:batch_size])
+
+        for index_request in index_requests:
+            # Claim the request, requests received from now on create a new
+            # one
+            if not self.filter(pk=index_request.pk).delete()[0]:
+                # Claimed by another process
+                continue
+
+            document = index_request.document
+
+            # Requests for documents in the trash are processed by
+            # discarding them
+            if not document.in_trash:
+                try:
+                    Index.objects.index_document(document=document)
+                except Exception as exception:
+                    if isinstance(exception, (LockError, OperationalError)):
+                        logger.warning(
+                            'Unable to index document: %s; %s', document,
+                            exception
+                        )
+                    else:
+                        logger.exception(
+                            'Error indexing document: %s', document
+                        )
+
+                    self._add_request(
+                        document=document,
+                        request_count=index_request.request_count
+                    )
+                    continue
+
+            collapsed += index_request.request_count - 1
+            processed += 1
+
+        DocumentIndexRequestCounter.objects.increment(
+            name=INDEX_REQUEST_COUNTER_COLLAPSED, amount=collapsed
+        )
+        DocumentIndexRequestCounter.objects.increment(
+            name=INDEX_REQUEST_COUNTER_PROCESSED, amount=processed
+        )
+
+        logger.info(
+            'Indexed %d documents, %d index requests collapsed', processed,
+            collapsed
+        )
+
+        return len(index_requests) == batch_size
+
+    def request_document(self, document):
+        """
+        Ask for a document to be indexed. Requests for documents already
+        waiting to be indexed are collapsed into the pending request.
+        """
+        self._add_request(document=document)
+
+
 class IndexManager(models.Manager):
     def index_document(self, document):
         for index in self.filter(enabled=True, document_types=document.document_type):
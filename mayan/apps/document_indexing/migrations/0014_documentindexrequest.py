@@ -0,0 +1,42 @@
+# -*- coding: utf-8 -*-
+from __future__ import unicode_literals
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('documents', '0042_auto_20171016_1200'),
+        ('document_indexing', '0013_auto_20170714_2133'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='DocumentIndexRequest',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('datetime_requested', models.DateTimeField(auto_now_add=True, db_index=True, verbose_name='Date time requested')),
+                ('request_count', models.PositiveIntegerField(default=1, verbose_name='Request count')),
+                ('document', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, related_name='index_request', to='documents.Document', verbose_name='Document')),
+            ],
+            options={
+                'ordering': ('datetime_requested',),
+                'verbose_name': 'Document index request',
+                'verbose_name_plural': 'Document index requests',
+            },
+        ),
+        migrations.CreateModel(
+            name='DocumentIndexRequestCounter',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=32, unique=True, verbose_name='Name')),
+                ('value', models.BigIntegerField(default=0, verbose_name='Value')),
+            ],
+            options={
+                'verbose_name': 'Document index request counter',
+                'verbose_name_plural': 'Document index request counters',
+            },
+        ),
+    ]
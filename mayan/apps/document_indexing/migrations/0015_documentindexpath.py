@@ -0,0 +1,33 @@
+# -*- coding: utf-8 -*-
+from __future__ import unicode_literals
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('documents', '0042_auto_20171016_1200'),
+        ('document_indexing', '0014_documentindexrequest'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='DocumentIndexPath',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('paths', models.TextField(blank=True, verbose_name='Paths')),
+                ('document', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='index_paths', to='documents.Document', verbose_name='Document')),
+                ('index', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='document_paths', to='document_indexing.Index', verbose_name='Index')),
+            ],
+            options={
+                'verbose_name': 'Document index path',
+                'verbose_name_plural': 'Document index paths',
+            },
+        ),
+        migrations.AlterUniqueTogether(
+            name='documentindexpath',
+            unique_together=set([('index', 'document')]),
+        ),
+    ]
@@ -1,9 +1,10 @@
 from __future__ import absolute_import, unicode_literals
 
+import json
 import logging
 
-from django.db import models, transaction
-from django.template import Context, Template
+from django.db import IntegrityError, models, transaction
+from django.template import Context
 from django.urls import reverse
 from django.utils.encoding import force_text, python_2_unicode_compatible
 from django.utils.translation import ugettext, ugettext_lazy as _
@@ -12,12 +13,17 @@ from mptt.fields import TreeForeignKey
 from mptt.models import MPTTModel
 
 from acls.models import AccessControlList
+from common.managers import CounterManager
+from common.runtime import template_cache
 from documents.models import Document, DocumentType
 from documents.permissions import permission_document_view
 from lock_manager.runtime import locking_backend
 
+from .classes import IndexInstanceTreeNode, IndexRebuildPrefetch
+from .literals import INDEX_REBUILD_CHUNK_SIZE, INDEX_REBUILD_LOCK_TIMEOUT
 from .managers import (
-    DocumentIndexInstanceNodeManager, IndexManager, IndexInstanceNodeManager
+    DocumentIndexInstanceNodeManager, DocumentIndexRequestManager,
+    IndexManager, IndexInstanceNodeManager
 )
 
 logger = logging.getLogger(__name__)
@@ -91,32 +97,383 @@ class Index(models.Model):
         )
 
     def index_document(self, document):
+        """
+        Evaluate the templates for the document and update the index
+        instance nodes that contain it. Documents are added to existing
+        nodes locking only the row of each node. The lock of the index
+        instance tree is acquired only when nodes need to be created or
+        deleted, allowing several documents to be indexed at once.
+        The paths evaluated are kept and compared with the ones of the next
+        evaluation, only the nodes of the paths that changed are updated.
+        """
         logger.debug('Index; Indexing document: %s', document)
-        self.template_root.index_document(document=document)
+
+        # Avoid another process indexing this same document into this index
+        lock = locking_backend.acquire_lock(
+            'indexing:index_{}_document_{}'.format(self.pk, document.pk)
+        )
+        try:
+            template_root = self.template_root
+
+            index_instance_tree_root = IndexInstanceTreeNode(
+                index_template_node_id=template_root.pk
+            )
+            self._evaluate_document(
+                document=document,
+                index_template_node_children=self._get_template_node_children(),
+                index_template_node=template_root,
+                index_instance_tree_node=index_instance_tree_root,
+                context=Context({'document': document})
+            )
+            paths = dict(index_instance_tree_root.get_paths())
+
+            try:
+                document_index_path = DocumentIndexPath.objects.get(
+                    document=document, index=self
+                )
+            except DocumentIndexPath.DoesNotExist:
+                document_index_path = DocumentIndexPath(
+                    document=document, index=self
+                )
+                previous_paths = None
+            else:
+                previous_paths = document_index_path.get_paths()
+
+                if not self._check_paths(
+                    document=document, paths=previous_paths
+                ):
+                    # The nodes were replaced by a rebuild running at the
+                    # same time as the previous evaluation, link the
+                    # document again.
+                    logger.debug(
+                        'Index; Stale index paths for document: %s', document
+                    )
+                    previous_paths = None
+
+            if previous_paths is None:
+                index_instance_node_ids = {}
+            else:
+                linked_paths = {
+                    path: bool(index_instance_tree_node.document_ids)
+                    for path, index_instance_tree_node in paths.items()
+                }
+                previous_linked_paths = {
+                    path: linked for path, (pk, linked) in previous_paths.items()
+                }
+                if linked_paths == previous_linked_paths:
+                    logger.debug(
+                        'Index; Index paths unchanged for document: %s',
+                        document
+                    )
+                    return
+
+                # Nodes with the same path and link state as in the previous
+                # evaluation are not looked up or linked again.
+                index_instance_node_ids = {
+                    path: pk for path, (pk, linked) in previous_paths.items()
+                    if linked_paths.get(path) == linked
+                }
+
+            if not self._link_document(
+                document=document,
+                index_instance_tree_node=index_instance_tree_root,
+                index_instance_node_ids=index_instance_node_ids
+            ):
+                logger.debug(
+                    'Index; Creating index instance nodes for document: %s',
+                    document
+                )
+                tree_lock = locking_backend.acquire_lock(
+                    'indexing:index_instance_tree_{}'.format(self.pk)
+                )
+                # Start transaction after the lock in case the locking
+                # backend uses the database.
+                try:
+                    with transaction.atomic():
+                        self._create_instance_nodes(
+                            document=document,
+                            index_instance_tree_node=index_instance_tree_root
+                        )
+                finally:
+                    tree_lock.release()
+
+            linked_node_ids = [
+                index_instance_tree_node.pk for index_instance_tree_node in paths.values()
+                if index_instance_tree_node.document_ids
+            ]
+
+            if previous_paths is None:
+                queryset = IndexInstanceNode.objects.filter(
+                    documents=document, index_template_node__index=self
+                ).exclude(pk__in=linked_node_ids)
+            else:
+                queryset = IndexInstanceNode.objects.filter(
+                    documents=document, pk__in=[
+                        pk for pk, linked in previous_paths.values()
+                        if linked and pk not in linked_node_ids
+                    ]
+                )
+
+            for index_instance_node in queryset:
+                index_instance_node.remove_document(document=document)
+
+            document_index_path.set_paths(paths=paths)
+            document_index_path.save()
+        finally:
+            lock.release()
+
+    def _check_paths(self, document, paths):
+        """
+        Return True if the nodes of the stored paths of a document still
+        exist and the document is still linked to the nodes marked as
+        linked.
+        """
+        node_ids = set(pk for pk, linked in paths.values())
+        linked_node_ids = set(
+            pk for pk, linked in paths.values() if linked
+        )
+
+        return IndexInstanceNode.objects.filter(
+            pk__in=node_ids
+        ).count() == len(node_ids) and IndexInstanceNode.objects.filter(
+            documents=document, pk__in=linked_node_ids
+        ).count() == len(linked_node_ids)
+
+    def _create_instance_nodes(self, document, index_instance_tree_node, parent_id=None):
+        """
+        Get or create the index instance nodes of an evaluated document and
+        add the document to them. Must be called holding the lock of the
+        index instance tree.
+        """
+        # Pass the parent by primary key so that MPTT reads its current
+        # tree values from the database when inserting the node.
+        index_instance_node, created = IndexInstanceNode.objects.get_or_create(
+            index_template_node_id=index_instance_tree_node.index_template_node_id,
+            parent_id=parent_id, value=index_instance_tree_node.value
+        )
+        if index_instance_tree_node.document_ids:
+            index_instance_node.documents.add(document)
+
+        index_instance_tree_node.pk = index_instance_node.pk
+
+        for child in index_instance_tree_node.children.values():
+            self._create_instance_nodes(
+                document=document, index_instance_tree_node=child,
+                parent_id=index_instance_node.pk
+            )
+
+    def _link_document(self, document, index_instance_tree_node, index_instance_node_ids, parent_id=None, path=()):
+        """
+        Add the document to the existing index instance nodes of an
+        evaluated document without locking the index instance tree.
+        `index_instance_node_ids` maps the paths of the nodes already
+        linked to their primary keys. Returns False if any node does not
+        exist yet.
+        """
+        if path in index_instance_node_ids:
+            index_instance_tree_node.pk = index_instance_node_ids[path]
+        else:
+            try:
+                with transaction.atomic():
+                    queryset = IndexInstanceNode.objects.filter(
+                        index_template_node_id=index_instance_tree_node.index_template_node_id,
+                        parent_id=parent_id, value=index_instance_tree_node.value
+                    )
+                    if index_instance_tree_node.document_ids:
+                        # Lock the row of the node, it is not deleted as
+                        # empty while the document is added.
+                        queryset = queryset.select_for_update()
+
+                    index_instance_node = queryset.get()
+
+                    if index_instance_tree_node.document_ids:
+                        index_instance_node.documents.add(document)
+            except (IndexInstanceNode.DoesNotExist, IntegrityError):
+                # Missing or deleted by another process in the meantime
+                return False
+
+            index_instance_tree_node.pk = index_instance_node.pk
+
+        for key, child in index_instance_tree_node.children.items():
+            if not self._link_document(
+                document=document, index_instance_tree_node=child,
+                index_instance_node_ids=index_instance_node_ids,
+                parent_id=index_instance_tree_node.pk, path=path + (key,)
+            ):
+                return False
+
+        return True
+
+    def _get_template_node_children(self):
+        index_template_node_children = {}
+        for index_template_node in self.node_templates.order_by('tree_id', 'lft'):
+            index_template_node_children.setdefault(
+                index_template_node.parent_id, []
+            ).append(index_template_node)
+
+        return index_template_node_children
+
+    def _evaluate_document(self, document, index_template_node_children, index_template_node, index_instance_tree_node, context):
+        for child in index_template_node_children.get(index_template_node.pk, ()):
+            if not child.enabled:
+                continue
+
+            try:
+                result = template_cache.get(
+                    template_string=child.expression, owner=child
+                ).render(context=context)
+            except Exception as exception:
+                logger.debug(
+                    'Error indexing document: %s; expression: %s; %s',
+                    document, child.expression, exception
+                )
+            else:
+                if result:
+                    child_tree_node = index_instance_tree_node.get_child(
+                        index_template_node_id=child.pk, value=result
+                    )
+                    if child.link_documents:
+                        child_tree_node.document_ids.add(document.pk)
+
+                    self._evaluate_document(
+                        document=document,
+                        index_template_node_children=index_template_node_children,
+                        index_template_node=child,
+                        index_instance_tree_node=child_tree_node,
+                        context=context
+                    )
+
+    def _write_instance_tree(self, index_instance_tree_root):
+        """
+        Replace the current index instance nodes with the ones of the in
+        memory tree. Nodes are inserted one tree level at a time with
+        precalculated MPTT fields.
+        """
+        with transaction.atomic():
+            try:
+                instance_root = self.instance_root
+            except IndexInstanceNode.DoesNotExist:
+                tree_id = IndexInstanceNode._tree_manager._get_next_tree_id()
+            else:
+                tree_id = instance_root.tree_id
+                instance_root.delete()
+
+            # The document paths refer to the nodes being replaced
+            DocumentIndexPath.objects.filter(index=self).delete()
+
+            # Calculate the nested set values and group the nodes by level
+            levels = []
+            counter = [0]
+
+            def visit(tree_node, parent, level):
+                if len(levels) == level:
+                    levels.append([])
+                levels[level].append((tree_node, parent))
+
+                counter[0] += 1
+                tree_node.lft = counter[0]
+                for child in tree_node.children.values():
+                    visit(tree_node=child, parent=tree_node, level=level + 1)
+                counter[0] += 1
+                tree_node.rght = counter[0]
+
+            visit(tree_node=index_instance_tree_root, parent=None, level=0)
+
+            for level, level_nodes in enumerate(levels):
+                IndexInstanceNode.objects.bulk_create(
+                    [
+                        IndexInstanceNode(
+                            index_template_node_id=tree_node.index_template_node_id,
+                            level=level, lft=tree_node.lft,
+                            parent_id=parent.pk if parent else None,
+                            rght=tree_node.rght, tree_id=tree_id,
+                            value=tree_node.value
+                        ) for tree_node, parent in level_nodes
+                    ]
+                )
+
+                # Not all databases return the primary key of bulk inserted
+                # rows, the left values are unique within the tree
+                pk_map = dict(
+                    IndexInstanceNode.objects.filter(
+                        level=level, tree_id=tree_id
+                    ).values_list('lft', 'pk')
+                )
+                for tree_node, parent in level_nodes:
+                    tree_node.pk = pk_map[tree_node.lft]
+
+            DocumentsThrough = IndexInstanceNode.documents.through
+            documents_field = IndexInstanceNode._meta.get_field('documents')
+
+            DocumentsThrough.objects.bulk_create(
+                [
+                    DocumentsThrough(
+                        **{
+                            documents_field.m2m_column_name(): tree_node.pk,
+                            documents_field.m2m_reverse_name(): document_id
+                        }
+                    ) for level_nodes in levels for tree_node, parent in level_nodes
+                    for document_id in sorted(tree_node.document_ids)
+                ]
+            )
 
     def rebuild(self):
         """
-        Delete and reconstruct the index by deleting of all its instance nodes
-        and recreating them for the documents whose types are associated with
-        this index
+        Delete and reconstruct the index for the documents whose types are
+        associated with this index. The new index instance tree is built in
+        memory, evaluating the templates over batches of documents, and
+        then replaces the current one in a single transaction. The current
+        index remains available while the templates are evaluated.
         """
-        # Delete all index instance nodes by deleting the root index
-        # instance node. All child index instance nodes will be cascade
-        # deleted.
-        try:
-            self.instance_root.delete()
-        except IndexInstanceNode.DoesNotExist:
-            # Empty index, ignore this exception
-            pass
+        template_root = self.template_root
+        index_template_node_children = self._get_template_node_children()
+
+        index_instance_tree_root = IndexInstanceTreeNode(
+            index_template_node_id=template_root.pk
+        )
+
+        # Newest documents first, like the default document ordering
+        queryset = Document.objects.filter(
+            document_type__in=self.document_types.all()
+        ).select_related('document_type').prefetch_related(
+            *IndexRebuildPrefetch.get_lookups()
+        ).order_by('-pk')
+
+        last_pk = None
+        while True:
+            if last_pk is not None:
+                chunk_queryset = queryset.filter(pk__lt=last_pk)
+            else:
+                chunk_queryset = queryset
+
+            documents = list(chunk_queryset[:INDEX_REBUILD_CHUNK_SIZE])
+            if not documents:
+                break
+
+            for document in documents:
+                self._evaluate_document(
+                    document=document,
+                    index_template_node_children=index_template_node_children,
+                    index_template_node=template_root,
+                    index_instance_tree_node=index_instance_tree_root,
+                    context=Context({'document': document})
+                )
 
-        # Create the new root index instance node
-        self.template_root.index_instance_nodes.create()
+            last_pk = documents[-1].pk
 
-        # Re-index each document with a type associated with this index
-        for document in Document.objects.filter(document_type__in=self.document_types.all()):
-            # Evaluate each index template node for each document
-            # associated with this index.
-            self.index_document(document=document)
+        # Block the changes to the index instance tree structure while it
+        # is replaced. Start the transaction after the lock in case the
+        # locking backend uses the database.
+        lock = locking_backend.acquire_lock(
+            'indexing:index_instance_tree_{}'.format(self.pk),
+            timeout=INDEX_REBUILD_LOCK_TIMEOUT
+        )
+        try:
+            self._write_instance_tree(
+                index_instance_tree_root=index_instance_tree_root
+            )
+        finally:
+            lock.release()
 
 
 class IndexInstance(Index):
@@ -187,91 +544,6 @@ class IndexTemplateNode(MPTTModel):
         else:
             return self.expression
 
-    def index_document(self, document, acquire_lock=True, index_instance_node_parent=None):
-        # Avoid another process indexing this same document for the same
-        # template node. This prevents this template node's index instance
-        # nodes from being deleted while the template is evaluated and
-        # documents added to it.
-        if acquire_lock:
-            lock = locking_backend.acquire_lock(
-                'indexing:indexing_template_node_{}'.format(self.pk)
-            )
-
-        # Start transaction after the lock in case the locking backend uses
-        # the database.
-        try:
-            with transaction.atomic():
-                logger.debug(
-                    'IndexTemplateNode; Indexing document: %s', document
-                )
-
-                logger.debug(
-                    'Removing document "%s" from all index instance nodes',
-                    document
-                )
-                for index_template_node in self.index_instance_nodes.all():
-                    index_template_node.remove_document(
-                        document=document, acquire_lock=False
-                    )
-
-                if not self.parent:
-                    logger.debug(
-                        'IndexTemplateNode; parent: creating empty root index '
-                        'instance node'
-                    )
-                    index_instance_node, created = self.index_instance_nodes.get_or_create()
-
-                    for child in self.get_children():
-                        child.index_document(
-                            document=document, acquire_lock=False,
-                            index_instance_node_parent=index_instance_node
-                        )
-                elif self.enabled:
-                    logger.debug('IndexTemplateNode; non parent: evaluating')
-                    logger.debug('My parent template is: %s', self.parent)
-                    logger.debug(
-                        'My parent instance node is: %s',
-                        index_instance_node_parent
-                    )
-                    logger.debug(
-                        'IndexTemplateNode; Evaluating template: %s', self.expression
-                    )
-
-                    try:
-                        context = Context({'document': document})
-                        template = Template(self.expression)
-                        result = template.render(context=context)
-                    except Exception as exception:
-                        logger.debug('Evaluating error: %s', exception)
-                        error_message = _(
-                            'Error indexing document: %(document)s; expression: '
-                            '%(expression)s; %(exception)s'
-                        ) % {
-                            'document': document,
-                            'expression': self.expression,
-                            'exception': exception
-                        }
-                        logger.debug(error_message)
-                    else:
-                        logger.debug('Evaluation result: %s', result)
-
-                        if result:
-                            index_instance_node, created = self.index_instance_nodes.get_or_create(
-                                parent=index_instance_node_parent,
-                                value=result
-                            )
-                            if self.link_documents:
-                                index_instance_node.documents.add(document)
-
-                            for child in self.get_children():
-                                child.index_document(
-                                    document=document, acquire_lock=False,
-                                    index_instance_node_parent=index_instance_node
-                                )
-        finally:
-            if acquire_lock:
-                lock.release()
-
 
 @python_2_unicode_compatible
 class IndexInstanceNode(MPTTModel):
@@ -346,26 +618,50 @@ class IndexInstanceNode(MPTTModel):
 
     def delete_empty(self, acquire_lock=True):
         """
+        Delete this node and its ancestors if they are left without
+        documents or children.
         The argument `acquire_lock` controls whether or not this method
-        acquires or lock. The case for this is to acquire when called directly
-        or not to acquire when called as part of a larger index process
-        that already has a lock
+        acquires the lock of the index instance tree. The case for this is
+        to acquire when called directly or not to acquire when called as
+        part of a larger index process that already has the lock.
         """
-        # Prevent another process to work on this node. We use the node's
-        # parent template node for the lock
+        # Prevent another process from creating or deleting nodes in this
+        # index instance tree.
         if acquire_lock:
             lock = locking_backend.acquire_lock(
-                'indexing:indexing_template_node_{}'.format(
-                    self.index_template_node.pk
+                'indexing:index_instance_tree_{}'.format(
+                    self.index_template_node.index_id
                 )
             )
         # Start transaction after the lock in case the locking backend uses
         # the database.
-        with transaction.atomic():
-            if self.documents.count() == 0 and self.get_children().count() == 0:
-                if self.parent:
-                    self.delete()
-                    self.parent.delete_empty(acquire_lock=False)
+        try:
+            with transaction.atomic():
+                index_instance_node_id = self.pk
+                while index_instance_node_id:
+                    # Documents are added to existing nodes without the
+                    # lock of the tree, lock the row of the node before
+                    # checking that it is empty. This also reloads the tree
+                    # values used by MPTT to delete the node.
+                    try:
+                        index_instance_node = IndexInstanceNode.objects.select_for_update().get(
+                            pk=index_instance_node_id
+                        )
+                    except IndexInstanceNode.DoesNotExist:
+                        break
+
+                    if not index_instance_node.parent_id:
+                        break
+
+                    if index_instance_node.documents.exists():
+                        break
+
+                    if IndexInstanceNode.objects.filter(parent_id=index_instance_node.pk).exists():
+                        break
+
+                    index_instance_node.delete()
+                    index_instance_node_id = index_instance_node.parent_id
+        finally:
             if acquire_lock:
                 lock.release()
 
@@ -375,23 +671,108 @@ class IndexInstanceNode(MPTTModel):
     def remove_document(self, document, acquire_lock=True):
         """
         The argument `acquire_lock` controls whether or not this method
-        acquires or lock. The case for this is to acquire when called directly
-        or not to acquire when called as part of a larger index process
-        that already has a lock
+        acquires the lock of the index instance tree to delete the nodes
+        left empty. The case for this is to acquire when called directly or
+        not to acquire when called as part of a larger index process that
+        already has the lock.
         """
-        # Prevent another process to work on this node. We use the node's
-        # parent template node for the lock
-        if acquire_lock:
-            lock = locking_backend.acquire_lock(
-                'indexing:indexing_template_node_{}'.format(
-                    self.index_template_node.pk
-                )
-            )
         self.documents.remove(document)
-        self.delete_empty(acquire_lock=False)
+        self.delete_empty(acquire_lock=acquire_lock)
 
-        if acquire_lock:
-            lock.release()
+
+@python_2_unicode_compatible
+class DocumentIndexPath(models.Model):
+    """
+    The index instance node paths of a document when last evaluated for an
+    index. Each path is stored with the primary key of its node and whether
+    the document is linked to it.
+    """
+    index = models.ForeignKey(
+        Index, on_delete=models.CASCADE, related_name='document_paths',
+        verbose_name=_('Index')
+    )
+    document = models.ForeignKey(
+        Document, on_delete=models.CASCADE, related_name='index_paths',
+        verbose_name=_('Document')
+    )
+    paths = models.TextField(blank=True, verbose_name=_('Paths'))
+
+    class Meta:
+        unique_together = ('index', 'document')
+        verbose_name = _('Document index path')
+        verbose_name_plural = _('Document index paths')
+
+    def __str__(self):
+        return '{}: {}'.format(self.index, self.document)
+
+    def get_paths(self):
+        """
+        Return a dictionary of the paths, as tuples of template node and
+        value pairs, to the primary key of their node and link state.
+        """
+        return {
+            tuple(tuple(step) for step in path): (pk, linked)
+            for path, pk, linked in json.loads(self.paths or '[]')
+        }
+
+    def set_paths(self, paths):
+        self.paths = json.dumps(
+            sorted(
+                [
+                    path, index_instance_tree_node.pk,
+                    bool(index_instance_tree_node.document_ids)
+                ] for path, index_instance_tree_node in paths.items()
+            )
+        )
+
+
+@python_2_unicode_compatible
+class DocumentIndexRequest(models.Model):
+    """
+    A document waiting to be indexed. Further requests to index the same
+    document are added to its request count.
+    """
+    document = models.OneToOneField(
+        Document, on_delete=models.CASCADE, related_name='index_request',
+        verbose_name=_('Document')
+    )
+    datetime_requested = models.DateTimeField(
+        auto_now_add=True, db_index=True, verbose_name=_('Date time requested')
+    )
+    request_count = models.PositiveIntegerField(
+        default=1, verbose_name=_('Request count')
+    )
+
+    objects = DocumentIndexRequestManager()
+
+    class Meta:
+        ordering = ('datetime_requested',)
+        verbose_name = _('Document index request')
+        verbose_name_plural = _('Document index requests')
+
+    def __str__(self):
+        return force_text(self.document)
+
+
+@python_2_unicode_compatible
+class DocumentIndexRequestCounter(models.Model):
+    """
+    Cumulative counters of the document index requests processed and
+    collapsed into already pending requests.
+    """
+    name = models.CharField(
+        max_length=32, unique=True, verbose_name=_('Name')
+    )
+    value = models.BigIntegerField(default=0, verbose_name=_('Value'))
+
+    objects = CounterManager()
+
+    class Meta:
+        verbose_name = _('Document index request counter')
+        verbose_name_plural = _('Document index request counters')
+
+    def __str__(self):
+        return self.name
 
 
 class DocumentIndexInstanceNode(IndexInstanceNode):
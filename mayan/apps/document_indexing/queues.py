@@ -19,6 +19,10 @@ queue_indexing.add_task_type(
     name='document_indexing.tasks.task_index_document',
     label=_('Index document')
 )
+queue_indexing.add_task_type(
+    name='document_indexing.tasks.task_process_index_requests',
+    label=_('Process document index requests')
+)
 queue_tools.add_task_type(
     name='document_indexing.tasks.task_rebuild_index',
     label=_('Rebuild index')
@@ -0,0 +1,18 @@
+from __future__ import unicode_literals
+
+from django.utils.translation import ugettext_lazy as _
+
+from smart_settings import Namespace
+
+from .literals import DEFAULT_INDEX_REQUEST_DELAY
+
+namespace = Namespace(name='document_indexing', label=_('Document indexing'))
+
+setting_index_request_delay = namespace.add_setting(
+    global_name='DOCUMENT_INDEXING_REQUEST_DELAY',
+    default=DEFAULT_INDEX_REQUEST_DELAY, help_text=_(
+        'Time in seconds to wait before indexing a document after a change. '
+        'Further changes to the same document during this time are indexed '
+        'together.'
+    )
+)
@@ -78,6 +78,16 @@ def task_index_document(self, document_id):
             raise self.retry(exc=exception)
 
 
+@app.task(ignore_result=True)
+def task_process_index_requests():
+    DocumentIndexRequest = apps.get_model(
+        app_label='document_indexing', model_name='DocumentIndexRequest'
+    )
+
+    if DocumentIndexRequest.objects.process_requests():
+        task_process_index_requests.apply_async()
+
+
 @app.task(bind=True, default_retry_delay=RETRY_DELAY, ignore_result=True)
 def task_rebuild_index(self, index_id):
     Index = apps.get_model(
@@ -1,5 +1,6 @@
 from __future__ import unicode_literals
 
+TEST_DOCUMENT_LABEL_EDITED = 'test document label edited'
 TEST_INDEX_LABEL = 'test label'
 TEST_INDEX_LABEL_EDITED = 'test edited label'
 TEST_INDEX_SLUG = 'test_slug'
@@ -1,18 +1,26 @@
 from __future__ import unicode_literals
 
+import mock
+
 from django.test import override_settings
 from django.utils.encoding import force_text
 
 from common.tests import BaseTestCase
 from documents.models import DocumentType
 from documents.tests import TEST_SMALL_DOCUMENT_PATH, TEST_DOCUMENT_TYPE_LABEL
+from lock_manager import LockError
+from lock_manager.runtime import locking_backend
 from metadata.models import MetadataType, DocumentTypeMetadataType
 
-from ..models import Index, IndexInstanceNode, IndexTemplateNode
+from ..models import (
+    DocumentIndexPath, DocumentIndexRequest, DocumentIndexRequestCounter,
+    Index, IndexInstanceNode, IndexTemplateNode
+)
 
 from .literals import (
-    TEST_INDEX_LABEL, TEST_INDEX_TEMPLATE_METADATA_EXPRESSION,
-    TEST_METADATA_TYPE_LABEL, TEST_METADATA_TYPE_NAME
+    TEST_DOCUMENT_LABEL_EDITED, TEST_INDEX_LABEL,
+    TEST_INDEX_TEMPLATE_METADATA_EXPRESSION, TEST_METADATA_TYPE_LABEL,
+    TEST_METADATA_TYPE_NAME
 )
 
 
@@ -203,7 +211,7 @@ class IndexTestCase(BaseTestCase):
         Index.objects.rebuild()
 
         self.assertEqual(
-            [instance.value for instance in IndexInstanceNode.objects.all().order_by('pk')],
+            [instance.value for instance in IndexInstanceNode.objects.all().order_by('lft')],
             [
                 '', force_text(self.document_2.uuid), self.document_2.label,
                 force_text(self.document.uuid), self.document.label
@@ -230,3 +238,243 @@ class IndexTestCase(BaseTestCase):
         )
 
         Index.objects.rebuild()
+
+    def test_rebuild_tree_structure(self):
+        with open(TEST_SMALL_DOCUMENT_PATH) as file_object:
+            self.document_2 = self.document_type.new_document(
+                file_object=file_object
+            )
+
+        index = Index.objects.create(label=TEST_INDEX_LABEL)
+        index.document_types.add(self.document_type)
+
+        level_1 = index.node_templates.create(
+            parent=index.template_root, expression='{{ document.uuid }}',
+            link_documents=False
+        )
+        index.node_templates.create(
+            parent=level_1, expression='{{ document.label }}',
+            link_documents=True
+        )
+
+        index.rebuild()
+        # Rebuilding again replaces the previous index instance tree
+        index.rebuild()
+
+        tree_values = list(
+            IndexInstanceNode.objects.order_by('pk').values_list(
+                'tree_id', 'lft', 'rght', 'level'
+            )
+        )
+
+        # The bulk calculated tree values match the ones MPTT calculates
+        # from the node parents
+        IndexInstanceNode._tree_manager.rebuild()
+        self.assertEqual(
+            list(
+                IndexInstanceNode.objects.order_by('pk').values_list(
+                    'tree_id', 'lft', 'rght', 'level'
+                )
+            ), tree_values
+        )
+        self.assertEqual(index.instance_root.get_descendant_count(), 4)
+        self.assertQuerysetEqual(
+            IndexInstanceNode.objects.get(
+                parent__value=force_text(self.document.uuid)
+            ).documents.all(), (repr(self.document),)
+        )
+
+        # New documents are indexed on top of the rebuilt tree
+        with open(TEST_SMALL_DOCUMENT_PATH) as file_object:
+            document_3 = self.document_type.new_document(
+                file_object=file_object
+            )
+
+        self.assertEqual(index.instance_root.get_descendant_count(), 6)
+        self.assertQuerysetEqual(
+            IndexInstanceNode.objects.get(
+                parent__value=force_text(document_3.uuid)
+            ).documents.all(), (repr(document_3),)
+        )
+
+    def test_indexing_into_existing_nodes_without_tree_lock(self):
+        index = Index.objects.create(label=TEST_INDEX_LABEL)
+        index.document_types.add(self.document_type)
+        index.node_templates.create(
+            parent=index.template_root,
+            expression='{{ document.label }}', link_documents=True
+        )
+        index.rebuild()
+
+        with open(TEST_SMALL_DOCUMENT_PATH) as file_object:
+            document_2 = self.document_type.new_document(
+                file_object=file_object
+            )
+
+        lock = locking_backend.acquire_lock(
+            'indexing:index_instance_tree_{}'.format(index.pk)
+        )
+        try:
+            # The node of the label exists, only its row is locked
+            index.index_document(document=document_2)
+
+            # New nodes require the lock of the index instance tree
+            document_2.label = TEST_DOCUMENT_LABEL_EDITED
+            with self.assertRaises(LockError):
+                index.index_document(document=document_2)
+        finally:
+            lock.release()
+
+        self.assertQuerysetEqual(
+            IndexInstanceNode.objects.get(
+                value=self.document.label
+            ).documents.order_by('pk'), (
+                repr(self.document), repr(document_2)
+            )
+        )
+
+    def test_indexing_unchanged_paths(self):
+        index = Index.objects.create(label=TEST_INDEX_LABEL)
+        index.document_types.add(self.document_type)
+        index.node_templates.create(
+            parent=index.template_root, expression='{{ document.label }}',
+            link_documents=True
+        )
+
+        index.index_document(document=self.document)
+        self.assertTrue(
+            DocumentIndexPath.objects.filter(
+                document=self.document, index=index
+            ).exists()
+        )
+
+        with mock.patch.object(Index, '_link_document') as _link_document:
+            index.index_document(document=self.document)
+
+        self.assertFalse(_link_document.called)
+
+        self.document.label = TEST_DOCUMENT_LABEL_EDITED
+        index.index_document(document=self.document)
+
+        self.assertEqual(
+            list(
+                IndexInstanceNode.objects.values_list('value', flat=True)
+            ), ['', TEST_DOCUMENT_LABEL_EDITED]
+        )
+        self.assertQuerysetEqual(
+            IndexInstanceNode.objects.get(
+                value=TEST_DOCUMENT_LABEL_EDITED
+            ).documents.all(), (repr(self.document),)
+        )
+
+    def test_indexing_stale_paths(self):
+        index = Index.objects.create(label=TEST_INDEX_LABEL)
+        index.document_types.add(self.document_type)
+        index.node_templates.create(
+            parent=index.template_root, expression='{{ document.label }}',
+            link_documents=True
+        )
+
+        index.index_document(document=self.document)
+        paths = DocumentIndexPath.objects.get(
+            document=self.document, index=index
+        ).paths
+
+        # Paths saved by an evaluation that ran during a rebuild refer to
+        # the nodes that the rebuild replaced
+        index.rebuild()
+        IndexInstanceNode.objects.get(
+            value=self.document.label
+        ).documents.remove(self.document)
+        DocumentIndexPath.objects.update_or_create(
+            document=self.document, index=index, defaults={'paths': paths}
+        )
+
+        index.index_document(document=self.document)
+
+        self.assertQuerysetEqual(
+            IndexInstanceNode.objects.get(
+                value=self.document.label
+            ).documents.all(), (repr(self.document),)
+        )
+
+
+@override_settings(OCR_AUTO_OCR=False)
+class DocumentIndexRequestTestCase(BaseTestCase):
+    def setUp(self):
+        super(DocumentIndexRequestTestCase, self).setUp()
+        self.document_type = DocumentType.objects.create(
+            label=TEST_DOCUMENT_TYPE_LABEL
+        )
+
+        with open(TEST_SMALL_DOCUMENT_PATH) as file_object:
+            self.document = self.document_type.new_document(
+                file_object=file_object
+            )
+
+        self.index = Index.objects.create(label=TEST_INDEX_LABEL)
+        self.index.document_types.add(self.document_type)
+        self.index.node_templates.create(
+            parent=self.index.template_root,
+            expression='{{ document.label }}', link_documents=True
+        )
+
+    def tearDown(self):
+        self.document_type.delete()
+        super(DocumentIndexRequestTestCase, self).tearDown()
+
+    @mock.patch('document_indexing.managers.task_process_index_requests')
+    def test_request_collapsing(self, task_process_index_requests):
+        # Discard the counters of the document creation request
+        DocumentIndexRequestCounter.objects.all().delete()
+
+        for count in range(3):
+            DocumentIndexRequest.objects.request_document(
+                document=self.document
+            )
+
+        self.assertEqual(
+            task_process_index_requests.apply_async.call_count, 1
+        )
+        self.assertEqual(
+            DocumentIndexRequest.objects.get(
+                document=self.document
+            ).request_count, 3
+        )
+        self.assertFalse(
+            IndexInstanceNode.objects.filter(
+                value=self.document.label
+            ).exists()
+        )
+
+        DocumentIndexRequest.objects.process_requests()
+
+        self.assertQuerysetEqual(
+            IndexInstanceNode.objects.get(
+                value=self.document.label
+            ).documents.all(), (repr(self.document),)
+        )
+
+        statistics = DocumentIndexRequest.objects.get_statistics()
+
+        self.assertEqual(statistics['collapsed'], 2)
+        self.assertEqual(statistics['pending'], 0)
+        self.assertEqual(statistics['processed'], 1)
+        self.assertEqual(statistics['requests'], 3)
+
+    @mock.patch('document_indexing.managers.task_process_index_requests')
+    def test_request_failure(self, task_process_index_requests):
+        DocumentIndexRequest.objects.all().delete()
+        DocumentIndexRequest.objects.request_document(document=self.document)
+        DocumentIndexRequest.objects.request_document(document=self.document)
+
+        with mock.patch.object(Index.objects, 'index_document') as index_document:
+            index_document.side_effect = ValueError
+
+            DocumentIndexRequest.objects.process_requests()
+
+        self.assertEqual(
+            DocumentIndexRequest.objects.get(
+                document=self.document
+            ).request_count, 2
+        )
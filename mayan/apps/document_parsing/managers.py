@@ -5,7 +5,9 @@ import sys
 import traceback
 
 from django.conf import settings
-from django.db import models
+from django.db import models, transaction
+
+from dynamic_search.utils import index_instances
 
 from .events import event_parsing_document_version_finish
 from .parsers import Parser
@@ -14,6 +16,43 @@ logger = logging.getLogger(__name__)
 
 
 class DocumentPageContentManager(models.Manager):
+    def bulk_update_document_version(self, document_version, content_list):
+        """
+        Replace the content of all the pages of a document version with
+        the items of content_list, in page order, using a single insert.
+        Every page gets a content entry, pages missing from content_list
+        get an empty one.
+        """
+        document_pages = list(document_version.pages.all())
+
+        if len(content_list) != len(document_pages):
+            logger.warning(
+                'Document version: %d has %d pages but %d pages of content '
+                'were parsed', document_version.pk, len(document_pages),
+                len(content_list)
+            )
+            content_list = list(content_list[:len(document_pages)])
+            content_list.extend(
+                [''] * (len(document_pages) - len(content_list))
+            )
+
+        with transaction.atomic():
+            self.filter(document_page__in=document_pages).delete()
+            self.bulk_create(
+                [
+                    self.model(document_page=document_page, content=content)
+                    for document_page, content in zip(
+                        document_pages, content_list
+                    )
+                ]
+            )
+
+        # Bulk writes don't send post_save
+        index_instances(
+            model=document_version._meta.model,
+            id_list=(document_version.pk,)
+        )
+
     def process_document_version(self, document_version):
         logger.info(
             'Starting parsing for document version: %s', document_version
@@ -5,6 +5,7 @@ import os
 import subprocess
 
 from django.apps import apps
+from django.utils.encoding import force_text
 from django.utils.translation import ugettext_lazy as _
 
 from common.utils import copyfile, fs_cleanup, mkstemp
@@ -122,43 +123,106 @@ class PopplerParser(Parser):
 
         logger.debug('self.pdftotext_path: %s', self.pdftotext_path)
 
-    def execute(self, file_object, page_number):
-        logger.debug('Parsing PDF page: %d', page_number)
-
+    def _run_pdftotext(self, file_object, first_page=None, last_page=None):
         destination_descriptor, temp_filepath = mkstemp()
         copyfile(file_object, temp_filepath)
 
         command = []
         command.append(self.pdftotext_path)
-        command.append('-f')
-        command.append(str(page_number))
-        command.append('-l')
-        command.append(str(page_number))
+        if first_page:
+            command.append('-f')
+            command.append(str(first_page))
+        if last_page:
+            command.append('-l')
+            command.append(str(last_page))
         command.append(temp_filepath)
         command.append('-')
 
-        proc = subprocess.Popen(
-            command, close_fds=True, stderr=subprocess.PIPE,
-            stdout=subprocess.PIPE
-        )
-        return_code = proc.wait()
-        if return_code != 0:
-            logger.error(proc.stderr.readline())
+        try:
+            proc = subprocess.Popen(
+                command, close_fds=True, stderr=subprocess.PIPE,
+                stdout=subprocess.PIPE
+            )
+            output, error = proc.communicate()
+        finally:
             fs_cleanup(temp_filepath, file_descriptor=destination_descriptor)
 
+        if proc.returncode != 0:
+            logger.error(error)
             raise ParserError
 
-        output = proc.stdout.read()
-        fs_cleanup(temp_filepath, file_descriptor=destination_descriptor)
+        return output
+
+    def _split_pages(self, output):
+        # pdftotext ends every page with a form feed
+        pages = output.split(b'\x0c')[:-1] or [b'']
+
+        result = []
+        for page in pages:
+            if page[-2:] == b'\x0a\x0a':
+                page = page[:-2]
+            result.append(page)
+
+        return result
 
-        if output == b'\x0c':
+    def execute(self, file_object, page_number):
+        logger.debug('Parsing PDF page: %d', page_number)
+
+        output = self._run_pdftotext(
+            file_object=file_object, first_page=page_number,
+            last_page=page_number
+        )
+
+        content = self._split_pages(output=output)[0]
+
+        if not content:
             logger.debug('Parser didn\'t return any output')
-            return ''
 
-        if output[-3:] == b'\x0a\x0a\x0c':
-            return output[:-3]
+        return content
 
-        return output
+    def execute_document(self, file_object):
+        """
+        Parse all the pages of the file with a single pdftotext run.
+        Returns the text of each page, in page order.
+        """
+        logger.debug('Parsing PDF document')
+
+        return [
+            force_text(page) for page in self._split_pages(
+                output=self._run_pdftotext(file_object=file_object)
+            )
+        ]
+
+    def process_document_version(self, document_version):
+        DocumentPageContent = apps.get_model(
+            app_label='document_parsing', model_name='DocumentPageContent'
+        )
+
+        logger.info(
+            'Starting parsing for document version: %s', document_version
+        )
+        logger.debug('document version: %d', document_version.pk)
+
+        file_object = document_version.get_intermidiate_file()
+
+        try:
+            content_list = self.execute_document(file_object=file_object)
+        except ParserError:
+            raise
+        except Exception as exception:
+            error_message = _('Exception parsing document; %s') % exception
+            logger.error(error_message)
+            raise ParserError(error_message)
+        finally:
+            file_object.close()
+
+        DocumentPageContent.objects.bulk_update_document_version(
+            document_version=document_version, content_list=content_list
+        )
+
+        logger.info(
+            'Finished parsing document version: %s', document_version
+        )
 
 
 Parser.register(
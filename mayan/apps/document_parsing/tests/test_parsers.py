@@ -1,5 +1,9 @@
 from __future__ import unicode_literals
 
+import subprocess
+
+import mock
+
 from django.core.files.base import File
 from django.test import override_settings
 
@@ -7,6 +11,7 @@ from common.tests import BaseTestCase
 from documents.models import DocumentType
 from documents.tests import TEST_DOCUMENT_PATH, TEST_DOCUMENT_TYPE_LABEL
 
+from ..models import DocumentPageContent
 from ..parsers import PopplerParser
 
 
@@ -35,3 +40,36 @@ class ParserTestCase(BaseTestCase):
         self.assertTrue(
             'Mayan EDMS Documentation' in self.document.pages.first().content.content
         )
+
+    def test_poppler_parser_single_run(self):
+        parser = PopplerParser()
+
+        with mock.patch('document_parsing.parsers.subprocess.Popen', wraps=subprocess.Popen) as popen:
+            parser.process_document_version(self.document.latest_version)
+
+        self.assertEqual(popen.call_count, 1)
+        self.assertEqual(
+            DocumentPageContent.objects.filter(
+                document_page__document_version=self.document.latest_version
+            ).count(), self.document.pages.count()
+        )
+        self.assertTrue(
+            'Mayan EDMS Documentation' in self.document.pages.first().content.content
+        )
+
+    def test_bulk_update_missing_pages(self):
+        document_version = self.document.latest_version
+
+        DocumentPageContent.objects.bulk_update_document_version(
+            document_version=document_version, content_list=['first page']
+        )
+
+        self.assertEqual(
+            list(
+                DocumentPageContent.objects.filter(
+                    document_page__document_version=document_version
+                ).order_by('document_page__page_number').values_list(
+                    'content', flat=True
+                )
+            ), ['first page'] + [''] * (document_version.pages.count() - 1)
+        )
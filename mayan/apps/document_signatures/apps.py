@@ -17,6 +17,7 @@ from mayan.celery import app
 from navigation import SourceColumn
 
 from .handlers import (
+    handler_delete_unwrapped_file, handler_reset_document_version_flag,
     unverify_key_signatures, verify_key_signatures,
     verify_missing_embedded_signature
 )
@@ -160,6 +161,16 @@ class DocumentSignaturesApp(MayanAppConfig):
             links=(link_all_document_version_signature_verify,)
         )
 
+        post_delete.connect(
+            handler_delete_unwrapped_file,
+            dispatch_uid='handler_delete_unwrapped_file',
+            sender=DocumentVersion
+        )
+        post_delete.connect(
+            handler_reset_document_version_flag,
+            dispatch_uid='handler_reset_document_version_flag',
+            sender=EmbeddedSignature
+        )
         post_delete.connect(
             unverify_key_signatures,
             dispatch_uid='unverify_key_signatures',
@@ -1,11 +1,47 @@
 from __future__ import unicode_literals
 
+from django.apps import apps
+
 from .tasks import (
     task_unverify_key_signatures, task_verify_missing_embedded_signature,
     task_verify_key_signatures
 )
 
 
+def handler_delete_unwrapped_file(sender, **kwargs):
+    EmbeddedSignature = apps.get_model(
+        app_label='document_signatures', model_name='EmbeddedSignature'
+    )
+
+    EmbeddedSignature.objects.delete_unwrapped_file(
+        document_version=kwargs['instance']
+    )
+
+
+def handler_reset_document_version_flag(sender, **kwargs):
+    DocumentVersion = apps.get_model(
+        app_label='documents', model_name='DocumentVersion'
+    )
+    EmbeddedSignature = apps.get_model(
+        app_label='document_signatures', model_name='EmbeddedSignature'
+    )
+
+    try:
+        document_version = kwargs['instance'].document_version
+    except DocumentVersion.DoesNotExist:
+        # Deleted along with its document version
+        return
+
+    # Check again on the next open, the version could have more embedded
+    # signatures
+    EmbeddedSignature.objects.set_document_version_flag(
+        document_version=document_version, value=None
+    )
+    EmbeddedSignature.objects.delete_unwrapped_file(
+        document_version=document_version
+    )
+
+
 def unverify_key_signatures(sender, **kwargs):
     task_unverify_key_signatures.apply_async(
         kwargs=dict(key_id=kwargs['instance'].key_id)
@@ -0,0 +1,6 @@
+from __future__ import unicode_literals
+
+UNWRAP_LOCK_BLOCKING_TIMEOUT = 30
+UNWRAP_LOCK_NAME_TEMPLATE = 'document_signatures:unwrap_{}'
+UNWRAP_LOCK_TIMEOUT = 60 * 10
+UNWRAPPED_FILE_NAME_TEMPLATE = 'document-version-{}-unwrapped'
@@ -2,32 +2,181 @@ from __future__ import unicode_literals
 
 import logging
 import os
+import shutil
 
+from django.core.files.storage import FileSystemStorage
 from django.db import models
 
 from common.utils import mkstemp
 from django_gpg.exceptions import DecryptionError
+from django_gpg.literals import VERIFICATION_BATCH_SIZE
 from django_gpg.models import Key
 from documents.models import DocumentVersion
+from documents.runtime import cache_storage_backend
+from lock_manager import LockError
+from lock_manager.runtime import locking_backend
+from storage.backends.contentaddressedstorage import ContentAddressedStorage
+from storage.backends.filebasedstorage import FileBasedStorage
+
+from .literals import (
+    UNWRAP_LOCK_BLOCKING_TIMEOUT, UNWRAP_LOCK_NAME_TEMPLATE,
+    UNWRAP_LOCK_TIMEOUT, UNWRAPPED_FILE_NAME_TEMPLATE
+)
 
 logger = logging.getLogger(__name__)
 
+# Storage classes that keep the content of the files as is in the local
+# file system. Subclasses are not trusted to do the same.
+UNMODIFIED_FILE_STORAGES = (
+    ContentAddressedStorage, FileBasedStorage, FileSystemStorage
+)
+
 
 class EmbeddedSignatureManager(models.Manager):
-    def open_signed(self, file_object, document_version):
-        for signature in self.filter(document_version=document_version):
+    def _unwrap(self, file_object):
+        # Remove every layer of signature
+        while True:
             try:
-                return self.open_signed(
-                    file_object=Key.objects.decrypt_file(
-                        file_object=file_object
-                    ), document_version=document_version
-                )
+                file_object = Key.objects.decrypt_file(file_object=file_object)
             except DecryptionError:
                 file_object.seek(0)
                 return file_object
-        else:
+
+    def delete_unwrapped_file(self, document_version):
+        lock = locking_backend.acquire_lock(
+            name=UNWRAP_LOCK_NAME_TEMPLATE.format(document_version.pk),
+            timeout=UNWRAP_LOCK_TIMEOUT,
+            blocking_timeout=UNWRAP_LOCK_BLOCKING_TIMEOUT
+        )
+        try:
+            cache_storage_backend.delete(
+                UNWRAPPED_FILE_NAME_TEMPLATE.format(document_version.pk)
+            )
+        finally:
+            lock.release()
+
+    def open_signed(self, file_object, document_version):
+        """
+        Pre open hook of document versions. Return the payload of versions
+        with an embedded signature instead of the signed file. The payload
+        is unwrapped once and kept in the document cache storage. The
+        stored payload is checked and written holding a lock per document
+        version, a payload being written is never opened.
+        """
+        if document_version.has_embedded_signature is None:
+            self.set_document_version_flag(
+                document_version=document_version,
+                value=self.filter(document_version=document_version).exists()
+            )
+
+        if not document_version.has_embedded_signature:
             return file_object
 
+        unwrapped_file_name = UNWRAPPED_FILE_NAME_TEMPLATE.format(
+            document_version.pk
+        )
+
+        try:
+            lock = locking_backend.acquire_lock(
+                name=UNWRAP_LOCK_NAME_TEMPLATE.format(document_version.pk),
+                timeout=UNWRAP_LOCK_TIMEOUT,
+                blocking_timeout=UNWRAP_LOCK_BLOCKING_TIMEOUT
+            )
+        except LockError:
+            # Another process is still storing the payload, unwrap it
+            # without storing it
+            logger.debug(
+                'Unable to lock the unwrapped file of document version: %s',
+                document_version
+            )
+            return self._unwrap(file_object=file_object)
+
+        try:
+            if cache_storage_backend.exists(unwrapped_file_name):
+                file_object.close()
+                return cache_storage_backend.open(unwrapped_file_name)
+
+            file_object = self._unwrap(file_object=file_object)
+
+            try:
+                with cache_storage_backend.open(unwrapped_file_name, 'wb+') as unwrapped_file_object:
+                    shutil.copyfileobj(
+                        fsrc=file_object, fdst=unwrapped_file_object
+                    )
+            except Exception as exception:
+                logger.error(
+                    'Error storing the unwrapped file of document version: '
+                    '%s; %s', document_version, exception
+                )
+                cache_storage_backend.delete(unwrapped_file_name)
+                file_object.seek(0)
+                return file_object
+            else:
+                file_object.close()
+                return cache_storage_backend.open(unwrapped_file_name)
+        finally:
+            lock.release()
+
+    def set_document_version_flag(self, document_version, value):
+        DocumentVersion.objects.filter(pk=document_version.pk).update(
+            has_embedded_signature=value
+        )
+        document_version.has_embedded_signature = value
+
+    def verify_signatures(self, queryset=None):
+        """
+        Verify again the embedded signatures of `queryset`, many document
+        versions per gpg process instead of one at a time.
+        """
+        if queryset is None:
+            queryset = self.all()
+
+        batch = []
+        for signature in queryset.select_related('document_version').iterator():
+            batch.append(signature)
+
+            if len(batch) == VERIFICATION_BATCH_SIZE:
+                self._verify_signatures(signatures=batch)
+                batch = []
+
+        if batch:
+            self._verify_signatures(signatures=batch)
+
+    def _verify_signatures(self, signatures):
+        filenames = []
+        temporary_filenames = []
+
+        try:
+            for signature in signatures:
+                if type(signature.document_version.file.storage) in UNMODIFIED_FILE_STORAGES:
+                    filenames.append(signature.document_version.file.path)
+                else:
+                    # The stored file can be compressed or not be local,
+                    # use a copy of the content
+                    temporary_file_object, temporary_filename = mkstemp()
+                    temporary_filenames.append(temporary_filename)
+                    filenames.append(temporary_filename)
+
+                    with signature.document_version.open(raw=True) as file_object:
+                        with os.fdopen(temporary_file_object, 'wb') as temporary_file:
+                            shutil.copyfileobj(
+                                fsrc=file_object, fdst=temporary_file
+                            )
+
+            verify_results = Key.objects.verify_files(filenames=filenames)
+        finally:
+            for temporary_filename in temporary_filenames:
+                os.unlink(temporary_filename)
+
+        for signature, verify_result in zip(signatures, verify_results):
+            if verify_result:
+                signature.save_verification(verify_result=verify_result)
+            else:
+                logger.debug(
+                    'embedded signature verification error; document '
+                    'version: %s', signature.document_version
+                )
+
     def unsigned_document_versions(self):
         return DocumentVersion.objects.exclude(
             pk__in=self.values('document_version')
@@ -117,12 +117,22 @@ class EmbeddedSignature(SignatureBaseModel):
                     'embedded signature verification error; %s', exception
                 )
             else:
-                self.date = verify_result.date
-                self.key_id = verify_result.key_id
-                self.signature_id = verify_result.signature_id
-                self.public_key_fingerprint = verify_result.pubkey_fingerprint
+                self.save_verification(verify_result, *args, **kwargs)
+
+                EmbeddedSignature.objects.set_document_version_flag(
+                    document_version=self.document_version, value=True
+                )
+
+    def save_verification(self, verify_result, *args, **kwargs):
+        """
+        Store the result of a verification that was already performed.
+        """
+        self.date = verify_result.date
+        self.key_id = verify_result.key_id
+        self.signature_id = verify_result.signature_id
+        self.public_key_fingerprint = verify_result.pubkey_fingerprint
 
-                super(EmbeddedSignature, self).save(*args, **kwargs)
+        super(EmbeddedSignature, self).save(*args, **kwargs)
 
 
 @python_2_unicode_compatible
@@ -23,8 +23,11 @@ def task_unverify_key_signatures(self, key_id):
     for signature in DetachedSignature.objects.filter(key_id__endswith=key_id).filter(signature_id__isnull=False):
         signature.save()
 
-    for signature in EmbeddedSignature.objects.filter(key_id__endswith=key_id).filter(signature_id__isnull=False):
-        signature.save()
+    EmbeddedSignature.objects.verify_signatures(
+        queryset=EmbeddedSignature.objects.filter(
+            key_id__endswith=key_id
+        ).filter(signature_id__isnull=False)
+    )
 
 
 @app.task(bind=True, ignore_result=True)
@@ -46,8 +49,11 @@ def task_verify_key_signatures(self, key_pk):
     for signature in DetachedSignature.objects.filter(key_id__endswith=key.key_id).filter(signature_id__isnull=True):
         signature.save()
 
-    for signature in EmbeddedSignature.objects.filter(key_id__endswith=key.key_id).filter(signature_id__isnull=True):
-        signature.save()
+    EmbeddedSignature.objects.verify_signatures(
+        queryset=EmbeddedSignature.objects.filter(
+            key_id__endswith=key.key_id
+        ).filter(signature_id__isnull=True)
+    )
 
 
 @app.task(bind=True, ignore_result=True)
@@ -11,8 +11,10 @@ from common.tests import BaseTestCase
 from django_gpg.models import Key
 from django_gpg.tests.literals import TEST_KEY_DATA, TEST_KEY_PASSPHRASE
 from documents.models import DocumentType, DocumentVersion
+from documents.runtime import cache_storage_backend
 from documents.tests import TEST_DOCUMENT_PATH, TEST_DOCUMENT_TYPE_LABEL
 
+from ..literals import UNWRAPPED_FILE_NAME_TEMPLATE
 from ..models import DetachedSignature, EmbeddedSignature
 from ..tasks import task_verify_missing_embedded_signature
 
@@ -350,3 +352,68 @@ class EmbeddedSignaturesTestCase(BaseTestCase):
 
         self.assertEqual(original_size, new_size)
         self.assertEqual(original_hash, new_hash)
+
+    def test_unsigned_document_version_flag(self):
+        with open(TEST_DOCUMENT_PATH) as file_object:
+            document = self.document_type.new_document(
+                file_object=file_object
+            )
+
+        document_version = DocumentVersion.objects.get(
+            pk=document.latest_version.pk
+        )
+
+        self.assertEqual(document_version.has_embedded_signature, False)
+
+        with self.assertNumQueries(0):
+            document_version.open().close()
+
+    def test_unwrapped_file_reuse(self):
+        key = Key.objects.create(key_data=TEST_KEY_DATA)
+
+        with open(TEST_DOCUMENT_PATH) as file_object:
+            document = self.document_type.new_document(
+                file_object=file_object
+            )
+
+        with document.latest_version.open() as file_object:
+            original_hash = hashlib.sha256(file_object.read()).hexdigest()
+
+        new_version = EmbeddedSignature.objects.sign_document_version(
+            document_version=document.latest_version, key=key,
+            passphrase=TEST_KEY_PASSPHRASE
+        )
+        document_version = DocumentVersion.objects.get(pk=new_version.pk)
+
+        self.assertEqual(document_version.has_embedded_signature, True)
+        self.assertTrue(
+            cache_storage_backend.exists(
+                UNWRAPPED_FILE_NAME_TEMPLATE.format(document_version.pk)
+            )
+        )
+
+        with self.assertNumQueries(0):
+            with document_version.open() as file_object:
+                new_hash = hashlib.sha256(file_object.read()).hexdigest()
+
+        self.assertEqual(original_hash, new_hash)
+
+    def test_embedded_signature_delete(self):
+        with open(TEST_SIGNED_DOCUMENT_PATH) as file_object:
+            signed_document = self.document_type.new_document(
+                file_object=file_object
+            )
+
+        signed_document.latest_version.open().close()
+        EmbeddedSignature.objects.first().delete()
+
+        document_version = DocumentVersion.objects.get(
+            pk=signed_document.latest_version.pk
+        )
+
+        self.assertEqual(document_version.has_embedded_signature, None)
+        self.assertFalse(
+            cache_storage_backend.exists(
+                UNWRAPPED_FILE_NAME_TEMPLATE.format(document_version.pk)
+            )
+        )
@@ -1,6 +1,7 @@
 from __future__ import unicode_literals
 
 from django.apps import apps
+from django.db.models import Prefetch
 from django.db.models.signals import post_save
 from django.utils.translation import ugettext_lazy as _
 
@@ -16,6 +17,7 @@ from common.classes import ModelAttribute
 from common.links import link_object_error_list
 from common.permissions_runtime import permission_error_log_view
 from common.widgets import two_state_template
+from document_indexing.classes import IndexRebuildPrefetch
 from mayan.celery import app
 from navigation import SourceColumn
 from rest_api.classes import APIEndPoint
@@ -106,6 +108,14 @@ class DocumentStatesApp(MayanAppConfig):
             ), type_name=['property', 'indexing']
         )
 
+        IndexRebuildPrefetch(
+            lookup=Prefetch(
+                'workflows', queryset=WorkflowInstance.objects.select_related(
+                    'workflow'
+                )
+            )
+        )
+
         ModelPermission.register(
             model=Workflow, permissions=(
                 permission_error_log_view, permission_workflow_delete,
@@ -20,7 +20,15 @@ class DocumentStateHelper(PropertyHelper):
         return DocumentStateHelper(*args, **kwargs)
 
     def get_result(self, name):
-        return self.instance.workflows.get(workflow__internal_name=name)
+        if 'workflows' not in getattr(self.instance, '_prefetched_objects_cache', {}):
+            return self.instance.workflows.get(workflow__internal_name=name)
+
+        # Use the prefetched workflows instead of filtering in the database
+        for workflow_instance in self.instance.workflows.all():
+            if workflow_instance.workflow.internal_name == name:
+                return workflow_instance
+
+        raise self.instance.workflows.model.DoesNotExist
 
 
 class WorkflowActionMetaclass(type):
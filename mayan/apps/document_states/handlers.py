@@ -3,15 +3,16 @@ from __future__ import unicode_literals
 from django.apps import apps
 from django.utils.translation import ugettext_lazy as _
 
-from document_indexing.tasks import task_index_document
 from events.classes import Event
 
 
 def handler_index_document(sender, **kwargs):
-    task_index_document.apply_async(
-        kwargs=dict(
-            document_id=kwargs['instance'].workflow_instance.document.pk
-        )
+    DocumentIndexRequest = apps.get_model(
+        app_label='document_indexing', model_name='DocumentIndexRequest'
+    )
+
+    DocumentIndexRequest.objects.request_document(
+        document=kwargs['instance'].workflow_instance.document
     )
 
 
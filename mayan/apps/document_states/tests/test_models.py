@@ -1,8 +1,10 @@
 from __future__ import unicode_literals
 
+from django.db import connection
 from django.test import override_settings
 
 from common.tests import BaseTestCase
+from documents.events import event_document_properties_edit
 from documents.models import DocumentType
 from documents.tests import TEST_SMALL_DOCUMENT_PATH, TEST_DOCUMENT_TYPE_LABEL
 from document_indexing.models import Index, IndexInstanceNode
@@ -104,6 +106,28 @@ class DocumentStateIndexingTestCase(BaseTestCase):
             ), ['', TEST_WORKFLOW_STATE_LABEL]
         )
 
+    @override_settings(EVENTS_BUFFER_EVENTS=True)
+    def test_workflow_trigger_transition_buffered_events(self):
+        self._create_document_type()
+        self._create_workflow_transition()
+        self._create_document()
+
+        self.workflow_transition.trigger_events.create(
+            event_type=event_document_properties_edit.get_type()
+        )
+
+        event_document_properties_edit.commit(
+            actor=self.admin_user, target=self.document
+        )
+
+        # Test cases never commit, run the commit callbacks directly
+        connection.run_and_clear_commit_hooks()
+
+        self.assertEqual(
+            self.document.workflows.first().get_current_state(),
+            self.workflow_state_2
+        )
+
     def test_workflow_indexing_document_delete(self):
         self._create_document_type()
         self._create_workflow_transition()
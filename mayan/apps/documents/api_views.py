@@ -2,8 +2,9 @@ from __future__ import absolute_import, unicode_literals
 
 import logging
 
-from django.http import HttpResponse
+from django.http import FileResponse
 from django.shortcuts import get_object_or_404
+from django.views.decorators.http import condition
 
 from django_downloadview import DownloadMixin, VirtualFile
 from rest_framework import generics, status
@@ -15,7 +16,7 @@ from rest_api.permissions import MayanPermission
 
 from .literals import DOCUMENT_IMAGE_TASK_TIMEOUT
 from .models import (
-    Document, DocumentType, RecentDocument
+    Document, DocumentPageCachedImage, DocumentType, RecentDocument
 )
 from .permissions import (
     permission_document_create, permission_document_delete,
@@ -34,6 +35,7 @@ from .serializers import (
     RecentDocumentSerializer, WritableDocumentSerializer,
     WritableDocumentTypeSerializer, WritableDocumentVersionSerializer
 )
+from .settings import setting_disable_transformed_image_cache
 from .tasks import task_generate_document_page_image
 
 logger = logging.getLogger(__name__)
@@ -348,16 +350,47 @@ class APIDocumentPageImageView(generics.RetrieveAPIView):
         if rotation:
             rotation = int(rotation)
 
-        task = task_generate_document_page_image.apply_async(
-            kwargs=dict(
-                document_page_id=self.kwargs['page_pk'], size=size, zoom=zoom,
-                rotation=rotation
-            )
+        document_page = self.get_object()
+        cache_filename = document_page.get_combined_cache_filename(
+            size=size, zoom=zoom, rotation=rotation
         )
 
-        cache_filename = task.get(timeout=DOCUMENT_IMAGE_TASK_TIMEOUT)
-        with cache_storage_backend.open(cache_filename) as file_object:
-            return HttpResponse(file_object.read(), content_type='image')
+        def get_last_modified(request):
+            try:
+                return cache_storage_backend.get_modified_time(cache_filename)
+            except (NotImplementedError, OSError):
+                # Not cached yet or storage backend doesn't support it
+                return None
+
+        def get_response(request):
+            if not setting_disable_transformed_image_cache.value and cache_storage_backend.exists(cache_filename):
+                # Fast path, serve the image directly from the cache
+                DocumentPageCachedImage.objects.record_hit(
+                    filename=cache_filename
+                )
+                image_filename = cache_filename
+            else:
+                task = task_generate_document_page_image.apply_async(
+                    kwargs=dict(
+                        document_page_id=document_page.pk, size=size,
+                        zoom=zoom, rotation=rotation
+                    )
+                )
+
+                image_filename = task.get(timeout=DOCUMENT_IMAGE_TASK_TIMEOUT)
+
+            return FileResponse(
+                cache_storage_backend.open(image_filename),
+                content_type='image'
+            )
+
+        # The cache filename is derived from the page and the
+        # transformations applied, use it as the ETag to allow clients to
+        # skip downloading images they already have.
+        return condition(
+            etag_func=lambda request: cache_filename,
+            last_modified_func=get_last_modified
+        )(get_response)(request)
 
 
 class APIDocumentPageView(generics.RetrieveUpdateAPIView):
@@ -37,7 +37,8 @@ from .dashboard_widgets import (
     widget_total_documents
 )
 from .handlers import (
-    create_default_document_type, handler_scan_duplicates_for
+    create_default_document_type, handler_cache_page_images,
+    handler_scan_duplicates_for
 )
 from .links import (
     link_clear_image_cache, link_document_clear_transformations,
@@ -68,8 +69,9 @@ from .links import (
     link_trash_can_empty
 )
 from .literals import (
-    CHECK_DELETE_PERIOD_INTERVAL, CHECK_TRASH_PERIOD_INTERVAL,
-    DELETE_STALE_STUBS_INTERVAL
+    CACHE_PRUNE_INTERVAL, CHECK_DELETE_PERIOD_INTERVAL,
+    CHECK_TRASH_PERIOD_INTERVAL, DELETE_STALE_STUBS_INTERVAL,
+    DELETE_UNREFERENCED_FILES_INTERVAL
 )
 from .menus import menu_documents
 from .permissions import (
@@ -171,7 +173,7 @@ class DocumentsApp(MayanAppConfig):
             model=Document, related='document_type',
         )
         ModelPermission.register_inheritance(
-            model=DocumentPage, related='document',
+            model=DocumentPage, related='document_version__document',
         )
         ModelPermission.register_inheritance(
             model=DocumentTypeFilename, related='document_type',
@@ -179,6 +181,7 @@ class DocumentsApp(MayanAppConfig):
         ModelPermission.register_inheritance(
             model=DocumentVersion, related='document',
         )
+        ModelPermission.register_visibility(model=Document)
 
         # Document and document page thumbnail widget
         document_page_thumbnail_widget = DocumentPageThumbnailWidget()
@@ -297,6 +300,16 @@ class DocumentsApp(MayanAppConfig):
                     'task': 'documents.tasks.task_delete_stubs',
                     'schedule': timedelta(seconds=DELETE_STALE_STUBS_INTERVAL),
                 },
+                'task_delete_unreferenced_files': {
+                    'task': 'documents.tasks.task_delete_unreferenced_files',
+                    'schedule': timedelta(
+                        seconds=DELETE_UNREFERENCED_FILES_INTERVAL
+                    ),
+                },
+                'task_prune_image_cache': {
+                    'task': 'documents.tasks.task_prune_image_cache',
+                    'schedule': timedelta(seconds=CACHE_PRUNE_INTERVAL),
+                },
             }
         )
 
@@ -328,9 +341,18 @@ class DocumentsApp(MayanAppConfig):
                 'documents.tasks.task_delete_stubs': {
                     'queue': 'documents_periodic'
                 },
+                'documents.tasks.task_delete_unreferenced_files': {
+                    'queue': 'documents_periodic'
+                },
+                'documents.tasks.task_prune_image_cache': {
+                    'queue': 'documents_periodic'
+                },
                 'documents.tasks.task_clear_image_cache': {
                     'queue': 'tools'
                 },
+                'documents.tasks.task_cache_document_version_page_images': {
+                    'queue': 'converter'
+                },
                 'documents.tasks.task_generate_document_page_image': {
                     'queue': 'converter'
                 },
@@ -542,6 +564,10 @@ class DocumentsApp(MayanAppConfig):
             create_default_document_type,
             dispatch_uid='create_default_document_type'
         )
+        post_version_upload.connect(
+            handler_cache_page_images,
+            dispatch_uid='handler_cache_page_images',
+        )
         post_version_upload.connect(
             handler_scan_duplicates_for,
             dispatch_uid='handler_scan_duplicates_for',
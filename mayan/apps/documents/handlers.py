@@ -3,8 +3,11 @@ from __future__ import unicode_literals
 from django.apps import apps
 
 from .literals import DEFAULT_DOCUMENT_TYPE_LABEL
+from .settings import setting_pregenerate_page_images
 from .signals import post_initial_document_type
-from .tasks import task_scan_duplicates_for
+from .tasks import (
+    task_cache_document_version_page_images, task_scan_duplicates_for
+)
 
 
 def create_default_document_type(sender, **kwargs):
@@ -21,6 +24,13 @@ def create_default_document_type(sender, **kwargs):
         )
 
 
+def handler_cache_page_images(sender, instance, **kwargs):
+    if setting_pregenerate_page_images.value:
+        task_cache_document_version_page_images.apply_async(
+            kwargs={'document_version_id': instance.pk}
+        )
+
+
 def handler_scan_duplicates_for(sender, instance, **kwargs):
     task_scan_duplicates_for.apply_async(
         kwargs={'document_id': instance.document.pk}
@@ -4,10 +4,19 @@ from django.utils.translation import ugettext_lazy as _
 
 from common.literals import TIME_DELTA_UNIT_DAYS
 
+CACHE_ACCESS_UPDATE_INTERVAL = 60 * 5  # 5 minutes
+CACHE_COUNTER_EVICTIONS = 'evictions'
+CACHE_COUNTER_HITS = 'hits'
+CACHE_COUNTER_MISSES = 'misses'
 CACHE_PATH = 'document_cache/'
+CACHE_PRUNE_INTERVAL = 60 * 5  # 5 minutes
+CHECKSUM_CHUNK_SIZE = 1024 * 1024
 CHECK_DELETE_PERIOD_INTERVAL = 60
 CHECK_TRASH_PERIOD_INTERVAL = 60
 DELETE_STALE_STUBS_INTERVAL = 60 * 10  # 10 minutes
+DELETE_UNREFERENCED_FILES_AGE = 60 * 60 * 24  # 24 hours
+DELETE_UNREFERENCED_FILES_BATCH_SIZE = 1000
+DELETE_UNREFERENCED_FILES_INTERVAL = 60 * 60  # 1 hour
 DEFAULT_DELETE_PERIOD = 30
 DEFAULT_DELETE_TIME_UNIT = TIME_DELTA_UNIT_DAYS
 DEFAULT_ZIP_FILENAME = 'document_bundle.zip'
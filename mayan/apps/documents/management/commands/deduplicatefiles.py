@@ -0,0 +1,28 @@
+from __future__ import unicode_literals
+
+from django.core import management
+
+from ...models import DocumentVersion
+
+
+class Command(management.BaseCommand):
+    help = (
+        'Move the files of the existing document versions to the content '
+        'addressed document storage backend, sharing a single file between '
+        'the versions with the same content.'
+    )
+
+    def handle(self, *args, **options):
+        storage = DocumentVersion._meta.get_field('file').storage
+
+        if not hasattr(storage, 'is_content_name'):
+            raise management.CommandError(
+                'The document storage backend does not address files by '
+                'content. Set DOCUMENTS_STORAGE_BACKEND to a content '
+                'addressed storage backend first.'
+            )
+
+        result = DocumentVersion.objects.deduplicate_files()
+
+        for key in sorted(result):
+            self.stdout.write('{}: {}'.format(key, result[key]))
@@ -0,0 +1,24 @@
+from __future__ import unicode_literals
+
+from django.core import management
+
+from ...models import DocumentPageCachedImage
+
+
+class Command(management.BaseCommand):
+    help = 'Show the usage and the counters of the document image cache.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--prune', action='store_true', dest='prune',
+            help='Evict least recently used images before showing the usage.'
+        )
+
+    def handle(self, *args, **options):
+        if options['prune']:
+            DocumentPageCachedImage.objects.prune()
+
+        statistics = DocumentPageCachedImage.objects.get_statistics()
+
+        for key in sorted(statistics):
+            self.stdout.write('{}: {}'.format(key, statistics[key]))
@@ -4,12 +4,17 @@ from datetime import timedelta
 import logging
 
 from django.apps import apps
-from django.db import models
-from django.db.models import F, Max
+from django.db import IntegrityError, models, transaction
+from django.db.models import F, Max, Sum
 from django.utils.timezone import now
 
-from .literals import STUB_EXPIRATION_INTERVAL
-from .settings import setting_recent_count
+from .literals import (
+    CACHE_ACCESS_UPDATE_INTERVAL, CACHE_COUNTER_EVICTIONS, CACHE_COUNTER_HITS,
+    CACHE_COUNTER_MISSES, DELETE_UNREFERENCED_FILES_AGE,
+    DELETE_UNREFERENCED_FILES_BATCH_SIZE, STUB_EXPIRATION_INTERVAL
+)
+from .runtime import cache_storage_backend
+from .settings import setting_cache_maximum_size, setting_recent_count
 
 logger = logging.getLogger(__name__)
 
@@ -32,6 +37,116 @@ class DocumentManager(models.Manager):
             document.invalidate_cache()
 
 
+class DocumentPageCachedImageManager(models.Manager):
+    def get_statistics(self):
+        DocumentPageCachedImageCounter = apps.get_model(
+            app_label='documents', model_name='DocumentPageCachedImageCounter'
+        )
+
+        return {
+            'entries': self.count(),
+            'evictions': DocumentPageCachedImageCounter.objects.get_value(
+                name=CACHE_COUNTER_EVICTIONS
+            ),
+            'hits': DocumentPageCachedImageCounter.objects.get_value(
+                name=CACHE_COUNTER_HITS
+            ),
+            'maximum_size': setting_cache_maximum_size.value,
+            'misses': DocumentPageCachedImageCounter.objects.get_value(
+                name=CACHE_COUNTER_MISSES
+            ),
+            'size': self.get_total_size(),
+        }
+
+    def get_total_size(self):
+        return self.aggregate(total_size=Sum('file_size'))['total_size'] or 0
+
+    def prune(self, maximum_size=None):
+        """
+        Delete the least recently used cached images until the total size
+        of the cache is below the maximum size. Returns the number of
+        entries evicted.
+        """
+        DocumentPageCachedImageCounter = apps.get_model(
+            app_label='documents', model_name='DocumentPageCachedImageCounter'
+        )
+
+        if maximum_size is None:
+            maximum_size = setting_cache_maximum_size.value
+
+        if not maximum_size:
+            # No limit set
+            return 0
+
+        total_size = self.get_total_size()
+        evictions = 0
+
+        for cached_image in self.order_by('datetime').iterator():
+            if total_size <= maximum_size:
+                break
+
+            total_size -= cached_image.file_size
+            cached_image.delete()
+            evictions += 1
+
+        logger.debug(
+            'Evicted %d cached images, cache size: %d', evictions, total_size
+        )
+
+        DocumentPageCachedImageCounter.objects.increment(
+            name=CACHE_COUNTER_EVICTIONS, amount=evictions
+        )
+
+        return evictions
+
+    def record_hit(self, filename):
+        """
+        Update the last access time of a cached image to move it to the end
+        of the eviction order. The access time is only written when it is
+        older than CACHE_ACCESS_UPDATE_INTERVAL to avoid a write per hit.
+        """
+        DocumentPageCachedImageCounter = apps.get_model(
+            app_label='documents', model_name='DocumentPageCachedImageCounter'
+        )
+
+        self.filter(
+            filename=filename, datetime__lt=now() - timedelta(
+                seconds=CACHE_ACCESS_UPDATE_INTERVAL
+            )
+        ).update(datetime=now())
+        DocumentPageCachedImageCounter.objects.increment_buffered(
+            name=CACHE_COUNTER_HITS
+        )
+
+    def record_miss(self, document_page, filename):
+        """
+        Keep track of a newly generated cached image and its size.
+        """
+        DocumentPageCachedImageCounter = apps.get_model(
+            app_label='documents', model_name='DocumentPageCachedImageCounter'
+        )
+
+        values = {
+            'datetime': now(),
+            'file_size': cache_storage_backend.size(filename)
+        }
+
+        if not self.filter(filename=filename).update(**values):
+            try:
+                with transaction.atomic():
+                    self.create(
+                        document_page=document_page, filename=filename,
+                        **values
+                    )
+            except IntegrityError:
+                # Created by another process in the meantime
+                self.filter(filename=filename).update(**values)
+
+        DocumentPageCachedImageCounter.objects.increment_buffered(
+            name=CACHE_COUNTER_MISSES
+        )
+
+
 class DocumentTypeManager(models.Manager):
     def check_delete_periods(self):
         logger.info('Executing')
@@ -99,6 +214,87 @@ class DocumentTypeManager(models.Manager):
         return self.get(label=label)
 
 
+class DocumentVersionManager(models.Manager):
+    def deduplicate_files(self):
+        """
+        Store the file of each document version again with a content
+        addressed storage backend so that versions with the same content
+        share a single file. Files left without references are deleted.
+        Returns the number of document versions processed and of files
+        deleted.
+        """
+        storage = self.model._meta.get_field('file').storage
+        result = {'document_versions': 0, 'files_deleted': 0}
+
+        for document_version in self.iterator():
+            name = document_version.file.name
+
+            if storage.is_content_name(name):
+                continue
+
+            if not storage.exists(name):
+                logger.warning(
+                    'File "%s" of document version: %s does not exist',
+                    name, document_version.pk
+                )
+                continue
+
+            with storage.open(name) as file_object:
+                content_name = storage.save(name, file_object)
+
+            self.filter(pk=document_version.pk).update(file=content_name)
+            result['document_versions'] += 1
+
+            if not self.filter(file=name).exists():
+                storage.delete(name)
+                result['files_deleted'] += 1
+
+        return result
+
+    def _delete_unreferenced_files(self, storage, names, age):
+        referenced_names = set(
+            self.filter(file__in=names).values_list('file', flat=True)
+        )
+
+        result = 0
+        for name in names:
+            if name not in referenced_names:
+                if storage.delete_unreferenced(name=name, age=age):
+                    result += 1
+
+        return result
+
+    def delete_unreferenced_files(self, age=DELETE_UNREFERENCED_FILES_AGE):
+        """
+        Delete the files of a content addressed storage backend that no
+        document version references and that were not saved in the last
+        `age` seconds. Returns the number of files deleted.
+        """
+        storage = self.model._meta.get_field('file').storage
+
+        if not hasattr(storage, 'delete_unreferenced'):
+            return 0
+
+        names = []
+        result = 0
+
+        for name in storage.get_content_names():
+            names.append(name)
+
+            if len(names) == DELETE_UNREFERENCED_FILES_BATCH_SIZE:
+                result += self._delete_unreferenced_files(
+                    storage=storage, names=names, age=age
+                )
+                names = []
+
+        if names:
+            result += self._delete_unreferenced_files(
+                storage=storage, names=names, age=age
+            )
+
+        return result
+
+
 class DuplicatedDocumentManager(models.Manager):
     def scan(self):
         """
@@ -0,0 +1,82 @@
+# -*- coding: utf-8 -*-
+# Generated by Django 1.10.7 on 2017-10-16 12:00
+from __future__ import unicode_literals
+
+from django.db import migrations, models
+import django.utils.timezone
+
+
+def delete_duplicated_cached_images(apps, schema_editor):
+    DocumentPageCachedImage = apps.get_model(
+        'documents', 'DocumentPageCachedImage'
+    )
+
+    filenames = set()
+
+    # Keep the oldest entry of each filename
+    for cached_image in DocumentPageCachedImage.objects.order_by('pk'):
+        if cached_image.filename in filenames:
+            cached_image.delete()
+        else:
+            filenames.add(cached_image.filename)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('documents', '0041_auto_20170823_1855'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='DocumentPageCachedImageCounter',
+            fields=[
+                (
+                    'id', models.AutoField(
+                        auto_created=True, primary_key=True, serialize=False,
+                        verbose_name='ID'
+                    )
+                ),
+                (
+                    'name', models.CharField(
+                        max_length=32, unique=True, verbose_name='Name'
+                    )
+                ),
+                (
+                    'value', models.BigIntegerField(
+                        default=0, verbose_name='Value'
+                    )
+                ),
+            ],
+            options={
+                'verbose_name': 'Document page cached image counter',
+                'verbose_name_plural': 'Document page cached image counters',
+            },
+        ),
+        migrations.AddField(
+            model_name='documentpagecachedimage',
+            name='datetime',
+            field=models.DateTimeField(
+                db_index=True, default=django.utils.timezone.now,
+                verbose_name='Date time'
+            ),
+        ),
+        migrations.AddField(
+            model_name='documentpagecachedimage',
+            name='file_size',
+            field=models.PositiveIntegerField(
+                default=0, verbose_name='File size'
+            ),
+        ),
+        migrations.RunPython(
+            delete_duplicated_cached_images,
+            reverse_code=migrations.RunPython.noop
+        ),
+        migrations.AlterField(
+            model_name='documentpagecachedimage',
+            name='filename',
+            field=models.CharField(
+                max_length=128, unique=True, verbose_name='Filename'
+            ),
+        ),
+    ]
@@ -0,0 +1,22 @@
+# -*- coding: utf-8 -*-
+# Generated by Django 1.10.7 on 2017-10-16 12:00
+from __future__ import unicode_literals
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('documents', '0042_auto_20171016_1200'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='documentversion',
+            name='has_embedded_signature',
+            field=models.NullBooleanField(
+                editable=False, verbose_name='Has embedded signature'
+            ),
+        ),
+    ]
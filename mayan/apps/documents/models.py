@@ -3,12 +3,13 @@ from __future__ import absolute_import, unicode_literals
 import hashlib
 import logging
 import os
+import time
 import uuid
 
 from django.conf import settings
 from django.core.files import File
 from django.db import models, transaction
-from django.template import Template, Context
+from django.template import Context
 from django.urls import reverse
 from django.utils.encoding import force_text, python_2_unicode_compatible
 from django.utils.timezone import now
@@ -16,6 +17,8 @@ from django.utils.translation import ugettext, ugettext_lazy as _
 
 from acls.models import AccessControlList
 from common.literals import TIME_DELTA_UNIT_CHOICES
+from common.managers import CounterManager
+from common.runtime import template_cache
 from converter import (
     converter_class, BaseTransformation, TransformationResize,
     TransformationRotate, TransformationZoom
@@ -23,17 +26,21 @@ from converter import (
 from converter.exceptions import InvalidOfficeFormat, PageCountError
 from converter.literals import DEFAULT_ZOOM_LEVEL, DEFAULT_ROTATION
 from converter.models import Transformation
-from mimetype.api import get_mimetype
+from mimetype.api import get_buffer_mimetype, get_mimetype
+from mimetype.literals import MIMETYPE_READ_SIZE
 
 from .events import (
     event_document_create, event_document_new_version,
     event_document_properties_edit, event_document_type_change,
     event_document_version_revert
 )
-from .literals import DEFAULT_DELETE_PERIOD, DEFAULT_DELETE_TIME_UNIT
+from .literals import (
+    CHECKSUM_CHUNK_SIZE, DEFAULT_DELETE_PERIOD, DEFAULT_DELETE_TIME_UNIT
+)
 from .managers import (
-    DocumentManager, DocumentTypeManager, DuplicatedDocumentManager,
-    PassthroughManager, RecentDocumentManager, TrashCanManager
+    DocumentManager, DocumentPageCachedImageManager, DocumentTypeManager,
+    DocumentVersionManager, DuplicatedDocumentManager, PassthroughManager,
+    RecentDocumentManager, TrashCanManager
 )
 from .permissions import permission_document_view
 from .runtime import cache_storage_backend, storage_backend
@@ -54,6 +61,22 @@ def HASH_FUNCTION(data):
     return hashlib.sha256(data).hexdigest()
 
 
+def HASH_FILE_FUNCTION(file_object):
+    """
+    Same as HASH_FUNCTION but reads the file in chunks to avoid loading
+    the entire file in memory
+    """
+    hash_object = hashlib.sha256()
+
+    while True:
+        data = file_object.read(CHECKSUM_CHUNK_SIZE)
+        if not data:
+            break
+        hash_object.update(data)
+
+    return hash_object.hexdigest()
+
+
 def UUID_FUNCTION(*args, **kwargs):
     return force_text(uuid.uuid4())
 
@@ -354,6 +377,8 @@ class DocumentVersion(models.Model):
     binary data. Only identical documents will have the same checksum. If a
     document is modified after upload it's checksum will not match, used for
     detecting file tampering among other things.
+    * has_embedded_signature - Set by the pre open hooks of the document
+    signatures app. None until the version is checked for the first time.
     """
     _pre_open_hooks = {}
     _post_save_hooks = {}
@@ -392,6 +417,11 @@ class DocumentVersion(models.Model):
         blank=True, db_index=True, editable=False, max_length=64, null=True,
         verbose_name=_('Checksum')
     )
+    has_embedded_signature = models.NullBooleanField(
+        editable=False, verbose_name=_('Has embedded signature')
+    )
+
+    objects = DocumentVersionManager()
 
     class Meta:
         ordering = ('timestamp',)
@@ -405,9 +435,19 @@ class DocumentVersion(models.Model):
         for page in self.pages.all():
             page.delete()
 
-        self.file.storage.delete(self.file.name)
+        name = self.file.name
+        storage = self.file.storage
+        result = super(DocumentVersion, self).delete(*args, **kwargs)
 
-        return super(DocumentVersion, self).delete(*args, **kwargs)
+        # Content addressed storage backends share a file between the
+        # versions with the same content. Another version could be saving
+        # the same content right now, the file is deleted by
+        # task_delete_unreferenced_files once nothing references it.
+        is_content_name = getattr(storage, 'is_content_name', None)
+        if not is_content_name or not is_content_name(name):
+            storage.delete(name)
+
+        return result
 
     def get_absolute_url(self):
         return reverse('documents:document_version_view', args=(self.pk,))
@@ -419,12 +459,14 @@ class DocumentVersion(models.Model):
                 filename, self.get_rendered_timestamp(), extension
             )
         else:
-            return Template(
-                '{{ instance.document }} - {{ instance.timestamp }}'
+            return template_cache.get(
+                template_string='{{ instance.document }} - {{ instance.timestamp }}'
             ).render(context=Context({'instance': self}))
 
     def get_rendered_timestamp(self):
-        return Template('{{ instance.timestamp }}').render(
+        return template_cache.get(
+            template_string='{{ instance.timestamp }}'
+        ).render(
             context=Context({'instance': self})
         )
 
@@ -450,11 +492,7 @@ class DocumentVersion(models.Model):
 
                 if new_document_version:
                     # Only do this for new documents
-                    self.update_checksum(save=False)
-                    self.update_mimetype(save=False)
-                    self.save()
-                    self.update_page_count(save=False)
-                    self.fix_orientation()
+                    self.process_file()
 
                     logger.info(
                         'New document version "%s" created for document: %s',
@@ -484,6 +522,56 @@ class DocumentVersion(models.Model):
                         sender=Document, instance=self.document
                     )
 
+    def cache_page_images(self):
+        """
+        Rasterize all the pages of the document version in a single converter
+        pass and store the results in the base image cache tier. Pages that
+        already have a base image cached are skipped.
+        """
+        if setting_disable_base_image_cache.value:
+            return
+
+        pages = dict(
+            (page.page_number, page) for page in self.pages.all()
+            if not cache_storage_backend.exists(page.cache_filename)
+        )
+
+        if not pages:
+            return
+
+        logger.debug(
+            'Generating base images of %d pages of document version: %s',
+            len(pages), self
+        )
+
+        with self.get_intermidiate_file() as intermediate_file_object:
+            converter = converter_class(file_object=intermediate_file_object)
+            page_images = converter.get_pages(
+                first_page_number=min(pages) - 1,
+                last_page_number=max(pages) - 1
+            )
+
+            for page_number, page_image in page_images:
+                page = pages.get(page_number + 1)
+                if not page:
+                    continue
+
+                try:
+                    with cache_storage_backend.open(page.cache_filename, 'wb+') as file_object:
+                        file_object.write(page_image.getvalue())
+
+                    DocumentPageCachedImage.objects.record_miss(
+                        document_page=page, filename=page.cache_filename
+                    )
+                except Exception as exception:
+                    # Cleanup in case of error
+                    logger.error(
+                        'Error creating page cache file "%s"; %s',
+                        page.cache_filename, exception
+                    )
+                    cache_storage_backend.delete(page.cache_filename)
+                    raise
+
     @property
     def cache_filename(self):
         return 'document-version-{}'.format(self.uuid)
@@ -498,14 +586,38 @@ class DocumentVersion(models.Model):
         return self.file.storage.exists(self.file.name)
 
     def fix_orientation(self):
-        for page in self.pages.all():
-            degrees = page.detect_orientation()
+        pages = self.pages.all()
+
+        with self.open() as file_object:
+            converter = converter_class(
+                file_object=file_object, mime_type=self.mimetype
+            )
+            orientations = converter.detect_orientations(
+                page_count=len(pages)
+            )
+
+        self._add_orientation_transformations(
+            pages=pages, orientations=orientations
+        )
+
+    def _add_orientation_transformations(self, pages, orientations):
+        for page, degrees in zip(pages, orientations):
             if degrees:
                 Transformation.objects.add_for_model(
                     obj=page, transformation=TransformationRotate,
                     arguments='{{"degrees": {}}}'.format(360 - degrees)
                 )
 
+    def _create_pages(self, page_count):
+        with transaction.atomic():
+            self.pages.all().delete()
+
+            return [
+                DocumentPage.objects.create(
+                    document_version=self, page_number=page_number + 1
+                ) for page_number in range(page_count)
+            ]
+
     def get_intermidiate_file(self):
         cache_filename = self.cache_filename
         logger.debug('Intermidiate filename: %s', cache_filename)
@@ -565,6 +677,81 @@ class DocumentVersion(models.Model):
         """
         return self.pages.count()
 
+    def process_file(self):
+        """
+        Ingestion pipeline for new document versions. Open the version's
+        file once and calculate the checksum, mimetype, encoding, page count
+        and the orientation of each page. The checksum and the mimetype are
+        obtained from the same sequential read. Returns the time in seconds
+        spent in each stage.
+        """
+        timings = {}
+
+        with self.open() as file_object:
+            start_time = time.time()
+            file_header = file_object.read(MIMETYPE_READ_SIZE)
+            hash_object = hashlib.sha256(file_header)
+
+            while True:
+                data = file_object.read(CHECKSUM_CHUNK_SIZE)
+                if not data:
+                    break
+                hash_object.update(data)
+
+            self.checksum = force_text(hash_object.hexdigest())
+            timings['checksum'] = time.time() - start_time
+
+            start_time = time.time()
+            try:
+                self.mimetype, self.encoding = get_buffer_mimetype(
+                    file_buffer=file_header
+                )
+            except Exception as exception:
+                logger.error(
+                    'Error determining the mimetype of document version: '
+                    '%s; %s', self, exception
+                )
+                self.mimetype = ''
+                self.encoding = ''
+            timings['mimetype'] = time.time() - start_time
+
+            self.save()
+
+            start_time = time.time()
+            file_object.seek(0)
+            converter = converter_class(
+                file_object=file_object, mime_type=self.mimetype
+            )
+
+            try:
+                page_count = converter.get_page_count()
+            except PageCountError:
+                # If converter backend doesn't understand the format,
+                # don't create pages
+                page_count = 0
+                pages = ()
+            else:
+                pages = self._create_pages(page_count=page_count)
+            timings['page_count'] = time.time() - start_time
+
+            start_time = time.time()
+            if page_count:
+                self._add_orientation_transformations(
+                    pages=pages, orientations=converter.detect_orientations(
+                        page_count=page_count
+                    )
+                )
+            timings['orientation'] = time.time() - start_time
+
+        logger.info(
+            'Processed the file of document version: %s; %s', self,
+            ', '.join(
+                '{}: {:.3f}s'.format(key, timings[key]) for key in sorted(timings)
+            )
+        )
+
+        return timings
+
     def revert(self, _user=None):
         """
         Delete the subsequent versions after this one
@@ -609,9 +796,9 @@ class DocumentVersion(models.Model):
         the user provided checksum function
         """
         if self.exists():
-            source = self.open()
-            self.checksum = force_text(HASH_FUNCTION(source.read()))
-            source.close()
+            with self.open() as file_object:
+                self.checksum = force_text(HASH_FILE_FUNCTION(file_object))
+
             if save:
                 self.save()
 
@@ -645,13 +832,7 @@ class DocumentVersion(models.Model):
             # use 1 as the total page count
             pass
         else:
-            with transaction.atomic():
-                self.pages.all().delete()
-
-                for page_number in range(detected_pages):
-                    DocumentPage.objects.create(
-                        document_version=self, page_number=page_number + 1
-                    )
+            self._create_pages(page_count=detected_pages)
 
             # TODO: is this needed anymore
             if save:
@@ -744,6 +925,58 @@ class DocumentPage(models.Model):
             )
 
     def generate_image(self, *args, **kwargs):
+        transformation_list = self.get_combined_transformation_list(
+            *args, **kwargs
+        )
+        cache_filename = self.get_combined_cache_filename(
+            transformation_list=transformation_list
+        )
+
+        # Check is transformed image is available
+        logger.debug('transformations cache filename: %s', cache_filename)
+
+        if not setting_disable_transformed_image_cache.value and cache_storage_backend.exists(cache_filename):
+            logger.debug(
+                'transformations cache file "%s" found', cache_filename
+            )
+            DocumentPageCachedImage.objects.record_hit(filename=cache_filename)
+        else:
+            logger.debug(
+                'transformations cache file "%s" not found', cache_filename
+            )
+            image = self.get_image(transformations=transformation_list)
+            with cache_storage_backend.open(cache_filename, 'wb+') as file_object:
+                file_object.write(image.getvalue())
+
+            DocumentPageCachedImage.objects.record_miss(
+                document_page=self, filename=cache_filename
+            )
+
+        return cache_filename
+
+    def get_combined_cache_filename(self, *args, **kwargs):
+        """
+        Return the cache filename of the transformed image that corresponds
+        to the arguments, without generating the image. Accepts the same
+        arguments as generate_image or a precomputed list of transformations
+        via the transformation_list argument.
+        """
+        transformation_list = kwargs.pop('transformation_list', None)
+
+        if transformation_list is None:
+            transformation_list = self.get_combined_transformation_list(
+                *args, **kwargs
+            )
+
+        return '{}-{}'.format(
+            self.cache_filename, BaseTransformation.combine(transformation_list)
+        )
+
+    def get_combined_transformation_list(self, *args, **kwargs):
+        """
+        Return the list of stored and interactive transformations to apply
+        to the page's base image.
+        """
         # Convert arguments into transformations
         transformations = kwargs.get('transformations', [])
 
@@ -759,8 +992,6 @@ class DocumentPage(models.Model):
         if zoom_level > setting_zoom_max_level.value:
             zoom_level = setting_zoom_max_level.value
 
-        # Generate transformation hash
-
         transformation_list = []
 
         # Stored transformations first
@@ -786,28 +1017,7 @@ class DocumentPage(models.Model):
         if zoom_level:
             transformation_list.append(TransformationZoom(percent=zoom_level))
 
-        cache_filename = '{}-{}'.format(
-            self.cache_filename, BaseTransformation.combine(transformation_list)
-        )
-
-        # Check is transformed image is available
-        logger.debug('transformations cache filename: %s', cache_filename)
-
-        if not setting_disable_transformed_image_cache.value and cache_storage_backend.exists(cache_filename):
-            logger.debug(
-                'transformations cache file "%s" found', cache_filename
-            )
-        else:
-            logger.debug(
-                'transformations cache file "%s" not found', cache_filename
-            )
-            image = self.get_image(transformations=transformation_list)
-            with cache_storage_backend.open(cache_filename, 'wb+') as file_object:
-                file_object.write(image.getvalue())
-
-            self.cached_images.create(filename=cache_filename)
-
-        return cache_filename
+        return transformation_list
 
     def get_image(self, transformations=None):
         cache_filename = self.cache_filename
@@ -815,6 +1025,7 @@ class DocumentPage(models.Model):
 
         if not setting_disable_base_image_cache.value and cache_storage_backend.exists(cache_filename):
             logger.debug('Page cache file "%s" found', cache_filename)
+            DocumentPageCachedImage.objects.record_hit(filename=cache_filename)
             converter = converter_class(
                 file_object=cache_storage_backend.open(cache_filename)
             )
@@ -833,6 +1044,10 @@ class DocumentPage(models.Model):
 
                 with cache_storage_backend.open(cache_filename, 'wb+') as file_object:
                     file_object.write(page_image.getvalue())
+
+                DocumentPageCachedImage.objects.record_miss(
+                    document_page=self, filename=cache_filename
+                )
             except Exception as exception:
                 # Cleanup in case of error
                 logger.error(
@@ -868,11 +1083,25 @@ class DocumentPage(models.Model):
 
 
 class DocumentPageCachedImage(models.Model):
+    """
+    Keep track of the base and transformed images of a document page stored
+    in the cache, their size and when they were last accessed.
+    """
     document_page = models.ForeignKey(
         DocumentPage, on_delete=models.CASCADE, related_name='cached_images',
         verbose_name=_('Document page')
     )
-    filename = models.CharField(max_length=128, verbose_name=_('Filename'))
+    datetime = models.DateTimeField(
+        db_index=True, default=now, verbose_name=_('Date time')
+    )
+    filename = models.CharField(
+        max_length=128, unique=True, verbose_name=_('Filename')
+    )
+    file_size = models.PositiveIntegerField(
+        default=0, verbose_name=_('File size')
+    )
+
+    objects = DocumentPageCachedImageManager()
 
     class Meta:
         verbose_name = _('Document page cached image')
@@ -883,6 +1112,26 @@ class DocumentPageCachedImage(models.Model):
         return super(DocumentPageCachedImage, self).delete(*args, **kwargs)
 
 
+@python_2_unicode_compatible
+class DocumentPageCachedImageCounter(models.Model):
+    """
+    Cumulative hit, miss and eviction counters of the document image cache.
+    """
+    name = models.CharField(
+        max_length=32, unique=True, verbose_name=_('Name')
+    )
+    value = models.BigIntegerField(default=0, verbose_name=_('Value'))
+
+    objects = CounterManager()
+
+    class Meta:
+        verbose_name = _('Document page cached image counter')
+        verbose_name_plural = _('Document page cached image counters')
+
+    def __str__(self):
+        return self.name
+
+
 class DocumentPageResult(DocumentPage):
     class Meta:
         ordering = ('document_version__document', 'page_number')
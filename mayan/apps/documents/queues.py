@@ -30,6 +30,10 @@ queue_documents_periodic.add_task_type(
     name='documents.tasks.task_delete_stubs',
     label=_('Delete document stubs')
 )
+queue_documents_periodic.add_task_type(
+    name='documents.tasks.task_prune_image_cache',
+    label=_('Prune the document image cache')
+)
 
 queue_tools.add_task_type(
     name='documents.tasks.task_clear_image_cache',
@@ -40,6 +44,10 @@ queue_converter.add_task_type(
     name='documents.tasks.task_generate_document_page_image',
     label=_('Generate document page image')
 )
+queue_converter.add_task_type(
+    name='documents.tasks.task_cache_document_version_page_images',
+    label=_('Generate document version page images')
+)
 
 queue_uploads.add_task_type(
     name='documents.tasks.task_update_page_count',
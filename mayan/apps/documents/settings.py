@@ -65,6 +65,14 @@ setting_cache_storage_backend = namespace.add_setting(
     global_name='DOCUMENTS_CACHE_STORAGE_BACKEND',
     default='documents.storage.LocalCacheFileStorage'
 )
+setting_cache_maximum_size = namespace.add_setting(
+    global_name='DOCUMENTS_CACHE_MAXIMUM_SIZE', default=None,
+    help_text=_(
+        'Maximum size in bytes of the document image cache. When exceeded, '
+        'the least recently used images are deleted. Leave empty for an '
+        'unlimited cache size.'
+    )
+)
 setting_language = namespace.add_setting(
     global_name='DOCUMENTS_LANGUAGE', default='eng',
     help_text=_('Default documents language (in ISO639-2 format).')
@@ -88,3 +96,11 @@ setting_disable_transformed_image_cache = namespace.add_setting(
         'of documents\' pages.'
     )
 )
+setting_pregenerate_page_images = namespace.add_setting(
+    global_name='DOCUMENTS_PREGENERATE_PAGE_IMAGES', default=True,
+    help_text=_(
+        'Render the base images of all the pages of new document versions '
+        'in a single background pass, instead of one page at a time when '
+        'they are first requested.'
+    )
+)
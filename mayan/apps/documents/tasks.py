@@ -15,6 +15,24 @@ from .literals import (
 logger = logging.getLogger(__name__)
 
 
+@app.task(ignore_result=True)
+def task_cache_document_version_page_images(document_version_id):
+    DocumentVersion = apps.get_model(
+        app_label='documents', model_name='DocumentVersion'
+    )
+
+    document_version = DocumentVersion.objects.get(pk=document_version_id)
+
+    try:
+        document_version.cache_page_images()
+    except Exception as exception:
+        # Page images will be generated on demand when first requested
+        logger.error(
+            'Unable to generate the page images of document version: %s; %s',
+            document_version, exception
+        )
+
+
 @app.task(ignore_result=True)
 def task_check_delete_periods():
     DocumentType = apps.get_model(
@@ -67,6 +85,17 @@ def task_delete_stubs():
     logger.info('Finshed')
 
 
+@app.task(ignore_result=True)
+def task_delete_unreferenced_files():
+    DocumentVersion = apps.get_model(
+        app_label='documents', model_name='DocumentVersion'
+    )
+
+    logger.info('Executing')
+    DocumentVersion.objects.delete_unreferenced_files()
+    logger.info('Finshed')
+
+
 @app.task()
 def task_generate_document_page_image(document_page_id, *args, **kwargs):
     DocumentPage = apps.get_model(
@@ -78,6 +107,17 @@ def task_generate_document_page_image(document_page_id, *args, **kwargs):
     return document_page.generate_image(*args, **kwargs)
 
 
+@app.task(ignore_result=True)
+def task_prune_image_cache():
+    DocumentPageCachedImage = apps.get_model(
+        app_label='documents', model_name='DocumentPageCachedImage'
+    )
+
+    logger.debug('Executing')
+    DocumentPageCachedImage.objects.prune()
+    logger.debug('Finshed')
+
+
 @app.task(ignore_result=True)
 def task_scan_duplicates_all():
     DuplicatedDocument = apps.get_model(
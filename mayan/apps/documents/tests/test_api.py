@@ -258,6 +258,32 @@ class DocumentAPITestCase(BaseAPITestCase):
                 mime_type='{}; charset=utf-8'.format(document.file_mimetype)
             )
 
+    def test_document_page_image_view(self):
+        document = self._create_document()
+        document_page = document.pages.first()
+        url = reverse(
+            'rest_api:documentpage-image', args=(
+                document.pk, document.latest_version.pk, document_page.pk
+            )
+        )
+
+        response = self.client.get(url)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertTrue(response.has_header('ETag'))
+
+        # Served from the cache
+        response = self.client.get(url)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertTrue(response.has_header('Last-Modified'))
+
+        response = self.client.get(
+            url, HTTP_IF_NONE_MATCH=response['ETag']
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+
     def test_document_version_download(self):
         document = self._create_document()
 
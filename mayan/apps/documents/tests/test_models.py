@@ -4,18 +4,27 @@ from datetime import timedelta
 import os
 import time
 
+import mock
+
 from django.conf import settings
 from django.test import override_settings
 
 from common.tests import BaseTestCase
+from storage.backends.contentaddressedstorage import ContentAddressedStorage
+from storage.literals import CONTENT_ADDRESSED_STORAGE_TEMPORARY_DIRECTORY
 
 from ..literals import STUB_EXPIRATION_INTERVAL
-from ..models import DeletedDocument, Document, DocumentType
+from ..models import (
+    DeletedDocument, Document, DocumentPageCachedImage, DocumentType,
+    DocumentVersion
+)
+from ..runtime import cache_storage_backend
 
 from .literals import (
     TEST_DOCUMENT_TYPE_LABEL, TEST_DOCUMENT_PATH, TEST_MULTI_PAGE_TIFF_PATH,
     TEST_PDF_INDIRECT_ROTATE_PATH, TEST_OFFICE_DOCUMENT_PATH,
-    TEST_SMALL_DOCUMENT_FILENAME, TEST_SMALL_DOCUMENT_PATH
+    TEST_SMALL_DOCUMENT_CHECKSUM, TEST_SMALL_DOCUMENT_FILENAME,
+    TEST_SMALL_DOCUMENT_PATH
 )
 
 
@@ -88,6 +97,16 @@ class DocumentTestCase(BaseTestCase):
 
         self.assertEqual(self.document.versions.count(), 3)
 
+    def test_page_images_batch_generation(self):
+        self.document.invalidate_cache()
+
+        self.document.latest_version.cache_page_images()
+
+        for page in self.document.pages.all():
+            self.assertTrue(
+                cache_storage_backend.exists(page.cache_filename)
+            )
+
     def test_restoring_documents(self):
         self.assertEqual(Document.objects.count(), 1)
 
@@ -256,6 +275,67 @@ class DocumentVersionTestCase(GenericDocumentTestCase):
             'c637ffab6b8bb026ed3784afdb07663fddc60099853fae2be93890852a69ecf3'
         )
 
+    def test_delete_version_with_shared_file(self):
+        with open(self.test_document_path) as file_object:
+            document_2 = self.document_type.new_document(
+                file_object=file_object
+            )
+
+        document_version = self.document.latest_version
+        document_version_2 = document_2.latest_version
+        storage = ContentAddressedStorage()
+
+        # Reference the same content addressed file from both versions
+        with document_version.file.storage.open(document_version.file.name) as file_object:
+            name = storage.save(document_version.file.name, file_object)
+
+        for version in (document_version, document_version_2):
+            version.file.storage.delete(version.file.name)
+
+        DocumentVersion.objects.filter(
+            pk__in=(document_version.pk, document_version_2.pk)
+        ).update(file=name)
+
+        with mock.patch.object(
+            DocumentVersion._meta.get_field('file'), 'storage', storage
+        ):
+            document_version.refresh_from_db()
+            document_version_2.refresh_from_db()
+
+            # Shared files are left for the sweep of unreferenced files
+            document_version_2.delete()
+            self.assertEqual(
+                DocumentVersion.objects.delete_unreferenced_files(age=0), 0
+            )
+            document_version.delete()
+            self.assertTrue(storage.exists(name))
+
+            # Recently saved files are not deleted
+            self.assertEqual(
+                DocumentVersion.objects.delete_unreferenced_files(age=60), 0
+            )
+            self.assertEqual(
+                DocumentVersion.objects.delete_unreferenced_files(age=0), 1
+            )
+
+        self.assertFalse(storage.exists(name))
+
+        # Remove the empty directories of the content addressed storage
+        os.rmdir(os.path.dirname(storage.path(name)))
+        os.rmdir(os.path.dirname(os.path.dirname(storage.path(name))))
+        os.rmdir(storage.path(CONTENT_ADDRESSED_STORAGE_TEMPORARY_DIRECTORY))
+
+    def test_file_processing(self):
+        page_count = self.document.page_count
+
+        timings = self.document.latest_version.process_file()
+
+        self.assertEqual(
+            sorted(timings), ['checksum', 'mimetype', 'orientation', 'page_count']
+        )
+        self.assertEqual(self.document.checksum, TEST_SMALL_DOCUMENT_CHECKSUM)
+        self.assertEqual(self.document.page_count, page_count)
+
     def test_revert_version(self):
         self.assertEqual(self.document.versions.count(), 1)
 
@@ -275,6 +355,59 @@ class DocumentVersionTestCase(GenericDocumentTestCase):
         self.assertEqual(self.document.versions.count(), 1)
 
 
+class DocumentPageCachedImageTestCase(GenericDocumentTestCase):
+    def test_cache_hit_accounting(self):
+        document_page = self.document.pages.first()
+        document_page.generate_image()
+        document_page.generate_image()
+
+        statistics = DocumentPageCachedImage.objects.get_statistics()
+
+        self.assertTrue(statistics['hits'] > 0)
+        self.assertTrue(statistics['misses'] > 0)
+        self.assertEqual(
+            statistics['size'], sum(
+                DocumentPageCachedImage.objects.values_list(
+                    'file_size', flat=True
+                )
+            )
+        )
+
+    def test_cache_pruning(self):
+        document_page = self.document.pages.first()
+        document_page.generate_image()
+
+        cached_image = document_page.cached_images.first()
+
+        self.assertTrue(
+            DocumentPageCachedImage.objects.get_total_size() > 0
+        )
+
+        evictions = DocumentPageCachedImage.objects.prune(maximum_size=1)
+
+        self.assertTrue(evictions > 0)
+        self.assertEqual(DocumentPageCachedImage.objects.count(), 0)
+        self.assertFalse(
+            cache_storage_backend.exists(cached_image.filename)
+        )
+
+    def test_cache_miss_existing_entry(self):
+        document_page = self.document.pages.first()
+        document_page.generate_image()
+
+        cached_image = document_page.cached_images.first()
+
+        DocumentPageCachedImage.objects.record_miss(
+            document_page=document_page, filename=cached_image.filename
+        )
+
+        self.assertEqual(
+            DocumentPageCachedImage.objects.filter(
+                filename=cached_image.filename
+            ).count(), 1
+        )
+
+
 @override_settings(OCR_AUTO_OCR=False)
 class DocumentManagerTestCase(BaseTestCase):
     def setUp(self):
@@ -2,7 +2,9 @@
 
 from __future__ import unicode_literals
 
+from io import BytesIO
 import os
+import zipfile
 
 from django.conf import settings
 from django.contrib.contenttypes.models import ContentType
@@ -29,10 +31,10 @@ from ..permissions import (
 )
 
 from .literals import (
-    TEST_DOCUMENT_TYPE_LABEL, TEST_DOCUMENT_TYPE_2_LABEL,
-    TEST_DOCUMENT_TYPE_LABEL_EDITED, TEST_DOCUMENT_TYPE_QUICK_LABEL,
-    TEST_DOCUMENT_TYPE_QUICK_LABEL_EDITED, TEST_SMALL_DOCUMENT_FILENAME,
-    TEST_SMALL_DOCUMENT_PATH, TEST_TRANSFORMATION_ARGUMENT,
+    TEST_DOCUMENT_FILENAME, TEST_DOCUMENT_PATH, TEST_DOCUMENT_TYPE_LABEL,
+    TEST_DOCUMENT_TYPE_2_LABEL, TEST_DOCUMENT_TYPE_LABEL_EDITED,
+    TEST_DOCUMENT_TYPE_QUICK_LABEL, TEST_DOCUMENT_TYPE_QUICK_LABEL_EDITED,
+    TEST_SMALL_DOCUMENT_FILENAME, TEST_SMALL_DOCUMENT_PATH, TEST_TRANSFORMATION_ARGUMENT,
     TEST_TRANSFORMATION_NAME, TEST_VERSION_COMMENT
 )
 
@@ -296,6 +298,45 @@ class DocumentsViewsTestCase(GenericDocumentViewTestCase):
                 mime_type=self.document.file_mimetype
             )
 
+    def test_document_multiple_download_view_compressed(self):
+        # Set the expected_content_type for
+        # common.tests.mixins.ContentTypeCheckMixin
+        self.expected_content_type = 'application/zip'
+
+        with open(TEST_DOCUMENT_PATH) as file_object:
+            document_2 = self.document_type.new_document(
+                file_object=file_object, label=TEST_DOCUMENT_FILENAME
+            )
+
+        self.grant_access(
+            obj=self.document, permission=permission_document_download
+        )
+        self.grant_access(
+            obj=document_2, permission=permission_document_download
+        )
+
+        response = self.get(
+            'documents:document_multiple_download', data={
+                'id_list': '{},{}'.format(self.document.pk, document_2.pk)
+            }
+        )
+
+        self.assertEqual(response.status_code, 200)
+
+        zip_file = zipfile.ZipFile(
+            BytesIO(b''.join(response.streaming_content))
+        )
+
+        self.assertEqual(zip_file.testzip(), None)
+
+        for document in (self.document, document_2):
+            with document.open() as file_object:
+                self.assertEqual(
+                    zip_file.read(document.label), file_object.read()
+                )
+
+        zip_file.close()
+
     def _request_document_version_download(self, data=None):
         data = data or {}
         return self.get(
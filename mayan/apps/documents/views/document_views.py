@@ -4,14 +4,16 @@ import logging
 
 from django.contrib import messages
 from django.core.exceptions import PermissionDenied
-from django.http import HttpResponseRedirect
+from django.http import HttpResponseRedirect, StreamingHttpResponse
 from django.shortcuts import get_object_or_404
 from django.urls import reverse, reverse_lazy
 from django.utils.http import urlencode
 from django.utils.translation import ugettext_lazy as _, ungettext
 
+from django_downloadview.response import content_disposition
+
 from acls.models import AccessControlList
-from common.compressed_files import CompressedFile
+from common.compressed_files import StreamingCompressedFile
 from common.generics import (
     ConfirmView, FormView, MultipleObjectConfirmActionView,
     MultipleObjectFormActionView, SingleObjectDetailView,
@@ -506,6 +508,27 @@ class DocumentDownloadView(SingleObjectDownloadView):
     def get_item_file(item):
         return item.open()
 
+    def render_to_response(self, *args, **kwargs):
+        queryset = self.get_document_queryset()
+
+        if self.request.GET.get('compressed') == 'True' or queryset.count() > 1:
+            # Stream the archive as it is built instead of building it in
+            # memory first
+            response = StreamingHttpResponse(
+                streaming_content=self.get_compressed_file_chunks(
+                    queryset=queryset
+                ), content_type='application/zip'
+            )
+            response['Content-Disposition'] = content_disposition(
+                self.request.GET.get('zip_filename', DEFAULT_ZIP_FILENAME)
+            )
+
+            return response
+        else:
+            return super(DocumentDownloadView, self).render_to_response(
+                *args, **kwargs
+            )
+
     def get_document_queryset(self):
         id_list = self.request.GET.get(
             'id_list', self.request.POST.get('id_list', '')
@@ -520,43 +543,42 @@ class DocumentDownloadView(SingleObjectDownloadView):
             permission_document_download, self.request.user, queryset
         )
 
-    def get_file(self):
-        queryset = self.get_document_queryset()
-        zip_filename = self.request.GET.get(
-            'zip_filename', DEFAULT_ZIP_FILENAME
-        )
-
-        if self.request.GET.get('compressed') == 'True' or queryset.count() > 1:
-            compressed_file = CompressedFile()
-            for item in queryset:
-                descriptor = DocumentDownloadView.get_item_file(item=item)
-                compressed_file.add_file(
-                    descriptor, arcname=self.get_item_label(item=item)
-                )
+    def get_compressed_file_chunks(self, queryset):
+        compressed_file = StreamingCompressedFile()
+
+        for item in queryset:
+            descriptor = DocumentDownloadView.get_item_file(item=item)
+            try:
+                for chunk in compressed_file.add_file(
+                    file_object=descriptor,
+                    arcname=self.get_item_label(item=item), size=item.size
+                ):
+                    yield chunk
+            finally:
                 descriptor.close()
-                DocumentDownloadView.commit_event(
-                    item=item, request=self.request
-                )
 
-            compressed_file.close()
+            DocumentDownloadView.commit_event(
+                item=item, request=self.request
+            )
+
+        for chunk in compressed_file.close():
+            yield chunk
 
-            return DocumentDownloadView.VirtualFile(
-                compressed_file.as_file(zip_filename),
-                name=zip_filename
+    def get_file(self):
+        queryset = self.get_document_queryset()
+
+        item = queryset.first()
+        if item:
+            DocumentDownloadView.commit_event(
+                item=item, request=self.request
             )
         else:
-            item = queryset.first()
-            if item:
-                DocumentDownloadView.commit_event(
-                    item=item, request=self.request
-                )
-            else:
-                raise PermissionDenied
+            raise PermissionDenied
 
-            return DocumentDownloadView.VirtualFile(
-                DocumentDownloadView.get_item_file(item=item),
-                name=self.get_item_label(item=item)
-            )
+        return DocumentDownloadView.VirtualFile(
+            DocumentDownloadView.get_item_file(item=item),
+            name=self.get_item_label(item=item)
+        )
 
     def get_item_label(self, item):
         return item.label
@@ -1,14 +1,10 @@
 from __future__ import unicode_literals
 
-from django.utils.encoding import force_text
-
 from rest_framework import generics
-from rest_framework.exceptions import ParseError
-
-from rest_api.filters import MayanObjectPermissionsFilter
 
 from .classes import SearchModel
 from .mixins import SearchModelMixin
+from .pagination import SearchResultsPagination
 from .serializers import SearchModelSerializer
 
 
@@ -23,9 +19,13 @@ class APISearchView(SearchModelMixin, generics.ListAPIView):
               paramType: query
               type: string
               description: Term that will be used for the search.
+            - name: offset
+              paramType: query
+              type: number
+              description: Number of results to skip, as provided by the next and previous links.
     """
 
-    filter_backends = (MayanObjectPermissionsFilter,)
+    pagination_class = SearchResultsPagination
 
     def get_queryset(self):
         search_model = self.get_search_model()
@@ -34,17 +34,11 @@ class APISearchView(SearchModelMixin, generics.ListAPIView):
         # search results
         self.serializer_class = search_model.serializer
 
-        if search_model.permission:
-            self.mayan_object_permissions = {'GET': (search_model.permission,)}
-
-        try:
-            queryset, ids, timedelta = search_model.search(
-                query_string=self.request.GET, user=self.request.user
-            )
-        except Exception as exception:
-            raise ParseError(force_text(exception))
-
-        return queryset
+        # Access control is part of the search query. The search runs
+        # when the paginator fetches the page.
+        return search_model.get_results(
+            query_string=self.request.GET, user=self.request.user
+        )
 
 
 class APIAdvancedSearchView(SearchModelMixin, generics.ListAPIView):
@@ -58,9 +52,13 @@ class APIAdvancedSearchView(SearchModelMixin, generics.ListAPIView):
               paramType: query
               type: string
               description: When checked, only results that match all fields will be returned. When unchecked results that match at least one field will be returned. Possible values are "on" or "off"
+            - name: offset
+              paramType: query
+              type: number
+              description: Number of results to skip, as provided by the next and previous links.
     """
 
-    filter_backends = (MayanObjectPermissionsFilter,)
+    pagination_class = SearchResultsPagination
 
     def get_queryset(self):
         self.search_model = self.get_search_model()
@@ -69,25 +67,17 @@ class APIAdvancedSearchView(SearchModelMixin, generics.ListAPIView):
         # search results
         self.serializer_class = self.search_model.serializer
 
-        if self.search_model.permission:
-            self.mayan_object_permissions = {
-                'GET': (self.search_model.permission,)
-            }
-
         if self.request.GET.get('_match_all', 'off') == 'on':
             global_and_search = True
         else:
             global_and_search = False
 
-        try:
-            queryset, ids, timedelta = self.search_model.search(
-                query_string=self.request.GET, user=self.request.user,
-                global_and_search=global_and_search
-            )
-        except Exception as exception:
-            raise ParseError(force_text(exception))
-
-        return queryset
+        # Access control is part of the search query. The search runs
+        # when the paginator fetches the page.
+        return self.search_model.get_results(
+            query_string=self.request.GET, user=self.request.user,
+            global_and_search=global_and_search
+        )
 
 
 class APISearchModelList(generics.ListAPIView):
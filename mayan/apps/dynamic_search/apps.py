@@ -1,11 +1,22 @@
 from __future__ import unicode_literals
 
+from kombu import Exchange, Queue
+
+from django.db.models.signals import (
+    m2m_changed, post_delete, post_save, pre_delete
+)
 from django.utils.translation import ugettext_lazy as _
 
 from common import MayanAppConfig, menu_facet, menu_sidebar
+from mayan.celery import app
 from rest_api.classes import APIEndPoint
 
+from .handlers import (
+    handler_collect_instance_relations, handler_index_instance,
+    handler_index_instance_relations, handler_index_m2m_changed
+)
 from .links import link_search, link_search_advanced, link_search_again
+from .queues import *  # NOQA
 
 
 class DynamicSearchApp(MayanAppConfig):
@@ -20,6 +31,18 @@ class DynamicSearchApp(MayanAppConfig):
 
         APIEndPoint(app=self, version_string='1')
 
+        app.conf.CELERY_QUEUES.append(
+            Queue('search', Exchange('search'), routing_key='search'),
+        )
+
+        app.conf.CELERY_ROUTES.update(
+            {
+                'dynamic_search.tasks.task_index_instances': {
+                    'queue': 'search'
+                },
+            }
+        )
+
         menu_facet.bind_links(
             links=(link_search, link_search_advanced),
             sources=(
@@ -29,3 +52,22 @@ class DynamicSearchApp(MayanAppConfig):
         menu_sidebar.bind_links(
             links=(link_search_again,), sources=('search:results',)
         )
+
+        # Keep the search index up to date with the changes to any of the
+        # models traversed by the search fields
+        m2m_changed.connect(
+            handler_index_m2m_changed,
+            dispatch_uid='search_handler_index_m2m_changed'
+        )
+        post_delete.connect(
+            handler_index_instance_relations,
+            dispatch_uid='search_handler_index_instance_relations'
+        )
+        post_save.connect(
+            handler_index_instance,
+            dispatch_uid='search_handler_index_instance'
+        )
+        pre_delete.connect(
+            handler_collect_instance_relations,
+            dispatch_uid='search_handler_collect_instance_relations'
+        )
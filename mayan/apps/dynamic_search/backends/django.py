@@ -0,0 +1,101 @@
+from __future__ import absolute_import, unicode_literals
+
+import logging
+
+from django.db.models import Q
+
+from ..classes import SearchBackend
+
+logger = logging.getLogger(__name__)
+
+
+class DjangoSearchBackend(SearchBackend):
+    """
+    Search the database directly using case insensitive containment
+    queries. Requires no index but scans every searched column.
+    """
+    def _get_field_query(self, search_model, field_name, terms):
+        # All the terms must be found in the field. Each term is matched by
+        # its own subquery so that terms of a multi valued relationship
+        # can match different related rows.
+        query = Q()
+        for term in terms:
+            query &= Q(
+                pk__in=search_model.model.objects.filter(
+                    **{'{}__icontains'.format(field_name): term}
+                ).values('pk')
+            )
+
+        return query
+
+    def _get_id_list(self, queryset, offset, limit):
+        id_list = queryset.order_by('-pk').values_list('pk', flat=True)
+
+        if limit is None:
+            return list(id_list[offset:])
+        else:
+            return list(id_list[offset:offset + limit])
+
+    def get_search_queryset(self, search_model, query_string, global_and_search=False):
+        queries = []
+
+        if 'q' in query_string:
+            # Simple search
+            terms = search_model.normalize_query(
+                query_string.get('q', '').strip()
+            )
+            if terms:
+                for search_field in search_model.get_all_search_fields():
+                    queries.append(
+                        self._get_field_query(
+                            search_model=search_model,
+                            field_name=search_field.field, terms=terms
+                        )
+                    )
+        else:
+            for search_field in search_model.get_all_search_fields():
+                if search_field.field in query_string and query_string[search_field.field]:
+                    terms = search_model.normalize_query(
+                        query_string[search_field.field]
+                    )
+                    if terms:
+                        queries.append(
+                            self._get_field_query(
+                                search_model=search_model,
+                                field_name=search_field.field, terms=terms
+                            )
+                        )
+
+        if not queries:
+            return search_model.model.objects.none()
+
+        query = queries[0]
+        for field_query in queries[1:]:
+            if global_and_search:
+                query &= field_query
+            else:
+                query |= field_query
+
+        logger.debug('query: %s', query)
+
+        return search_model.model.objects.filter(query)
+
+    def get_result_id_list(self, search_model, query_string, filter_queryset, global_and_search=False, offset=0, limit=None):
+        # The database applies the access control, the ordering and the
+        # limit in a single query
+        return self._get_id_list(
+            queryset=filter_queryset(
+                self.get_search_queryset(
+                    search_model=search_model, query_string=query_string,
+                    global_and_search=global_and_search
+                )
+            ), offset=offset, limit=limit
+        )
+
+    def search(self, search_model, query_string, global_and_search=False, limit=None, offset=0):
+        return self._get_id_list(
+            queryset=self.get_search_queryset(
+                search_model=search_model, query_string=query_string,
+                global_and_search=global_and_search
+            ), offset=offset, limit=limit
+        )
@@ -0,0 +1,194 @@
+from __future__ import absolute_import, unicode_literals
+
+import logging
+import os
+
+from whoosh import fields, index
+from whoosh.analysis import LowercaseFilter, RegexTokenizer
+from whoosh.qparser import MultifieldParser, QueryParser
+from whoosh.qparser.common import QueryParserError
+from whoosh.query import And, Or, QueryError
+
+from django.conf import settings
+from django.utils.encoding import force_text
+
+from lock_manager import LockError
+
+from ..classes import SearchBackend
+from ..exceptions import SearchQueryError
+from ..literals import (
+    INDEXING_CHUNK_SIZE, WHOOSH_INDEX_DIRECTORY_NAME,
+    WHOOSH_PRIMARY_KEY_FIELD, WHOOSH_WRITER_TIMEOUT
+)
+
+logger = logging.getLogger(__name__)
+
+
+class WhooshSearchBackend(SearchBackend):
+    """
+    Full text search using an inverted index stored on disk. Results are
+    ranked by relevance. Terms are split on non alphanumeric characters
+    and matched as whole words, use a trailing * to match word prefixes.
+    """
+    requires_indexing = True
+
+    def __init__(self, index_path=None, writer_timeout=WHOOSH_WRITER_TIMEOUT):
+        self.index_path = index_path or os.path.join(
+            settings.MEDIA_ROOT, WHOOSH_INDEX_DIRECTORY_NAME
+        )
+        self.writer_timeout = writer_timeout
+
+    def _get_index(self, search_model):
+        schema = self._get_schema(search_model=search_model)
+
+        if not os.path.exists(self.index_path):
+            os.makedirs(self.index_path)
+
+        index_name = self._get_index_name(search_model=search_model)
+
+        if not index.exists_in(self.index_path, indexname=index_name):
+            return index.create_in(
+                self.index_path, schema=schema, indexname=index_name
+            )
+
+        search_index = index.open_dir(self.index_path, indexname=index_name)
+
+        # Search fields added since the index was created
+        missing_field_names = set(schema.names()) - set(
+            search_index.schema.names()
+        )
+        if missing_field_names:
+            with self._get_writer(search_index=search_index) as writer:
+                for field_name in missing_field_names:
+                    writer.add_field(field_name, schema[field_name])
+
+            search_index = search_index.refresh()
+
+        return search_index
+
+    def _get_index_name(self, search_model):
+        return search_model.get_full_name().replace('.', '_').lower()
+
+    def _get_schema(self, search_model):
+        analyzer = RegexTokenizer(expression=r'[^\W_]+') | LowercaseFilter()
+
+        schema_fields = {
+            WHOOSH_PRIMARY_KEY_FIELD: fields.ID(stored=True, unique=True)
+        }
+        for search_field in search_model.get_all_search_fields():
+            schema_fields[search_field.field] = fields.TEXT(analyzer=analyzer)
+
+        return fields.Schema(**schema_fields)
+
+    def _get_writer(self, search_index):
+        try:
+            return search_index.writer(timeout=self.writer_timeout)
+        except index.LockError as exception:
+            raise LockError(force_text(exception))
+
+    def _update_documents(self, search_model, writer, id_list):
+        values = search_model.get_field_values(id_list=id_list)
+
+        for pk in id_list:
+            pk = force_text(pk)
+            if pk in values:
+                values[pk][WHOOSH_PRIMARY_KEY_FIELD] = pk
+                writer.update_document(**values[pk])
+            else:
+                writer.delete_by_term(WHOOSH_PRIMARY_KEY_FIELD, pk)
+
+    def index_instances(self, search_model, id_list):
+        super(WhooshSearchBackend, self).index_instances(
+            search_model=search_model, id_list=id_list
+        )
+
+        search_index = self._get_index(search_model=search_model)
+
+        with self._get_writer(search_index=search_index) as writer:
+            self._update_documents(
+                search_model=search_model, writer=writer, id_list=id_list
+            )
+
+    def rebuild_index(self, search_model):
+        super(WhooshSearchBackend, self).rebuild_index(
+            search_model=search_model
+        )
+
+        if not os.path.exists(self.index_path):
+            os.makedirs(self.index_path)
+
+        search_index = index.create_in(
+            self.index_path, schema=self._get_schema(search_model=search_model),
+            indexname=self._get_index_name(search_model=search_model)
+        )
+
+        queryset = search_model.model.objects.order_by('pk')
+
+        with self._get_writer(search_index=search_index) as writer:
+            last_pk = None
+            while True:
+                if last_pk is not None:
+                    chunk_queryset = queryset.filter(pk__gt=last_pk)
+                else:
+                    chunk_queryset = queryset
+
+                id_list = list(
+                    chunk_queryset.values_list('pk', flat=True)[
+                        :INDEXING_CHUNK_SIZE
+                    ]
+                )
+                if not id_list:
+                    break
+
+                self._update_documents(
+                    search_model=search_model, writer=writer, id_list=id_list
+                )
+                last_pk = id_list[-1]
+
+    def search(self, search_model, query_string, global_and_search=False, limit=None, offset=0):
+        search_index = self._get_index(search_model=search_model)
+
+        field_names = [
+            search_field.field for search_field in search_model.get_all_search_fields()
+        ]
+
+        try:
+            if 'q' in query_string:
+                # Simple search
+                query = MultifieldParser(
+                    fieldnames=field_names, schema=search_index.schema
+                ).parse(force_text(query_string.get('q', '').strip()))
+            else:
+                queries = []
+                for field_name in field_names:
+                    if query_string.get(field_name):
+                        queries.append(
+                            QueryParser(
+                                fieldname=field_name,
+                                schema=search_index.schema
+                            ).parse(force_text(query_string[field_name]))
+                        )
+
+                if not queries:
+                    return []
+
+                if global_and_search:
+                    query = And(queries)
+                else:
+                    query = Or(queries)
+
+            logger.debug('query: %s', query)
+
+            if limit is not None:
+                # Whoosh only collects and ranks the top hits up to the
+                # limit
+                limit = offset + limit
+
+            with search_index.searcher() as searcher:
+                return [
+                    hit[WHOOSH_PRIMARY_KEY_FIELD] for hit in searcher.search(
+                        query, limit=limit
+                    )[offset:]
+                ]
+        except (QueryError, QueryParserError) as exception:
+            raise SearchQueryError(force_text(exception))
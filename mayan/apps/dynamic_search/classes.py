@@ -5,12 +5,13 @@ import logging
 import re
 
 from django.apps import apps
-from django.db.models import Q
+from django.db.models import Case, IntegerField, Value, When
+from django.db.models.constants import LOOKUP_SEP
 from django.utils.encoding import force_text
 from django.utils.module_loading import import_string
 from django.utils.translation import ugettext as _
 
-
+from .literals import SEARCH_BATCH_SIZE
 from .settings import setting_limit
 
 logger = logging.getLogger(__name__)
@@ -46,6 +47,7 @@ class SearchModel(object):
         self._label = label
         self.serializer_string = serializer_string
         self.permission = permission
+        self._related_lookups = None  # Lazy
         self.__class__.registry[self.get_full_name()] = self
 
     @property
@@ -70,25 +72,7 @@ class SearchModel(object):
         """
         search_field = SearchField(self, *args, **kwargs)
         self.search_fields.append(search_field)
-
-    def assemble_query(self, terms, search_fields):
-        """
-        Returns a query, that is a combination of Q objects. That combination
-        aims to search keywords within a model by testing the given search
-        fields.
-        """
-        queries = []
-        for term in terms:
-            or_query = None
-            for field in search_fields:
-                q = Q(**{'%s__%s' % (field, 'icontains'): term})
-                if or_query is None:
-                    or_query = q
-                else:
-                    or_query = or_query | q
-
-            queries.append(or_query)
-        return queries
+        self._related_lookups = None
 
     def get_all_search_fields(self):
         return self.search_fields
@@ -112,6 +96,97 @@ class SearchModel(object):
         except KeyError:
             raise KeyError('No search field named: %s' % full_name)
 
+    def get_field_values(self, id_list):
+        """
+        Returns the text of every search field for the instances with the
+        given primary keys, keyed by the text representation of their
+        primary key. Instances that no longer exist are left out.
+        """
+        queryset = self.model.objects.filter(pk__in=id_list).order_by()
+
+        result = {}
+        for pk in queryset.values_list('pk', flat=True):
+            result[force_text(pk)] = {}
+
+        for search_field in self.get_all_search_fields():
+            # One query per field for the whole batch of instances
+            for pk, value in queryset.values_list('pk', search_field.field):
+                if value is not None:
+                    result[force_text(pk)].setdefault(
+                        search_field.field, []
+                    ).append(force_text(value))
+
+        for values in result.values():
+            for field, field_values in values.items():
+                values[field] = '\n'.join(field_values)
+
+        return result
+
+    def get_results(self, query_string, user, global_and_search=False):
+        """
+        Return a lazy sequence of all the results the user has access to,
+        in the order ranked by the search backend.
+        """
+        return SearchResults(
+            search_model=self, query_string=query_string, user=user,
+            global_and_search=global_and_search
+        )
+
+    def get_related_lookups(self):
+        """
+        Returns the models traversed by the search fields and the lookup
+        that reaches them from this search model. Also returns the many to
+        many relationships traversed, keyed by their intermediate model.
+        Changes to any of these alter the values indexed for the
+        instances of this search model.
+        """
+        if self._related_lookups is None:
+            models = {self.model._meta.concrete_model: set([''])}
+            through_models = {}
+
+            for search_field in self.get_all_search_fields():
+                model = self.model
+                path = []
+                for part in search_field.field.split(LOOKUP_SEP):
+                    field = model._meta.get_field(part)
+                    if not field.is_relation:
+                        break
+
+                    if field.many_to_many:
+                        through_models.setdefault(
+                            self.get_through_model(field=field), set()
+                        ).add((LOOKUP_SEP.join(path), model, part))
+
+                    path.append(part)
+                    model = field.related_model
+                    models.setdefault(
+                        model._meta.concrete_model, set()
+                    ).add(LOOKUP_SEP.join(path))
+
+            self._related_lookups = (models, through_models)
+
+        return self._related_lookups
+
+    def get_through_model(self, field):
+        try:
+            return field.through
+        except AttributeError:
+            return field.remote_field.through
+
+    def get_id_list_for_lookup(self, lookup, id_list):
+        """
+        Returns the primary keys of the instances of this search model
+        related to the given instances by the lookup.
+        """
+        if not lookup:
+            return list(id_list)
+
+        return list(
+            self.model.objects.filter(
+                **{'{}__pk__in'.format(lookup): id_list}
+            ).values_list('pk', flat=True).distinct().order_by()
+        )
+
     def normalize_query(self, query_string,
                         findterms=re.compile(r'"([^"]+)"|(\S+)').findall,
                         normspace=re.compile(r'\s{2,}').sub):
@@ -127,116 +202,129 @@ class SearchModel(object):
         ]
 
     def search(self, query_string, user, global_and_search=False):
-        AccessControlList = apps.get_model(
-            app_label='acls', model_name='AccessControlList'
-        )
+        """
+        Return the first SEARCH_LIMIT results the user has access to, in
+        the order ranked by the search backend.
+        """
+        from .runtime import search_backend
 
         elapsed_time = 0
         start_time = datetime.datetime.now()
-        result_set = set()
-        search_dict = {}
 
-        if 'q' in query_string:
-            # Simple search
-            for search_field in self.get_all_search_fields():
-                search_dict.setdefault(search_field.get_model(), {
-                    'searches': [],
-                    'label': search_field.label,
-                    'return_value': search_field.return_value
-                })
-                search_dict[search_field.get_model()]['searches'].append(
-                    {
-                        'field_name': [search_field.field],
-                        'terms': self.normalize_query(
-                            query_string.get('q', '').strip()
-                        )
-                    }
-                )
-        else:
-            for search_field in self.get_all_search_fields():
-                if search_field.field in query_string and query_string[search_field.field]:
-                    search_dict.setdefault(search_field.get_model(), {
-                        'searches': [],
-                        'label': search_field.label,
-                        'return_value': search_field.return_value
-                    })
-                    search_dict[search_field.get_model()]['searches'].append(
-                        {
-                            'field_name': [search_field.field],
-                            'terms': self.normalize_query(
-                                query_string[search_field.field]
-                            )
-                        }
-                    )
+        result_list = self.get_results(
+            query_string=query_string, user=user,
+            global_and_search=global_and_search
+        ).get_id_list(limit=setting_limit.value)
 
-        for model, data in search_dict.items():
-            logger.debug('model: %s', model)
+        elapsed_time = force_text(
+            datetime.datetime.now() - start_time
+        ).split(':')[2]
 
-            # Initialize per model result set
-            model_result_set = set()
+        logger.debug('elapsed_time: %s', elapsed_time)
 
-            for query_entry in data['searches']:
-                # Fashion a list of queries for a field for each term
-                field_query_list = self.assemble_query(
-                    query_entry['terms'], query_entry['field_name']
-                )
+        queryset = search_backend.get_queryset(
+            search_model=self, id_list=result_list
+        )
 
-                logger.debug('field_query_list: %s', field_query_list)
+        return queryset, result_list, elapsed_time
 
-                # Initialize per field result set
-                field_result_set = set()
 
-                # Get results per search field
-                for query in field_query_list:
-                    logger.debug('query: %s', query)
-                    term_query_result_set = set(
-                        model.objects.filter(query).values_list(
-                            data['return_value'], flat=True
-                        )
-                    )
+class SearchBackend(object):
+    """
+    Base class for the search backends. Defines the base methods that each
+    subclass must define. Backends that keep their own index set
+    requires_indexing and are notified of every change to the indexed
+    instances.
+    """
+    requires_indexing = False
+
+    def get_queryset(self, search_model, id_list):
+        """
+        Turn a page of primary keys found into a queryset of the search
+        model in the same order
+        """
+        queryset = search_model.model.objects.filter(pk__in=id_list)
 
-                    # Convert the QuerySet to a Python set and perform the
-                    # AND operation on the program and not as a query.
-                    # This operation ANDs all the field term results
-                    # belonging to a single model, making sure to only include
-                    # results in the final field result variable if all the
-                    # terms are found in a single field.
-                    if not field_result_set:
-                        field_result_set = term_query_result_set
-                    else:
-                        field_result_set &= term_query_result_set
-
-                    logger.debug(
-                        'term_query_result_set: %s', term_query_result_set
+        if not id_list:
+            return queryset
+
+        return queryset.order_by(
+            Case(
+                *[
+                    When(pk=pk, then=Value(rank)) for rank, pk in enumerate(
+                        id_list
                     )
-                    logger.debug('field_result_set: %s', field_result_set)
+                ], output_field=IntegerField()
+            )
+        )
+
+    def get_result_id_list(self, search_model, query_string, filter_queryset, global_and_search=False, offset=0, limit=None):
+        """
+        Return the primary keys of the instances matching the query that
+        are left in the queryset returned by filter_queryset, in rank
+        order, skipping the first offset and up to limit entries. The
+        hits are fetched from search() in batches and each batch is
+        filtered with a query bounded by the size of the batch.
+        """
+        batch_offset = 0
+        batch_size = max(limit or 0, SEARCH_BATCH_SIZE)
+        result = []
+        skipped = 0
 
-                if global_and_search:
-                    if not model_result_set:
-                        model_result_set = field_result_set
-                    else:
-                        model_result_set &= field_result_set
-                else:
-                    model_result_set |= field_result_set
+        while limit is None or len(result) < limit:
+            hits = self.search(
+                search_model=search_model, query_string=query_string,
+                global_and_search=global_and_search, limit=batch_size,
+                offset=batch_offset
+            )
 
-            result_set = result_set | model_result_set
+            # Hits are text, map them to the primary keys of the database
+            primary_keys = dict(
+                (force_text(pk), pk) for pk in filter_queryset(
+                    search_model.model.objects.filter(pk__in=hits)
+                ).values_list('pk', flat=True)
+            )
 
-        elapsed_time = force_text(
-            datetime.datetime.now() - start_time
-        ).split(':')[2]
+            for hit in hits:
+                pk = primary_keys.get(force_text(hit))
+                if pk is None:
+                    continue
 
-        logger.debug('elapsed_time: %s', elapsed_time)
+                if skipped < offset:
+                    skipped += 1
+                elif limit is None or len(result) < limit:
+                    result.append(pk)
+
+            if len(hits) < batch_size:
+                break
 
-        queryset = self.model.objects.filter(
-            pk__in=list(result_set)[:setting_limit.value]
+            batch_offset += batch_size
+
+        return result
+
+    def index_instances(self, search_model, id_list):
+        """
+        Update the index entries of the given instances, removing those of
+        the instances that no longer exist
+        """
+        logger.debug(
+            'indexing %s instances: %s', search_model.get_full_name(), id_list
         )
 
-        if self.permission:
-            queryset = AccessControlList.objects.filter_by_access(
-                self.permission, user, queryset
-            )
+    def rebuild_index(self, search_model):
+        """
+        Discard the index of the search model and index all its instances
+        again
+        """
+        logger.debug('rebuilding index: %s', search_model.get_full_name())
 
-        return queryset, result_set, elapsed_time
+    def search(self, search_model, query_string, global_and_search=False, limit=None, offset=0):
+        """
+        Return the primary keys of the instances matching the query in rank
+        order, skipping the first offset and up to limit entries. Raise
+        SearchQueryError if the query is invalid.
+        """
+        raise NotImplementedError
 
 
 # SearchField classes
@@ -255,3 +343,71 @@ class SearchField(object):
 
     def get_model(self):
         return self.search_model.model
+
+
+class SearchResults(object):
+    """
+    Lazy sequence of the instances matching a query that the user has
+    access to, in the order ranked by the search backend. Only slicing is
+    supported, each slice only fetches the instances it contains.
+    """
+    def __init__(self, search_model, query_string, user, global_and_search=False):
+        self.global_and_search = global_and_search
+        self.query_string = query_string
+        self.search_model = search_model
+        self.user = user
+
+    def __getitem__(self, key):
+        if not isinstance(key, slice) or key.step:
+            raise TypeError('Search results only support slices.')
+
+        offset = key.start or 0
+        if key.stop is None:
+            limit = None
+        else:
+            limit = max(key.stop - offset, 0)
+
+        return self.get_instances(
+            id_list=self.get_id_list(offset=offset, limit=limit)
+        )
+
+    def count(self, limit=None):
+        """
+        Return the number of results, counting up to limit results
+        """
+        return len(self.get_id_list(limit=limit))
+
+    def filter_queryset(self, queryset):
+        AccessControlList = apps.get_model(
+            app_label='acls', model_name='AccessControlList'
+        )
+
+        if self.search_model.permission:
+            return AccessControlList.objects.filter_by_access(
+                self.search_model.permission, self.user, queryset
+            )
+        else:
+            return queryset
+
+    def get_id_list(self, offset=0, limit=None):
+        from .runtime import search_backend
+
+        return search_backend.get_result_id_list(
+            search_model=self.search_model, query_string=self.query_string,
+            filter_queryset=self.filter_queryset,
+            global_and_search=self.global_and_search, offset=offset,
+            limit=limit
+        )
+
+    def get_instances(self, id_list):
+        """
+        Return the instances of a list of primary keys returned by
+        get_id_list(), in the same order
+        """
+        from .runtime import search_backend
+
+        return list(
+            search_backend.get_queryset(
+                search_model=self.search_model, id_list=id_list
+            )
+        )
@@ -0,0 +1,8 @@
+from __future__ import unicode_literals
+
+
+class SearchQueryError(Exception):
+    """
+    The search backend was unable to parse or run the search query
+    """
+    pass
@@ -0,0 +1,75 @@
+from __future__ import unicode_literals
+
+from .classes import SearchModel
+from .runtime import search_backend
+from .utils import get_instance_id_lists, index_id_lists
+
+
+def _get_m2m_id_lists(sender, instance, pk_set):
+    result = {}
+
+    for search_model in SearchModel.all():
+        models, through_models = search_model.get_related_lookups()
+        for lookup, source_model, field_name in through_models.get(sender, ()):
+            if isinstance(instance, source_model):
+                source_id_list = (instance.pk,)
+            elif pk_set:
+                source_id_list = pk_set
+            else:
+                # Relationship cleared from the other side
+                source_id_list = source_model._default_manager.filter(
+                    **{'{}__pk'.format(field_name): instance.pk}
+                ).values_list('pk', flat=True)
+
+            result.setdefault(search_model, set()).update(
+                search_model.get_id_list_for_lookup(
+                    lookup=lookup, id_list=list(source_id_list)
+                )
+            )
+
+    return result
+
+
+def handler_collect_instance_relations(sender, instance, **kwargs):
+    # The relationships are gone after the deletion, collect the affected
+    # instances while they can still be reached
+    if search_backend.requires_indexing:
+        instance._search_index_id_lists = get_instance_id_lists(
+            model=instance._meta.model, id_list=(instance.pk,)
+        )
+
+
+def handler_index_instance(sender, instance, **kwargs):
+    if search_backend.requires_indexing:
+        index_id_lists(
+            id_lists=get_instance_id_lists(
+                model=instance._meta.model, id_list=(instance.pk,)
+            )
+        )
+
+
+def handler_index_instance_relations(sender, instance, **kwargs):
+    if search_backend.requires_indexing:
+        index_id_lists(
+            id_lists=getattr(instance, '_search_index_id_lists', {})
+        )
+
+
+def handler_index_m2m_changed(sender, instance, action, pk_set, **kwargs):
+    if not search_backend.requires_indexing:
+        return
+
+    if action in ('post_add', 'post_remove'):
+        index_id_lists(
+            id_lists=_get_m2m_id_lists(
+                sender=sender, instance=instance, pk_set=pk_set
+            )
+        )
+    elif action == 'pre_clear':
+        instance._search_index_id_lists = _get_m2m_id_lists(
+            sender=sender, instance=instance, pk_set=pk_set
+        )
+    elif action == 'post_clear':
+        index_id_lists(
+            id_lists=getattr(instance, '_search_index_id_lists', {})
+        )
@@ -0,0 +1,10 @@
+from __future__ import unicode_literals
+
+COUNT_ESTIMATE_LIMIT = 1000
+DEFAULT_SEARCH_BACKEND = 'dynamic_search.backends.django.DjangoSearchBackend'
+INDEXING_CHUNK_SIZE = 1000
+RETRY_DELAY = 5
+SEARCH_BATCH_SIZE = 100
+WHOOSH_INDEX_DIRECTORY_NAME = 'whoosh'
+WHOOSH_PRIMARY_KEY_FIELD = 'pk'
+WHOOSH_WRITER_TIMEOUT = 10
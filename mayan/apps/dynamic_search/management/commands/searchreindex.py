@@ -0,0 +1,17 @@
+from __future__ import unicode_literals
+
+from django.core import management
+
+from ...classes import SearchModel
+from ...runtime import search_backend
+
+
+class Command(management.BaseCommand):
+    help = 'Discard and rebuild the search index of every search model.'
+
+    def handle(self, *args, **options):
+        for search_model in SearchModel.all():
+            self.stdout.write(
+                'Indexing: {}'.format(search_model.get_full_name())
+            )
+            search_backend.rebuild_index(search_model=search_model)
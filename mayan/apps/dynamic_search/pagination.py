@@ -0,0 +1,71 @@
+from __future__ import unicode_literals
+
+from collections import OrderedDict
+
+from django.utils.encoding import force_text
+
+from rest_framework.exceptions import ParseError
+from rest_framework.pagination import LimitOffsetPagination
+from rest_framework.response import Response
+from rest_framework.utils.urls import replace_query_param
+
+from .exceptions import SearchQueryError
+from .literals import COUNT_ESTIMATE_LIMIT
+
+
+class SearchResultsPagination(LimitOffsetPagination):
+    """
+    Offset pagination of the search results in the order ranked by the
+    search backend. The relevance scores of the index backends are not
+    stable keys between requests and the database backend has none, so
+    the pages are not keyset based. The hits are collected once per page,
+    up to the end of the page or up to COUNT_ESTIMATE_LIMIT results for
+    the count. Past that, count_exact is False and count is a lower bound.
+    """
+    def get_next_link(self):
+        if not self.has_next:
+            return None
+
+        url = self.request.build_absolute_uri()
+        url = replace_query_param(url, self.limit_query_param, self.limit)
+
+        return replace_query_param(
+            url, self.offset_query_param, self.offset + self.limit
+        )
+
+    def get_paginated_response(self, data):
+        return Response(
+            OrderedDict(
+                (
+                    ('count', min(self.count, COUNT_ESTIMATE_LIMIT)),
+                    ('count_exact', self.count <= COUNT_ESTIMATE_LIMIT),
+                    ('next', self.get_next_link()),
+                    ('previous', self.get_previous_link()),
+                    ('results', data)
+                )
+            )
+        )
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.limit = self.get_limit(request)
+        self.offset = self.get_offset(request)
+        self.request = request
+
+        try:
+            # One more hit than needed tells if there is a next page or
+            # more results than can be counted
+            id_list = queryset.get_id_list(
+                limit=max(
+                    self.offset + self.limit, COUNT_ESTIMATE_LIMIT
+                ) + 1
+            )
+        except SearchQueryError as exception:
+            # Invalid queries are only detected when the search runs
+            raise ParseError(force_text(exception))
+
+        self.count = len(id_list)
+        self.has_next = len(id_list) > self.offset + self.limit
+
+        return queryset.get_instances(
+            id_list=id_list[self.offset:self.offset + self.limit]
+        )
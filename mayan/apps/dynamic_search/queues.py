@@ -0,0 +1,11 @@
+from __future__ import unicode_literals
+
+from django.utils.translation import ugettext_lazy as _
+
+from task_manager.classes import CeleryQueue
+
+queue_search = CeleryQueue(name='search', label=_('Search'))
+queue_search.add_task_type(
+    name='dynamic_search.tasks.task_index_instances',
+    label=_('Update the search index')
+)
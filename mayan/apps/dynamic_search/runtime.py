@@ -0,0 +1,9 @@
+import yaml
+
+from django.utils.module_loading import import_string
+
+from .settings import setting_backend, setting_backend_arguments
+
+search_backend = import_string(setting_backend.value)(
+    **yaml.safe_load(setting_backend_arguments.value or '{}')
+)
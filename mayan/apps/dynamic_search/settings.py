@@ -4,8 +4,25 @@ from django.utils.translation import ugettext_lazy as _
 
 from smart_settings import Namespace
 
+from .literals import DEFAULT_SEARCH_BACKEND
 
 namespace = Namespace(name='dynamic_search', label=_('Search'))
+setting_backend = namespace.add_setting(
+    global_name='SEARCH_BACKEND', default=DEFAULT_SEARCH_BACKEND,
+    help_text=_(
+        'Search backend to use. The full text index backend '
+        '"dynamic_search.backends.whoosh.WhooshSearchBackend" must be '
+        'populated with the "searchreindex" management command after '
+        'being enabled.'
+    )
+)
+setting_backend_arguments = namespace.add_setting(
+    global_name='SEARCH_BACKEND_ARGUMENTS', default='{}',
+    help_text=_(
+        'Configuration options for the search backend. For the full text '
+        'index backend: index_path.'
+    )
+)
 setting_limit = namespace.add_setting(
     global_name='SEARCH_LIMIT', default=100,
     help_text=_('Maximum amount search hits to fetch and display.')
@@ -0,0 +1,24 @@
+from __future__ import unicode_literals
+
+import logging
+
+from mayan.celery import app
+from lock_manager import LockError
+
+from .classes import SearchModel
+from .literals import RETRY_DELAY
+from .runtime import search_backend
+
+logger = logging.getLogger(__name__)
+
+
+@app.task(bind=True, default_retry_delay=RETRY_DELAY, max_retries=None, ignore_result=True)
+def task_index_instances(self, search_model_full_name, id_list):
+    search_model = SearchModel.get(search_model_full_name)
+
+    try:
+        search_backend.index_instances(
+            search_model=search_model, id_list=id_list
+        )
+    except LockError as exception:
+        raise self.retry(exc=exception)
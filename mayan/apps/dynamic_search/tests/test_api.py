@@ -54,6 +54,38 @@ class SearchAPITestCase(BaseAPITestCase):
         content = loads(response.content)
         self.assertEqual(content['results'][0]['label'], document.label)
         self.assertEqual(content['count'], 1)
+        self.assertTrue(content['count_exact'])
+        self.assertEqual(content['next'], None)
+
+    def test_search_pagination(self):
+        document_type = DocumentType.objects.create(
+            label=TEST_DOCUMENT_TYPE_LABEL
+        )
+
+        for label in ('mayan_1.pdf', 'mayan_2.pdf'):
+            with open(TEST_SMALL_DOCUMENT_PATH) as file_object:
+                document_type.new_document(
+                    file_object=file_object, label=label
+                )
+
+        url = reverse(
+            'rest_api:search-view', args=(document_search.get_full_name(),)
+        )
+
+        content = loads(
+            self.client.get('{}?q=mayan&limit=1'.format(url)).content
+        )
+        self.assertEqual(len(content['results']), 1)
+        self.assertEqual(content['count'], 2)
+        self.assertNotEqual(content['next'], None)
+
+        next_content = loads(self.client.get(content['next']).content)
+        self.assertEqual(len(next_content['results']), 1)
+        self.assertNotEqual(
+            next_content['results'][0]['label'],
+            content['results'][0]['label']
+        )
+        self.assertEqual(next_content['next'], None)
 
     def test_search_models_view(self):
         response = self.client.get(
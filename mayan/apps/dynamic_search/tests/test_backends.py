@@ -0,0 +1,130 @@
+from __future__ import unicode_literals
+
+import mock
+
+from django.test import override_settings
+from django.utils.encoding import force_text
+
+from common.tests import BaseTestCase
+from common.utils import fs_cleanup, mkdtemp
+from documents.models import DocumentType
+from documents.search import document_search
+from documents.tests import TEST_DOCUMENT_TYPE_LABEL, TEST_SMALL_DOCUMENT_PATH
+from tags.models import Tag
+
+from ..backends.whoosh import WhooshSearchBackend
+
+TEST_TAG_LABEL = 'invoice'
+
+
+@override_settings(OCR_AUTO_OCR=False)
+class WhooshSearchBackendTestCase(BaseTestCase):
+    def setUp(self):
+        super(WhooshSearchBackendTestCase, self).setUp()
+        self.index_path = mkdtemp()
+        self.search_backend = WhooshSearchBackend(index_path=self.index_path)
+
+        self.document_type = DocumentType.objects.create(
+            label=TEST_DOCUMENT_TYPE_LABEL
+        )
+
+        with open(TEST_SMALL_DOCUMENT_PATH) as file_object:
+            self.document = self.document_type.new_document(
+                file_object=file_object, label='mayan_11_1.pdf'
+            )
+
+    def tearDown(self):
+        self.document_type.delete()
+        fs_cleanup(self.index_path)
+        super(WhooshSearchBackendTestCase, self).tearDown()
+
+    def _search(self, query_string, global_and_search=False):
+        return self.search_backend.search(
+            search_model=document_search, query_string=query_string,
+            global_and_search=global_and_search, limit=10
+        )
+
+    def test_simple_search(self):
+        self.search_backend.rebuild_index(search_model=document_search)
+
+        self.assertEqual(
+            self._search({'q': 'Mayan'}), [force_text(self.document.pk)]
+        )
+        self.assertEqual(self._search({'q': 'missing'}), [])
+
+    def test_advanced_search(self):
+        self.search_backend.rebuild_index(search_model=document_search)
+
+        self.assertEqual(
+            self._search(
+                {
+                    'label': self.document.label,
+                    'versions__mimetype': self.document.file_mimetype
+                }, global_and_search=True
+            ), [force_text(self.document.pk)]
+        )
+        self.assertEqual(
+            self._search(
+                {
+                    'label': self.document.label,
+                    'versions__mimetype': 'missing'
+                }, global_and_search=True
+            ), []
+        )
+
+    def test_search_paging(self):
+        with open(TEST_SMALL_DOCUMENT_PATH) as file_object:
+            document_2 = self.document_type.new_document(
+                file_object=file_object, label='mayan_11_2.pdf'
+            )
+
+        self.search_backend.rebuild_index(search_model=document_search)
+
+        result_list = self._search({'q': 'Mayan'})
+        self.assertEqual(
+            set(result_list),
+            set((force_text(self.document.pk), force_text(document_2.pk)))
+        )
+        self.assertEqual(
+            self.search_backend.search(
+                search_model=document_search, query_string={'q': 'Mayan'},
+                limit=1, offset=1
+            ), result_list[1:]
+        )
+
+    def test_index_update_and_removal(self):
+        self.search_backend.rebuild_index(search_model=document_search)
+
+        self.document.label = 'edited'
+        self.document.save()
+        self.search_backend.index_instances(
+            search_model=document_search, id_list=(self.document.pk,)
+        )
+
+        self.assertEqual(self._search({'q': 'mayan'}), [])
+        self.assertEqual(
+            self._search({'q': 'edited'}), [force_text(self.document.pk)]
+        )
+
+        document_pk = self.document.pk
+        self.document.delete()
+        self.search_backend.index_instances(
+            search_model=document_search, id_list=(document_pk,)
+        )
+
+        self.assertEqual(self._search({'q': 'edited'}), [])
+
+    def test_related_changes_update_index(self):
+        with mock.patch('dynamic_search.handlers.search_backend', self.search_backend):
+            with mock.patch('dynamic_search.tasks.search_backend', self.search_backend):
+                tag = Tag.objects.create(label=TEST_TAG_LABEL)
+                tag.documents.add(self.document)
+
+                self.assertEqual(
+                    self._search({'q': TEST_TAG_LABEL}),
+                    [force_text(self.document.pk)]
+                )
+
+                self.document.tags.clear()
+
+                self.assertEqual(self._search({'q': TEST_TAG_LABEL}), [])
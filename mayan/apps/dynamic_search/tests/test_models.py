@@ -1,9 +1,12 @@
 from __future__ import unicode_literals
 
+import mock
+
 from django.test import override_settings
 
 from common.tests import BaseTestCase
 from documents.models import DocumentType
+from documents.permissions import permission_document_view
 from documents.search import document_search
 from documents.tests import TEST_DOCUMENT_TYPE_LABEL, TEST_SMALL_DOCUMENT_PATH
 
@@ -52,3 +55,22 @@ class DocumentSearchTestCase(BaseTestCase):
         )
         self.assertEqual(len(result_set), 1)
         self.assertEqual(list(model_list), [self.document])
+
+    def test_access_control_before_limit(self):
+        with open(TEST_SMALL_DOCUMENT_PATH) as file_object:
+            self.document_type.new_document(
+                file_object=file_object, label='mayan_11_2.pdf'
+            )
+
+        # Only the oldest of the matching documents is accessible
+        self.grant_access(
+            permission=permission_document_view, obj=self.document
+        )
+
+        with mock.patch('dynamic_search.classes.setting_limit', mock.Mock(value=1)):
+            model_list, result_set, elapsed_time = document_search.search(
+                {'q': 'Mayan'}, user=self.user
+            )
+
+        self.assertEqual(result_set, [self.document.pk])
+        self.assertEqual(list(model_list), [self.document])
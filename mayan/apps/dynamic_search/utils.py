@@ -0,0 +1,49 @@
+from __future__ import unicode_literals
+
+from .classes import SearchModel
+from .literals import INDEXING_CHUNK_SIZE
+from .runtime import search_backend
+from .tasks import task_index_instances
+
+
+def get_instance_id_lists(model, id_list):
+    """
+    Return the primary keys of the instances of each search model that
+    reach the given instances of model through their search fields.
+    """
+    result = {}
+    model = model._meta.concrete_model
+
+    for search_model in SearchModel.all():
+        models, through_models = search_model.get_related_lookups()
+        for lookup in models.get(model, ()):
+            result.setdefault(search_model, set()).update(
+                search_model.get_id_list_for_lookup(
+                    lookup=lookup, id_list=id_list
+                )
+            )
+
+    return result
+
+
+def index_id_lists(id_lists):
+    for search_model, id_list in id_lists.items():
+        id_list = sorted(id_list)
+        for start in range(0, len(id_list), INDEXING_CHUNK_SIZE):
+            task_index_instances.apply_async(
+                kwargs={
+                    'search_model_full_name': search_model.get_full_name(),
+                    'id_list': id_list[start:start + INDEXING_CHUNK_SIZE]
+                }
+            )
+
+
+def index_instances(model, id_list):
+    """
+    Update the search index after instances of model are written in bulk,
+    bypassing the model signals.
+    """
+    if search_backend.requires_indexing:
+        index_id_lists(
+            id_lists=get_instance_id_lists(model=model, id_list=id_list)
+        )
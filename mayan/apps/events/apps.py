@@ -4,11 +4,13 @@ from django.apps import apps
 from django.utils.translation import ugettext_lazy as _
 
 from common import MayanAppConfig, menu_tools
+from mayan.celery import app
 from navigation import SourceColumn
 from rest_api.classes import APIEndPoint
 
 from .links import link_events_list
 from .licenses import *  # NOQA
+from .queues import *  # NOQA
 from .widgets import event_object_link, event_type_link
 
 
@@ -49,4 +51,12 @@ class EventsApp(MayanAppConfig):
             )
         )
 
+        app.conf.CELERY_ROUTES.update(
+            {
+                'events.tasks.task_write_events': {
+                    'queue': 'tools'
+                },
+            }
+        )
+
         menu_tools.bind_links(links=(link_events_list,))
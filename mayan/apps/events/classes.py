@@ -1,10 +1,187 @@
 from __future__ import unicode_literals
 
+import functools
+import logging
+import threading
+
 from django.apps import apps
+from django.db import DatabaseError, connection, router, transaction
+from django.db.models.signals import post_save
 from django.utils.encoding import force_text
+from django.utils.dateparse import parse_datetime
+from django.utils.timezone import now
 from django.utils.translation import ugettext_lazy as _
 
 from actstream import action
+from actstream.registry import check
+
+from .literals import DEFAULT_BATCH_SIZE
+from .settings import setting_buffer_events, setting_buffer_maximum_size
+
+logger = logging.getLogger(__name__)
+
+
+class EventBuffer(object):
+    """
+    Keep the events committed inside a transaction in memory and write them
+    with bulk_create once the transaction commits. Events of a transaction
+    or savepoint that rolls back are discarded with it. Events that can't
+    be written are handed to a task that retries until they are, so
+    delivery is at least once from the moment the transaction commits.
+    The post_save signal of the events is sent once they are written.
+    """
+    _lock = threading.Lock()
+    _statistics = {
+        'buffered': 0, 'deferred': 0, 'early_writes': 0, 'maximum_pending': 0,
+        'written': 0,
+    }
+
+    @classmethod
+    def _get_pending(cls):
+        """
+        Return the list of events of the current savepoint. Each savepoint
+        gets its own commit callback, Django drops the callbacks registered
+        inside a savepoint when it rolls back, discarding its events. Django
+        has no public API to inspect the pending callbacks, this relies on
+        the connection's run_on_commit and savepoint_ids attributes of
+        Django 1.10.
+        """
+        savepoint_ids = set(connection.savepoint_ids)
+
+        for sids, function in connection.run_on_commit:
+            if sids == savepoint_ids and getattr(function, 'func', None) == cls.flush:
+                return function.keywords['actions']
+
+        pending = []
+        transaction.on_commit(functools.partial(cls.flush, actions=pending))
+        return pending
+
+    @classmethod
+    def _update_statistics(cls, **kwargs):
+        with cls._lock:
+            for key, value in kwargs.items():
+                if key == 'maximum_pending':
+                    cls._statistics[key] = max(cls._statistics[key], value)
+                else:
+                    cls._statistics[key] += value
+
+    @classmethod
+    def add(cls, action_instance):
+        if not connection.in_atomic_block:
+            # Nothing to wait for
+            cls.write(actions=(action_instance,))
+            return
+
+        pending = cls._get_pending()
+        pending.append(action_instance)
+        cls._update_statistics(buffered=1, maximum_pending=len(pending))
+
+        if len(pending) >= setting_buffer_maximum_size.value:
+            # Backpressure, write the events as part of the transaction
+            # instead of letting the buffer grow without bounds.
+            logger.debug(
+                'Event buffer full, writing %d events early', len(pending)
+            )
+            cls._update_statistics(early_writes=1)
+            cls.write(actions=pending)
+            del pending[:]
+
+    @classmethod
+    def flush(cls, actions):
+        if not actions:
+            return
+
+        try:
+            cls.insert(actions=actions)
+        except DatabaseError as exception:
+            from .tasks import task_write_events
+
+            logger.warning(
+                'Unable to write %d events, deferring them; %s',
+                len(actions), exception
+            )
+            cls._update_statistics(deferred=len(actions))
+            task_write_events.apply_async(
+                kwargs={
+                    'events': [
+                        cls.serialize(action_instance=action_instance)
+                        for action_instance in actions
+                    ]
+                }
+            )
+        else:
+            cls.send_post_save(actions=actions)
+
+    @classmethod
+    def get_statistics(cls):
+        """
+        Counters of the events buffered, written early because the buffer
+        was full and deferred to the task queue by this process, and the
+        largest number of events buffered by a single transaction.
+        """
+        with cls._lock:
+            return cls._statistics.copy()
+
+    @staticmethod
+    def deserialize(event):
+        Action = apps.get_model(app_label='actstream', model_name='Action')
+
+        event = event.copy()
+        event['timestamp'] = parse_datetime(event['timestamp'])
+        return Action(**event)
+
+    @staticmethod
+    def serialize(action_instance):
+        result = {
+            'actor_content_type_id': action_instance.actor_content_type_id,
+            'actor_object_id': action_instance.actor_object_id,
+            'public': action_instance.public,
+            'timestamp': action_instance.timestamp.isoformat(),
+            'verb': action_instance.verb,
+        }
+
+        for name in ('action_object', 'target'):
+            if getattr(action_instance, '{}_object_id'.format(name)) is not None:
+                result['{}_content_type_id'.format(name)] = getattr(
+                    action_instance, '{}_content_type_id'.format(name)
+                )
+                result['{}_object_id'.format(name)] = getattr(
+                    action_instance, '{}_object_id'.format(name)
+                )
+
+        return result
+
+    @classmethod
+    def insert(cls, actions):
+        Action = apps.get_model(app_label='actstream', model_name='Action')
+        Action.objects.bulk_create(actions, batch_size=DEFAULT_BATCH_SIZE)
+        cls._update_statistics(written=len(actions))
+
+    @staticmethod
+    def send_post_save(actions):
+        """
+        bulk_create sends no signals, send the post_save signal of each
+        event as saving them one by one would, for receivers like the
+        workflow transition triggers. The primary key of the events is
+        only set on databases that return it from bulk inserts.
+        """
+        Action = apps.get_model(app_label='actstream', model_name='Action')
+
+        if not post_save.has_listeners(Action):
+            return
+
+        for action_instance in actions:
+            post_save.send(
+                sender=Action, instance=action_instance, created=True,
+                update_fields=None, raw=False, using=router.db_for_write(
+                    Action, instance=action_instance
+                )
+            )
+
+    @classmethod
+    def write(cls, actions):
+        cls.insert(actions=actions)
+        cls.send_post_save(actions=actions)
 
 
 class Event(object):
@@ -58,13 +235,44 @@ class Event(object):
         return self.event_type
 
     def commit(self, actor=None, action_object=None, target=None):
-        if not self.event_type:
-            EventType = apps.get_model('events', 'EventType')
-            self.event_type, created = EventType.objects.get_or_create(
-                name=self.name
+        self.get_type()
+
+        if setting_buffer_events.value:
+            EventBuffer.add(
+                action_instance=self.get_action(
+                    actor=actor or target, action_object=action_object,
+                    target=target
+                )
+            )
+        else:
+            action.send(
+                actor or target, actor=actor, verb=self.name,
+                action_object=action_object, target=target
             )
 
-        action.send(
-            actor or target, actor=actor, verb=self.name,
-            action_object=action_object, target=target
+    def get_action(self, actor, action_object=None, target=None):
+        """
+        Return an unsaved action stream entry for this event, equivalent to
+        the one created by the actstream action signal.
+        """
+        Action = apps.get_model(app_label='actstream', model_name='Action')
+        ContentType = apps.get_model(
+            app_label='contenttypes', model_name='ContentType'
+        )
+
+        result = Action(
+            actor_content_type=ContentType.objects.get_for_model(actor),
+            actor_object_id=actor.pk, public=True, timestamp=now(),
+            verb=force_text(self.name)
         )
+
+        for name, obj in (('action_object', action_object), ('target', target)):
+            if obj is not None:
+                check(obj)
+                setattr(result, '{}_object_id'.format(name), obj.pk)
+                setattr(
+                    result, '{}_content_type'.format(name),
+                    ContentType.objects.get_for_model(obj)
+                )
+
+        return result
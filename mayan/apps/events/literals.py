@@ -0,0 +1,5 @@
+from __future__ import unicode_literals
+
+DEFAULT_BATCH_SIZE = 500
+DEFAULT_BUFFER_MAXIMUM_SIZE = 5000
+WRITE_EVENTS_RETRY_DELAY = 10
@@ -0,0 +1,10 @@
+from __future__ import absolute_import, unicode_literals
+
+from django.utils.translation import ugettext_lazy as _
+
+from common.queues import queue_tools
+
+queue_tools.add_task_type(
+    name='events.tasks.task_write_events',
+    label=_('Write buffered events')
+)
@@ -0,0 +1,25 @@
+from __future__ import unicode_literals
+
+from django.utils.translation import ugettext_lazy as _
+
+from smart_settings import Namespace
+
+from .literals import DEFAULT_BUFFER_MAXIMUM_SIZE
+
+namespace = Namespace(name='events', label=_('Events'))
+
+setting_buffer_events = namespace.add_setting(
+    global_name='EVENTS_BUFFER_EVENTS', default=False, help_text=_(
+        'Keep the events committed inside a database transaction in memory '
+        'and write them in batches once the transaction commits, instead of '
+        'writing each event as it happens.'
+    )
+)
+setting_buffer_maximum_size = namespace.add_setting(
+    global_name='EVENTS_BUFFER_MAXIMUM_SIZE',
+    default=DEFAULT_BUFFER_MAXIMUM_SIZE, help_text=_(
+        'Maximum number of events kept in memory per transaction. When '
+        'reached, the buffered events are written right away as part of the '
+        'transaction.'
+    )
+)
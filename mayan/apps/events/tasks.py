@@ -0,0 +1,27 @@
+from __future__ import unicode_literals
+
+import logging
+
+from django.db import DatabaseError
+
+from mayan.celery import app
+
+from .classes import EventBuffer
+from .literals import WRITE_EVENTS_RETRY_DELAY
+
+logger = logging.getLogger(__name__)
+
+
+@app.task(bind=True, default_retry_delay=WRITE_EVENTS_RETRY_DELAY, ignore_result=True, max_retries=None)
+def task_write_events(self, events):
+    actions = [EventBuffer.deserialize(event=event) for event in events]
+
+    try:
+        EventBuffer.insert(actions=actions)
+    except DatabaseError as exception:
+        logger.warning(
+            'Unable to write %d events, retrying; %s', len(events), exception
+        )
+        raise self.retry(exc=exception)
+    else:
+        EventBuffer.send_post_save(actions=actions)
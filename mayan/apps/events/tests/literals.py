@@ -0,0 +1,4 @@
+from __future__ import unicode_literals
+
+TEST_EVENT_TYPE_LABEL = 'test event type label'
+TEST_EVENT_TYPE_NAME = 'events_test_event_type'
@@ -0,0 +1,99 @@
+from __future__ import unicode_literals
+
+from django.db import connection, transaction
+from django.test import override_settings
+
+from actstream.models import Action
+
+from common.tests import BaseTestCase
+
+from ..classes import Event, EventBuffer
+
+from .literals import TEST_EVENT_TYPE_LABEL, TEST_EVENT_TYPE_NAME
+
+
+@override_settings(EVENTS_BUFFER_EVENTS=True)
+class EventBufferTestCase(BaseTestCase):
+    def setUp(self):
+        super(EventBufferTestCase, self).setUp()
+        self.event_type = Event(
+            name=TEST_EVENT_TYPE_NAME, label=TEST_EVENT_TYPE_LABEL
+        )
+        Action.objects.all().delete()
+
+    def test_events_written_on_commit(self):
+        self.event_type.commit(actor=self.admin_user, target=self.user)
+        self.event_type.commit(actor=self.admin_user, target=self.user)
+
+        self.assertEqual(Action.objects.count(), 0)
+
+        # Test cases never commit, run the commit callbacks directly
+        connection.run_and_clear_commit_hooks()
+
+        self.assertEqual(Action.objects.count(), 2)
+        self.assertEqual(Action.objects.first().actor, self.admin_user)
+        self.assertEqual(Action.objects.first().target, self.user)
+        self.assertEqual(
+            Action.objects.first().verb, TEST_EVENT_TYPE_NAME
+        )
+
+    def test_events_discarded_on_rollback(self):
+        try:
+            with transaction.atomic():
+                self.event_type.commit(target=self.user)
+                raise ValueError
+        except ValueError:
+            pass
+
+        connection.run_and_clear_commit_hooks()
+
+        self.assertEqual(Action.objects.count(), 0)
+
+    def test_events_discarded_on_savepoint_rollback(self):
+        self.event_type.commit(target=self.user)
+
+        try:
+            with transaction.atomic():
+                self.event_type.commit(target=self.user)
+                raise ValueError
+        except ValueError:
+            pass
+
+        connection.run_and_clear_commit_hooks()
+
+        self.assertEqual(Action.objects.count(), 1)
+
+    @override_settings(EVENTS_BUFFER_MAXIMUM_SIZE=2)
+    def test_buffer_maximum_size(self):
+        early_writes = EventBuffer.get_statistics()['early_writes']
+
+        for count in range(3):
+            self.event_type.commit(target=self.user)
+
+        self.assertEqual(Action.objects.count(), 2)
+        self.assertEqual(
+            EventBuffer.get_statistics()['early_writes'], early_writes + 1
+        )
+
+        connection.run_and_clear_commit_hooks()
+
+        self.assertEqual(Action.objects.count(), 3)
+
+    def test_deferred_events(self):
+        action = self.event_type.get_action(
+            actor=self.admin_user, target=self.user
+        )
+
+        EventBuffer.write(
+            actions=[
+                EventBuffer.deserialize(
+                    event=EventBuffer.serialize(action_instance=action)
+                )
+            ]
+        )
+
+        self.assertEqual(Action.objects.first().actor, self.admin_user)
+        self.assertEqual(Action.objects.first().target, self.user)
+        self.assertEqual(
+            Action.objects.first().timestamp, action.timestamp
+        )
@@ -1,6 +1,7 @@
 from __future__ import unicode_literals
 
 from django.apps import apps
+from django.db.models.signals import post_delete, post_save
 from django.utils.translation import ugettext_lazy as _
 
 from acls import ModelPermission
@@ -10,6 +11,7 @@ from common import (
     MayanAppConfig, menu_facet, menu_object, menu_secondary, menu_setup,
     menu_sidebar
 )
+from common.handlers import handler_invalidate_template_cache
 from common.widgets import two_state_template
 from navigation import SourceColumn
 from rest_api.classes import APIEndPoint
@@ -113,3 +115,24 @@ class LinkingApp(MayanAppConfig):
                 'linking:smart_link_condition_delete'
             )
         )
+
+        post_delete.connect(
+            handler_invalidate_template_cache,
+            dispatch_uid='linking_handler_invalidate_template_cache_smart_link_delete',
+            sender=SmartLink
+        )
+        post_delete.connect(
+            handler_invalidate_template_cache,
+            dispatch_uid='linking_handler_invalidate_template_cache_smart_link_condition_delete',
+            sender=SmartLinkCondition
+        )
+        post_save.connect(
+            handler_invalidate_template_cache,
+            dispatch_uid='linking_handler_invalidate_template_cache_smart_link_save',
+            sender=SmartLink
+        )
+        post_save.connect(
+            handler_invalidate_template_cache,
+            dispatch_uid='linking_handler_invalidate_template_cache_smart_link_condition_save',
+            sender=SmartLinkCondition
+        )
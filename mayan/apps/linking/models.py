@@ -2,10 +2,11 @@ from __future__ import unicode_literals
 
 from django.db import models
 from django.db.models import Q
-from django.template import Context, Template
+from django.template import Context
 from django.utils.encoding import force_text, python_2_unicode_compatible
 from django.utils.translation import ugettext_lazy as _
 
+from common.runtime import template_cache
 from documents.models import Document, DocumentType
 
 from .literals import (
@@ -39,7 +40,9 @@ class SmartLink(models.Model):
         if self.dynamic_label:
             context = Context({'document': document})
             try:
-                template = Template(self.dynamic_label)
+                template = template_cache.get(
+                    template_string=self.dynamic_label, owner=self
+                )
                 return template.render(context=context)
             except Exception as exception:
                 return _(
@@ -64,7 +67,9 @@ class SmartLink(models.Model):
         context = Context({'document': document})
 
         for condition in self.conditions.filter(enabled=True):
-            template = Template(condition.expression)
+            template = template_cache.get(
+                template_string=condition.expression, owner=condition
+            )
 
             condition_query = Q(**{
                 '%s__%s' % (
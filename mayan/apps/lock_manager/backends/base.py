@@ -1,6 +1,10 @@
 from __future__ import unicode_literals
 
 import logging
+import time
+
+from ..exceptions import LockError
+from ..literals import LOCK_POLL_INTERVAL_MAXIMUM, LOCK_POLL_INTERVAL_MINIMUM
 
 logger = logging.getLogger(__name__)
 
@@ -11,8 +15,38 @@ class LockingBackend(object):
     subclass must define.
     """
     @classmethod
-    def acquire_lock(cls, name, timeout=None):
-        logger.debug('acquiring lock: %s, timeout: %s', name, timeout)
+    def _acquire_lock(cls, name, timeout=None):
+        raise NotImplementedError
+
+    @classmethod
+    def acquire_lock(cls, name, timeout=None, blocking_timeout=None):
+        """
+        Acquire the lock `name` for `timeout` seconds. By default raise
+        LockError right away if the lock is held by someone else. When
+        `blocking_timeout` is provided, keep retrying for up to that many
+        seconds before raising LockError.
+        """
+        logger.debug(
+            'acquiring lock: %s, timeout: %s, blocking timeout: %s', name,
+            timeout, blocking_timeout
+        )
+
+        if blocking_timeout is None:
+            return cls._acquire_lock(name=name, timeout=timeout)
+
+        deadline = time.time() + blocking_timeout
+        interval = LOCK_POLL_INTERVAL_MINIMUM
+
+        while True:
+            try:
+                return cls._acquire_lock(name=name, timeout=timeout)
+            except LockError:
+                remaining = deadline - time.time()
+                if remaining <= 0:
+                    raise
+
+                time.sleep(min(interval, remaining))
+                interval = min(interval * 2, LOCK_POLL_INTERVAL_MAXIMUM)
 
     @classmethod
     def purge_locks(cls):
@@ -20,3 +54,11 @@ class LockingBackend(object):
 
     def release(self):
         logger.debug('releasing lock: %s', self.name)
+
+    def renew(self, timeout=None):
+        """
+        Extend the lock for another `timeout` seconds (or its original
+        timeout). Raise LockError if the lock expired and was acquired by
+        someone else in the meantime.
+        """
+        logger.debug('renewing lock: %s, timeout: %s', self.name, timeout)
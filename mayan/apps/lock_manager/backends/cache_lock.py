@@ -0,0 +1,127 @@
+from __future__ import unicode_literals
+
+import logging
+import uuid
+
+from django.core.cache import caches
+from django.utils.encoding import force_text
+
+from ..exceptions import LockError
+from ..literals import (
+    LOCK_KEY_GENERATION, LOCK_KEY_PREFIX, LOCK_REDIS_RELEASE_SCRIPT,
+    LOCK_REDIS_RENEW_SCRIPT
+)
+from ..settings import setting_cache_alias, setting_default_lock_timeout
+
+from .base import LockingBackend
+
+logger = logging.getLogger(__name__)
+
+
+class CacheLock(LockingBackend):
+    """
+    Lock backend using the atomic add operation of Django's cache framework.
+    Each lock stores a random token that is checked before releasing or
+    renewing it, so that a lock that expired and was acquired by someone
+    else is left alone. With a django-redis cache the token is compared
+    and the key deleted or expired atomically by a Lua script. Other
+    caches have no compare and delete operation, the token is read first
+    and a lock that expires between both steps can still be released or
+    renewed by its previous holder.
+    """
+    @classmethod
+    def _acquire_lock(cls, name, timeout=None):
+        return CacheLock(name=name, timeout=timeout)
+
+    @classmethod
+    def get_cache(cls):
+        return caches[setting_cache_alias.value]
+
+    @classmethod
+    def get_generation(cls):
+        return cls.get_cache().get(LOCK_KEY_GENERATION, 0)
+
+    @classmethod
+    def purge_locks(cls):
+        # The cache framework can't list keys, instead move to a new key
+        # generation and let the locks of the previous one expire.
+        super(CacheLock, cls).purge_locks()
+        cache = cls.get_cache()
+        cache.add(LOCK_KEY_GENERATION, 0, None)
+        cache.incr(LOCK_KEY_GENERATION)
+
+    def __init__(self, name, timeout=None):
+        self.name = name
+        self.timeout = timeout or setting_default_lock_timeout.value
+        self.uuid = force_text(uuid.uuid4())
+        self.key = '{}:{}:{}'.format(
+            LOCK_KEY_PREFIX, self.__class__.get_generation(), name
+        )
+
+        if not self.__class__.get_cache().add(
+            self.key, self.uuid, self.timeout
+        ):
+            raise LockError
+
+    def _get_redis(self):
+        """
+        Return the Redis client, the cache key and the encoded token when
+        the cache is a django-redis cache, otherwise None.
+        """
+        cache = self.__class__.get_cache()
+
+        try:
+            client = cache.client
+            return (
+                client.get_client(write=True), cache.make_key(self.key),
+                client.encode(self.uuid)
+            )
+        except AttributeError:
+            return None
+
+    def release(self):
+        super(CacheLock, self).release()
+        redis = self._get_redis()
+
+        if redis:
+            client, key, token = redis
+            client.eval(LOCK_REDIS_RELEASE_SCRIPT, 1, key, token)
+            return
+
+        cache = self.__class__.get_cache()
+
+        if cache.get(self.key) == self.uuid:
+            cache.delete(self.key)
+        else:
+            # Lock expired and someone else acquired or released it
+            pass
+
+    def renew(self, timeout=None):
+        super(CacheLock, self).renew(timeout=timeout)
+
+        if timeout:
+            self.timeout = timeout
+
+        redis = self._get_redis()
+
+        if redis:
+            client, key, token = redis
+            if not client.eval(
+                LOCK_REDIS_RENEW_SCRIPT, 1, key, token, self.timeout
+            ):
+                # Lock expired and someone else acquired or released it
+                raise LockError
+
+            return
+
+        cache = self.__class__.get_cache()
+
+        if cache.get(self.key) != self.uuid:
+            # Lock expired and someone else acquired or released it
+            raise LockError
+
+        # Delete and add the key again instead of setting it, add never
+        # overwrites a lock acquired by someone else in the meantime.
+        cache.delete(self.key)
+        if not cache.add(self.key, self.uuid, self.timeout):
+            raise LockError
@@ -31,8 +31,7 @@ class FileLock(LockingBackend):
     lock_file = lock_file
 
     @classmethod
-    def acquire_lock(cls, name, timeout=None):
-        super(FileLock, cls).acquire_lock(name=name, timeout=timeout)
+    def _acquire_lock(cls, name, timeout=None):
         instance = FileLock(
             name=name, timeout=timeout or setting_default_lock_timeout.value
         )
@@ -119,3 +118,32 @@ class FileLock(LockingBackend):
             file_object.truncate()
             file_object.write(json.dumps(file_locks))
             lock.release()
+
+    def renew(self, timeout=None):
+        super(FileLock, self).renew(timeout=timeout)
+
+        lock.acquire()
+        try:
+            with open(self.__class__.lock_file, 'r+') as file_object:
+                locks.lock(f=file_object, flags=locks.LOCK_EX)
+                data = file_object.read()
+
+                if data:
+                    file_locks = json.loads(data)
+                else:
+                    file_locks = {}
+
+                if file_locks.get(self.name, {}).get('uuid') != self.uuid:
+                    # Lock expired and someone else acquired or released it
+                    raise LockError
+
+                if timeout:
+                    self.timeout = timeout
+
+                file_locks[self.name] = self._get_lock_dictionary()
+
+                file_object.seek(0)
+                file_object.truncate()
+                file_object.write(json.dumps(file_locks))
+        finally:
+            lock.release()
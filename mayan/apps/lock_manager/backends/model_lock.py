@@ -7,8 +7,7 @@ from .base import LockingBackend
 
 class ModelLock(LockingBackend):
     @classmethod
-    def acquire_lock(cls, name, timeout=None):
-        super(ModelLock, cls).acquire_lock(name=name, timeout=timeout)
+    def _acquire_lock(cls, name, timeout=None):
         Lock = apps.get_model(app_label='lock_manager', model_name='Lock')
         return ModelLock(
             model_instance=Lock.objects.acquire_lock(
@@ -29,3 +28,7 @@ class ModelLock(LockingBackend):
     def release(self):
         super(ModelLock, self).release()
         self.model_instance.release()
+
+    def renew(self, timeout=None):
+        super(ModelLock, self).renew(timeout=timeout)
+        self.model_instance.renew(timeout=timeout)
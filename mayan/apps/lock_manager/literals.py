@@ -0,0 +1,23 @@
+from __future__ import unicode_literals
+
+LOCK_KEY_GENERATION = 'lock_manager:generation'
+LOCK_KEY_PREFIX = 'lock_manager'
+LOCK_POLL_INTERVAL_MAXIMUM = 1
+LOCK_POLL_INTERVAL_MINIMUM = 0.05
+
+# Compare the token of the lock and delete or expire the key in a single
+# atomic step
+LOCK_REDIS_RELEASE_SCRIPT = '''
+if redis.call('get', KEYS[1]) == ARGV[1] then
+    return redis.call('del', KEYS[1])
+else
+    return 0
+end
+'''
+LOCK_REDIS_RENEW_SCRIPT = '''
+if redis.call('get', KEYS[1]) == ARGV[1] then
+    return redis.call('expire', KEYS[1], ARGV[2])
+else
+    return 0
+end
+'''
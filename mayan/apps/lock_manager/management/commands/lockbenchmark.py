@@ -0,0 +1,124 @@
+from __future__ import division, unicode_literals
+
+import threading
+import time
+
+from django.core import management
+from django.db import connection
+from django.utils.module_loading import import_string
+
+from ...exceptions import LockError
+
+BACKENDS = (
+    'lock_manager.backends.file_lock.FileLock',
+    'lock_manager.backends.model_lock.ModelLock',
+    'lock_manager.backends.cache_lock.CacheLock',
+)
+BENCHMARK_PREFIX = 'lockbenchmark'
+
+
+class Command(management.BaseCommand):
+    help = (
+        'Measure the throughput of the lock backends when several threads '
+        'contend for the same lock names.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--backend', action='append', dest='backends',
+            help='Dotted path of a lock backend to measure. Can be repeated. '
+            'Defaults to all the included backends.'
+        )
+        parser.add_argument(
+            '--blocking-timeout', action='store', default=None,
+            dest='blocking_timeout', help='Seconds to wait for a lock. '
+            'Without it, failed attempts are counted and retried right away.',
+            type=float
+        )
+        parser.add_argument(
+            '--hold', action='store', default=0, dest='hold',
+            help='Milliseconds each lock is held.', type=float
+        )
+        parser.add_argument(
+            '--iterations', action='store', default=100, dest='iterations',
+            help='Number of locks acquired by each thread.', type=int
+        )
+        parser.add_argument(
+            '--names', action='store', default=1, dest='names',
+            help='Number of distinct lock names the threads contend for.',
+            type=int
+        )
+        parser.add_argument(
+            '--threads', action='store', default=8, dest='threads',
+            help='Number of concurrent threads.', type=int
+        )
+
+    def handle(self, *args, **options):
+        for backend_string in options['backends'] or BACKENDS:
+            locking_backend = import_string(backend_string)
+            locking_backend.purge_locks()
+
+            try:
+                self.measure(
+                    locking_backend=locking_backend, options=options
+                )
+            finally:
+                locking_backend.purge_locks()
+
+    def measure(self, locking_backend, options):
+        results = []
+
+        def worker(index):
+            acquired = failed = 0
+            wait = 0
+
+            try:
+                while acquired < options['iterations']:
+                    name = '{}_{}'.format(
+                        BENCHMARK_PREFIX,
+                        (index + acquired) % options['names']
+                    )
+                    start = time.time()
+                    try:
+                        lock = locking_backend.acquire_lock(
+                            name=name,
+                            blocking_timeout=options['blocking_timeout']
+                        )
+                    except LockError:
+                        failed += 1
+                        wait += time.time() - start
+                        continue
+
+                    wait += time.time() - start
+                    acquired += 1
+                    time.sleep(options['hold'] / 1000)
+                    lock.release()
+            finally:
+                connection.close()
+                results.append((acquired, failed, wait))
+
+        threads = [
+            threading.Thread(target=worker, args=(index,))
+            for index in range(options['threads'])
+        ]
+
+        start = time.time()
+        for thread in threads:
+            thread.start()
+
+        for thread in threads:
+            thread.join()
+        elapsed = time.time() - start
+
+        acquired = sum(result[0] for result in results)
+        failed = sum(result[1] for result in results)
+        wait = sum(result[2] for result in results)
+
+        self.stdout.write(
+            '{}: {} locks in {:.3f}s ({:.1f}/s), {} failed attempts, '
+            '{:.2f}ms average wait'.format(
+                locking_backend.__name__, acquired, elapsed,
+                acquired / elapsed if elapsed else 0, failed,
+                wait * 1000 / acquired if acquired else 0
+            )
+        )
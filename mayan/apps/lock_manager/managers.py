@@ -8,6 +8,7 @@ from django.db.utils import IntegrityError
 from django.utils.timezone import now
 
 from .exceptions import LockError
+from .settings import setting_default_lock_timeout
 
 logger = logging.getLogger(__name__)
 
@@ -32,10 +33,23 @@ class LockManager(models.Manager):
                 raise LockError('Unable to acquire lock')
 
             if now() > lock.creation_datetime + datetime.timedelta(seconds=lock.timeout):
-                logger.debug('reseting deleting stale lock: %s', name)
-                lock.timeout = timeout
                 logger.debug('trying to reacquire stale lock: %s', name)
-                lock.save()
+                creation_datetime = now()
+                timeout = timeout or setting_default_lock_timeout.value
+
+                # Only one of several concurrent callers gets to reset the
+                # stale lock, the others will not match the old creation
+                # datetime
+                updated = self.filter(
+                    pk=lock.pk, creation_datetime=lock.creation_datetime
+                ).update(creation_datetime=creation_datetime, timeout=timeout)
+
+                if not updated:
+                    logger.debug('unable to reacquire stale lock: %s', name)
+                    raise LockError('Unable to acquire lock')
+
+                lock.creation_datetime = creation_datetime
+                lock.timeout = timeout
                 logger.debug('reacquired stale lock: %s', name)
                 return lock
             else:
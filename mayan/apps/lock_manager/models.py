@@ -2,8 +2,10 @@ from __future__ import unicode_literals
 
 from django.db import models
 from django.utils.encoding import python_2_unicode_compatible
+from django.utils.timezone import now
 from django.utils.translation import ugettext_lazy as _
 
+from .exceptions import LockError
 from .managers import LockManager
 from .settings import setting_default_lock_timeout
 
@@ -42,6 +44,22 @@ class Lock(models.Model):
         else:
             lock.delete()
 
+    def renew(self, timeout=None):
+        creation_datetime = now()
+        timeout = timeout or self.timeout
+
+        # The creation datetime doubles as the ownership token, a lock that
+        # expired and was acquired by someone else will not match
+        updated = Lock.objects.filter(
+            name=self.name, creation_datetime=self.creation_datetime
+        ).update(creation_datetime=creation_datetime, timeout=timeout)
+
+        if not updated:
+            raise LockError('Unable to renew lock')
+
+        self.creation_datetime = creation_datetime
+        self.timeout = timeout
+
     class Meta:
         verbose_name = _('Lock')
         verbose_name_plural = _('Locks')
@@ -5,6 +5,7 @@ from django.utils.translation import ugettext_lazy as _
 from smart_settings import Namespace
 
 DEFAULT_BACKEND = 'lock_manager.backends.file_lock.FileLock'
+DEFAULT_CACHE_ALIAS = 'default'
 DEFAULT_LOCK_TIMEOUT_VALUE = 30
 
 namespace = Namespace(name='lock_manager', label=_('Lock manager'))
@@ -14,6 +15,20 @@ setting_backend = namespace.add_setting(
     global_name='LOCK_MANAGER_DEFAULT_BACKEND',
 )
 
+setting_cache_alias = namespace.add_setting(
+    default=DEFAULT_CACHE_ALIAS,
+    global_name='LOCK_MANAGER_CACHE_ALIAS', help_text=_(
+        'Name of the Django cache used by the cache lock backend. The cache '
+        'must support an atomic add operation shared by all the processes '
+        'and hosts (Memcached or Redis), the local memory cache only works '
+        'for a single process. Locks are released and renewed atomically '
+        'only with django-redis caches. With other caches a lock that '
+        'expires while it is being released or renewed can be deleted '
+        'after someone else acquired it, use lock timeouts well above the '
+        'duration of the work they protect.'
+    )
+)
+
 setting_default_lock_timeout = namespace.add_setting(
     default=DEFAULT_LOCK_TIMEOUT_VALUE,
     global_name='LOCK_MANAGER_DEFAULT_LOCK_TIMEOUT',
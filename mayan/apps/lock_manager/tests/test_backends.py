@@ -64,6 +64,59 @@ class FileLockTestCase(TestCase):
         # Cleanup
         lock_2.release()
 
+    def test_blocking_acquire(self):
+        self.locking_backend.acquire_lock(name='test_lock_1', timeout=1)
+
+        # lock_1 expires while waiting, should not raise LockError
+        lock_2 = self.locking_backend.acquire_lock(
+            name='test_lock_1', blocking_timeout=3
+        )
+
+        # Cleanup
+        lock_2.release()
+
+    def test_blocking_acquire_timeout(self):
+        lock_1 = self.locking_backend.acquire_lock(name='test_lock_1')
+
+        with self.assertRaises(LockError):
+            self.locking_backend.acquire_lock(
+                name='test_lock_1', blocking_timeout=1
+            )
+
+        # Cleanup
+        lock_1.release()
+
+    def test_renew(self):
+        lock_1 = self.locking_backend.acquire_lock(
+            name='test_lock_1', timeout=1
+        )
+        lock_1.renew(timeout=30)
+        time.sleep(2)
+
+        # lock_1 was renewed and has not expired, should raise LockError
+        with self.assertRaises(LockError):
+            self.locking_backend.acquire_lock(name='test_lock_1')
+
+        # Cleanup
+        lock_1.release()
+
+    def test_renew_expired_reacquired(self):
+        lock_1 = self.locking_backend.acquire_lock(
+            name='test_lock_1', timeout=1
+        )
+        time.sleep(2)
+        lock_2 = self.locking_backend.acquire_lock(name='test_lock_1')
+
+        with self.assertRaises(LockError):
+            lock_1.renew()
+
+        # Cleanup
+        lock_2.release()
+
+
+class CacheLockTestCase(FileLockTestCase):
+    backend_string = 'lock_manager.backends.cache_lock.CacheLock'
+
 
 class ModelLockTestCase(FileLockTestCase):
     backend_string = 'lock_manager.backends.model_lock.ModelLock'
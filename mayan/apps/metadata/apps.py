@@ -5,6 +5,7 @@ import logging
 from kombu import Exchange, Queue
 
 from django.apps import apps
+from django.db.models import Prefetch
 from django.db.models.signals import post_delete, post_save
 from django.utils.translation import ugettext_lazy as _
 
@@ -15,6 +16,7 @@ from common import (
 )
 from common.classes import ModelAttribute, Filter
 from common.widgets import two_state_template
+from document_indexing.classes import IndexRebuildPrefetch
 from documents.search import document_page_search, document_search
 from documents.signals import post_document_type_change
 from documents.permissions import permission_document_view
@@ -133,6 +135,14 @@ class MetadataApp(MayanAppConfig):
             type_name=['property', 'indexing']
         )
 
+        IndexRebuildPrefetch(
+            lookup=Prefetch(
+                'metadata', queryset=DocumentMetadata.objects.select_related(
+                    'metadata_type'
+                )
+            )
+        )
+
         ModelPermission.register(
             model=Document, permissions=(
                 permission_metadata_document_add,
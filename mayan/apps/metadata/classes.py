@@ -10,7 +10,15 @@ class DocumentMetadataHelper(PropertyHelper):
         return DocumentMetadataHelper(*args, **kwargs)
 
     def get_result(self, name):
-        return self.instance.metadata.get(metadata_type__name=name).value
+        if 'metadata' not in getattr(self.instance, '_prefetched_objects_cache', {}):
+            return self.instance.metadata.get(metadata_type__name=name).value
+
+        # Use the prefetched metadata instead of filtering in the database
+        for document_metadata in self.instance.metadata.all():
+            if document_metadata.metadata_type.name == name:
+                return document_metadata.value
+
+        raise self.instance.metadata.model.DoesNotExist
 
 
 class MetadataLookup(object):
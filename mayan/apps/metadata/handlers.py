@@ -4,8 +4,6 @@ from django.apps import apps
 
 import logging
 
-from document_indexing.tasks import task_index_document
-
 from .tasks import task_add_required_metadata_type, task_remove_metadata_type
 
 logger = logging.getLogger(__name__)
@@ -74,6 +72,10 @@ def post_document_type_change_metadata(sender, instance, **kwargs):
 
 
 def handler_index_document(sender, **kwargs):
-    task_index_document.apply_async(
-        kwargs=dict(document_id=kwargs['instance'].document.pk)
+    DocumentIndexRequest = apps.get_model(
+        app_label='document_indexing', model_name='DocumentIndexRequest'
+    )
+
+    DocumentIndexRequest.objects.request_document(
+        document=kwargs['instance'].document
     )
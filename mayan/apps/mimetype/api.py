@@ -2,24 +2,37 @@ from __future__ import unicode_literals
 
 import magic
 
+from .literals import MIMETYPE_READ_SIZE
 
-def get_mimetype(file_object, mimetype_only=False):
+
+def get_buffer_mimetype(file_buffer, mimetype_only=False):
     """
-    Determine a file's mimetype by calling the system's libmagic
-    library via python-magic or fallback to use python's mimetypes
-    library
+    Determine the mimetype and encoding of an in memory buffer with the
+    initial content of a file.
     """
-    file_mimetype = None
     file_mime_encoding = None
 
     mime = magic.Magic(mime=True)
-    file_mimetype = mime.from_buffer(file_object.read())
-    file_object.seek(0)
+    file_mimetype = mime.from_buffer(file_buffer)
 
     if not mimetype_only:
-        file_object.seek(0)
         mime_encoding = magic.Magic(mime_encoding=True)
-        file_mime_encoding = mime_encoding.from_buffer(file_object.read())
-        file_object.seek(0)
+        file_mime_encoding = mime_encoding.from_buffer(file_buffer)
 
     return file_mimetype, file_mime_encoding
+
+
+def get_mimetype(file_object, mimetype_only=False):
+    """
+    Determine a file's mimetype by calling the system's libmagic
+    library via python-magic or fallback to use python's mimetypes
+    library. Only the first MIMETYPE_READ_SIZE bytes of the file are read,
+    libmagic doesn't look past that point.
+    """
+    file_object.seek(0)
+    file_buffer = file_object.read(MIMETYPE_READ_SIZE)
+    file_object.seek(0)
+
+    return get_buffer_mimetype(
+        file_buffer=file_buffer, mimetype_only=mimetype_only
+    )
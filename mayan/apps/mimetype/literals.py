@@ -0,0 +1,4 @@
+from __future__ import unicode_literals
+
+# Same as libmagic's default maximum number of bytes read from a file
+MIMETYPE_READ_SIZE = 1024 * 1024
@@ -3,7 +3,8 @@ from __future__ import unicode_literals
 from django.contrib import admin
 
 from .models import (
-    DocumentPageOCRContent, DocumentTypeSettings, DocumentVersionOCRError
+    DocumentPageOCRContent, DocumentPageOCRStatus, DocumentTypeSettings,
+    DocumentVersionOCRError
 )
 
 
@@ -12,6 +13,13 @@ class DocumentPageOCRContentAdmin(admin.ModelAdmin):
     list_display = ('document_page',)
 
 
+@admin.register(DocumentPageOCRStatus)
+class DocumentPageOCRStatusAdmin(admin.ModelAdmin):
+    list_display = ('document_page', 'state', 'datetime')
+    list_filter = ('state',)
+    readonly_fields = ('document_page', 'state', 'datetime', 'result')
+
+
 @admin.register(DocumentTypeSettings)
 class DocumentTypeSettingsAdmin(admin.ModelAdmin):
     list_display = ('document_type', 'auto_ocr')
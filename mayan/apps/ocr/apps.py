@@ -120,6 +120,9 @@ class OCRApp(MayanAppConfig):
                 'ocr.tasks.task_do_ocr': {
                     'queue': 'ocr'
                 },
+                'ocr.tasks.task_do_ocr_page': {
+                    'queue': 'ocr'
+                },
             }
         )
 
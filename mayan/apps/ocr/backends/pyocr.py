@@ -40,7 +40,11 @@ class PyOCR(OCRBackendBase):
         """
         super(PyOCR, self).execute(*args, **kwargs)
 
-        image = Image.open(self.converter.get_page())
+        if self.image is None:
+            image = Image.open(self.converter.get_page())
+        else:
+            image = self.image
+
         try:
             result = self.tool.image_to_string(
                 image,
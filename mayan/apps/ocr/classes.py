@@ -4,13 +4,19 @@ from converter import converter_class
 
 
 class OCRBackendBase(object):
-    def execute(self, file_object, language=None, transformations=None):
+    def execute(self, file_object=None, language=None, transformations=None, image=None):
+        """
+        OCR a file or a ready to use image. Images are used as they are,
+        without being encoded again.
+        """
+        self.image = image
         self.language = language
 
-        if not transformations:
-            transformations = []
+        if image is None:
+            if not transformations:
+                transformations = []
 
-        self.converter = converter_class(file_object=file_object)
+            self.converter = converter_class(file_object=file_object)
 
-        for transformation in transformations:
-            self.converter.transform(transformation=transformation)
+            for transformation in transformations:
+                self.converter.transform(transformation=transformation)
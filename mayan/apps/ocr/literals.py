@@ -1,4 +1,19 @@
 from __future__ import unicode_literals
 
+from django.utils.translation import ugettext_lazy as _
+
+DEFAULT_OCR_RENDER_DPI = 300
+DO_OCR_PAGE_MAX_RETRIES = 3
 DO_OCR_RETRY_DELAY = 10
 LOCK_EXPIRE = 60 * 10  # Adjust to worst case scenario
+OCR_RENDER_BINARIZE_THRESHOLD = 128
+
+PAGE_OCR_STATE_DONE = 'done'
+PAGE_OCR_STATE_ERROR = 'error'
+PAGE_OCR_STATE_PENDING = 'pending'
+
+PAGE_OCR_STATE_CHOICES = (
+    (PAGE_OCR_STATE_PENDING, _('Pending')),
+    (PAGE_OCR_STATE_DONE, _('Done')),
+    (PAGE_OCR_STATE_ERROR, _('Error')),
+)
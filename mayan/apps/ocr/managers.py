@@ -1,46 +1,87 @@
 from __future__ import unicode_literals
 
 import logging
-import sys
-import traceback
 
 from django.apps import apps
-from django.conf import settings
-from django.db import models
-
-from documents.runtime import cache_storage_backend
+from django.db import models, transaction
+from django.utils.timezone import now
 
 from .events import event_ocr_document_version_finish
+from .literals import (
+    PAGE_OCR_STATE_DONE, PAGE_OCR_STATE_ERROR, PAGE_OCR_STATE_PENDING
+)
 from .runtime import ocr_backend
 from .signals import post_document_version_ocr
+from .utils import get_document_page_ocr_image
 
 logger = logging.getLogger(__name__)
 
 
 class DocumentPageOCRContentManager(models.Manager):
-    def process_document_version(self, document_version):
-        logger.info('Starting OCR for document version: %s', document_version)
-        logger.debug('document version: %d', document_version.pk)
+    def finish_document_page(self, document_page, result=None):
+        """
+        Record the outcome of the OCR of a page. The page that completes
+        its document version fires the OCR finish event and signal, or
+        records the errors of the failed pages.
+        """
+        DocumentPageOCRStatus = apps.get_model(
+            app_label='ocr', model_name='DocumentPageOCRStatus'
+        )
+        DocumentVersion = apps.get_model(
+            app_label='documents', model_name='DocumentVersion'
+        )
 
-        try:
-            for document_page in document_version.pages.all():
-                self.process_document_page(document_page=document_page)
-        except Exception as exception:
-            logger.error(
-                'OCR error for document version: %d; %s', document_version,
-                exception
+        if result is not None:
+            state = PAGE_OCR_STATE_ERROR
+        else:
+            state = PAGE_OCR_STATE_DONE
+
+        with transaction.atomic():
+            # Lock the document version row to serialize the pages
+            # finishing concurrently
+            document_version = DocumentVersion.objects.select_for_update().get(
+                pk=document_page.document_version_id
             )
 
-            if settings.DEBUG:
-                result = []
-                type, value, tb = sys.exc_info()
-                result.append('%s: %s' % (type.__name__, value))
-                result.extend(traceback.format_tb(tb))
-                document_version.ocr_errors.create(
-                    result='\n'.join(result)
+            updated = DocumentPageOCRStatus.objects.filter(
+                document_page=document_page, state=PAGE_OCR_STATE_PENDING
+            ).update(datetime=now(), result=result, state=state)
+
+            if not updated:
+                # Page already finished by a duplicate task
+                return
+
+            version_queryset = DocumentPageOCRStatus.objects.filter(
+                document_page__document_version=document_version
+            )
+
+            if version_queryset.filter(state=PAGE_OCR_STATE_PENDING).exists():
+                return
+
+            errors = [
+                'Page {}: {}'.format(page_number, page_result)
+                for page_number, page_result in version_queryset.filter(
+                    state=PAGE_OCR_STATE_ERROR
+                ).order_by('document_page__page_number').values_list(
+                    'document_page__page_number', 'result'
                 )
-            else:
-                document_version.ocr_errors.create(result=exception)
+            ]
+
+        self.finish_document_version(
+            document_version=document_version, errors=errors
+        )
+
+    def finish_document_version(self, document_version, errors=None):
+        """
+        Record the errors of the failed pages of the document version, or
+        fire the OCR finish event and signal if there are none.
+        """
+        if errors:
+            logger.error(
+                'OCR error for document version: %s; %d pages failed',
+                document_version, len(errors)
+            )
+            document_version.ocr_errors.create(result='\n'.join(errors))
         else:
             logger.info(
                 'OCR complete for document version: %s', document_version
@@ -56,7 +97,13 @@ class DocumentPageOCRContentManager(models.Manager):
                 sender=document_version.__class__, instance=document_version
             )
 
-    def process_document_page(self, document_page):
+    def process_document_page(self, document_page, lock=None):
+        """
+        OCR a document page. When the caller holds a lock for the page,
+        the lock is renewed once the page image is rendered so that the OCR
+        backend gets a full lock timeout, and again before the result is
+        saved so that it is not saved by a process that lost the lock.
+        """
         logger.info(
             'Processing page: %d of document version: %s',
             document_page.page_number, document_page.document_version
@@ -66,20 +113,58 @@ class DocumentPageOCRContentManager(models.Manager):
             app_label='ocr', model_name='DocumentPageOCRContent'
         )
 
-        # TODO: Call task and wait
-        cache_filename = document_page.generate_image()
+        image = get_document_page_ocr_image(document_page=document_page)
 
-        with cache_storage_backend.open(cache_filename) as file_object:
-            document_page_content, created = DocumentPageOCRContent.objects.get_or_create(
-                document_page=document_page
-            )
-            document_page_content.content = ocr_backend.execute(
-                file_object=file_object,
-                language=document_page.document.language
-            )
-            document_page_content.save()
+        if lock:
+            lock.renew()
+
+        content = ocr_backend.execute(
+            image=image, language=document_page.document.language
+        )
+
+        if lock:
+            lock.renew()
+
+        document_page_content, created = DocumentPageOCRContent.objects.get_or_create(
+            document_page=document_page
+        )
+        document_page_content.content = content
+        document_page_content.save()
 
         logger.info(
             'Finished processing page: %d of document version: %s',
             document_page.page_number, document_page.document_version
         )
+
+    def queue_document_version(self, document_version):
+        """
+        Mark all the pages of the document version as pending OCR and
+        return their primary keys. A document version without pages is
+        finished right away.
+        """
+        DocumentPageOCRStatus = apps.get_model(
+            app_label='ocr', model_name='DocumentPageOCRStatus'
+        )
+
+        logger.info('Starting OCR for document version: %s', document_version)
+
+        document_page_id_list = list(
+            document_version.pages.values_list('pk', flat=True)
+        )
+
+        with transaction.atomic():
+            DocumentPageOCRStatus.objects.filter(
+                document_page__document_version=document_version
+            ).delete()
+            DocumentPageOCRStatus.objects.bulk_create(
+                [
+                    DocumentPageOCRStatus(document_page_id=document_page_id)
+                    for document_page_id in document_page_id_list
+                ]
+            )
+
+        if not document_page_id_list:
+            # No page task will finish the document version
+            self.finish_document_version(document_version=document_version)
+
+        return document_page_id_list
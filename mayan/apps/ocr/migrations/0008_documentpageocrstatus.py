@@ -0,0 +1,57 @@
+# -*- coding: utf-8 -*-
+from __future__ import unicode_literals
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('documents', '0042_auto_20171016_1200'),
+        ('ocr', '0007_auto_20170827_1617'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='DocumentPageOCRStatus',
+            fields=[
+                (
+                    'id', models.AutoField(
+                        auto_created=True, primary_key=True, serialize=False,
+                        verbose_name='ID'
+                    )
+                ),
+                (
+                    'state', models.CharField(
+                        choices=[
+                            ('pending', 'Pending'), ('done', 'Done'),
+                            ('error', 'Error')
+                        ], db_index=True, default='pending', max_length=8,
+                        verbose_name='State'
+                    )
+                ),
+                (
+                    'datetime', models.DateTimeField(
+                        auto_now=True, verbose_name='Date time'
+                    )
+                ),
+                (
+                    'result', models.TextField(
+                        blank=True, null=True, verbose_name='Result'
+                    )
+                ),
+                (
+                    'document_page', models.OneToOneField(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name='ocr_status', to='documents.DocumentPage',
+                        verbose_name='Document page'
+                    )
+                ),
+            ],
+            options={
+                'verbose_name': 'Document page OCR status',
+                'verbose_name_plural': 'Document pages OCR status',
+            },
+        ),
+    ]
@@ -6,6 +6,7 @@ from django.utils.translation import ugettext_lazy as _
 
 from documents.models import DocumentPage, DocumentType, DocumentVersion
 
+from .literals import PAGE_OCR_STATE_CHOICES, PAGE_OCR_STATE_PENDING
 from .managers import DocumentPageOCRContentManager
 
 
@@ -45,6 +46,34 @@ class DocumentPageOCRContent(models.Model):
         verbose_name_plural = _('Document pages OCR contents')
 
 
+@python_2_unicode_compatible
+class DocumentPageOCRStatus(models.Model):
+    """
+    Progress of the OCR of a single page. Each page of a document version
+    is processed by its own task.
+    """
+    document_page = models.OneToOneField(
+        DocumentPage, on_delete=models.CASCADE, related_name='ocr_status',
+        verbose_name=_('Document page')
+    )
+    state = models.CharField(
+        choices=PAGE_OCR_STATE_CHOICES, db_index=True,
+        default=PAGE_OCR_STATE_PENDING, max_length=8,
+        verbose_name=_('State')
+    )
+    datetime = models.DateTimeField(
+        auto_now=True, verbose_name=_('Date time')
+    )
+    result = models.TextField(blank=True, null=True, verbose_name=_('Result'))
+
+    def __str__(self):
+        return force_text(self.document_page)
+
+    class Meta:
+        verbose_name = _('Document page OCR status')
+        verbose_name_plural = _('Document pages OCR status')
+
+
 @python_2_unicode_compatible
 class DocumentVersionOCRError(models.Model):
     document_version = models.ForeignKey(
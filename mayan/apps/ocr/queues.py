@@ -8,3 +8,6 @@ queue_ocr = CeleryQueue(name='ocr', label=_('OCR'))
 queue_ocr.add_task_type(
     name='ocr.tasks.task_do_ocr', label=_('Document version OCR')
 )
+queue_ocr.add_task_type(
+    name='ocr.tasks.task_do_ocr_page', label=_('Document page OCR')
+)
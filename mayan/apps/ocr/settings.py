@@ -4,6 +4,8 @@ from django.utils.translation import ugettext_lazy as _
 
 from smart_settings import Namespace
 
+from .literals import DEFAULT_OCR_RENDER_DPI
+
 namespace = Namespace(name='ocr', label=_('OCR'))
 
 setting_pdftotext_path = namespace.add_setting(
@@ -24,3 +26,19 @@ setting_auto_ocr = namespace.add_setting(
         'Set new document types to perform OCR automatically by default.'
     )
 )
+setting_render_binarize = namespace.add_setting(
+    global_name='OCR_RENDER_BINARIZE', default=False,
+    help_text=_(
+        'Convert the page images used as OCR input to black and white '
+        'instead of grayscale.'
+    )
+)
+setting_render_dpi = namespace.add_setting(
+    global_name='OCR_RENDER_DPI', default=DEFAULT_OCR_RENDER_DPI,
+    help_text=_(
+        'Resolution in dots per inch of the page images used as OCR input. '
+        'Pages of PDF and office documents are scaled from the resolution '
+        'at which they are rasterized, image documents are used at their '
+        'own resolution.'
+    )
+)
@@ -1,15 +1,18 @@
 from __future__ import unicode_literals
 
 import logging
+import sys
+import traceback
 
 from django.apps import apps
+from django.conf import settings
 from django.db import OperationalError
 
 from lock_manager import LockError
 from lock_manager.runtime import locking_backend
 from mayan.celery import app
 
-from .literals import DO_OCR_RETRY_DELAY, LOCK_EXPIRE
+from .literals import DO_OCR_PAGE_MAX_RETRIES, DO_OCR_RETRY_DELAY, LOCK_EXPIRE
 
 logger = logging.getLogger(__name__)
 
@@ -26,7 +29,7 @@ def task_do_ocr(self, document_version_pk):
     lock_id = 'task_do_ocr_doc_version-%d' % document_version_pk
     try:
         logger.debug('trying to acquire lock: %s', lock_id)
-        # Acquire lock to avoid doing OCR on the same document version more
+        # Acquire lock to avoid queuing the same document version more
         # than once concurrently
         lock = locking_backend.acquire_lock(lock_id, LOCK_EXPIRE)
         logger.debug('acquired lock: %s', lock_id)
@@ -39,7 +42,7 @@ def task_do_ocr(self, document_version_pk):
                 'Starting document OCR for document version: %s',
                 document_version
             )
-            DocumentPageOCRContent.objects.process_document_version(
+            document_page_id_list = DocumentPageOCRContent.objects.queue_document_version(
                 document_version=document_version
             )
         except OperationalError as exception:
@@ -52,3 +55,75 @@ def task_do_ocr(self, document_version_pk):
             lock.release()
     except LockError:
         logger.debug('unable to obtain lock: %s' % lock_id)
+    else:
+        # Fan out, one task per page
+        for document_page_pk in document_page_id_list:
+            task_do_ocr_page.apply_async(
+                kwargs={'document_page_pk': document_page_pk}
+            )
+
+
+@app.task(bind=True, default_retry_delay=DO_OCR_RETRY_DELAY, max_retries=DO_OCR_PAGE_MAX_RETRIES, ignore_result=True)
+def task_do_ocr_page(self, document_page_pk):
+    DocumentPage = apps.get_model(
+        app_label='documents', model_name='DocumentPage'
+    )
+    DocumentPageOCRContent = apps.get_model(
+        app_label='ocr', model_name='DocumentPageOCRContent'
+    )
+
+    try:
+        document_page = DocumentPage.objects.get(pk=document_page_pk)
+    except DocumentPage.DoesNotExist:
+        # Document was deleted before we could execute, abort
+        return
+
+    lock_id = 'task_do_ocr_page-%d' % document_page_pk
+    try:
+        logger.debug('trying to acquire lock: %s', lock_id)
+        # Acquire lock to avoid doing OCR on the same page more than once
+        # concurrently
+        lock = locking_backend.acquire_lock(lock_id, LOCK_EXPIRE)
+        logger.debug('acquired lock: %s', lock_id)
+    except LockError:
+        logger.debug('unable to obtain lock: %s' % lock_id)
+        return
+
+    error = None
+    try:
+        DocumentPageOCRContent.objects.process_document_page(
+            document_page=document_page, lock=lock
+        )
+    except Exception as exception:
+        error = exception
+
+        if settings.DEBUG:
+            result = []
+            exception_type, value, tb = sys.exc_info()
+            result.append('%s: %s' % (exception_type.__name__, value))
+            result.extend(traceback.format_tb(tb))
+            result = '\n'.join(result)
+        else:
+            result = '%s: %s' % (type(exception).__name__, exception)
+    else:
+        result = None
+    finally:
+        lock.release()
+
+    if error:
+        if self.request.retries < self.max_retries:
+            # Retry only this page
+            logger.warning(
+                'OCR error for document page: %d; %s. Retrying.',
+                document_page_pk, error
+            )
+            self.retry(exc=error, throw=False)
+            return
+
+        logger.error(
+            'OCR error for document page: %d; %s', document_page_pk, error
+        )
+
+    DocumentPageOCRContent.objects.finish_document_page(
+        document_page=document_page, result=result
+    )
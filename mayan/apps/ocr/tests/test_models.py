@@ -2,12 +2,26 @@
 
 from __future__ import unicode_literals
 
+from actstream.models import Action
+import mock
+
 from common.tests import BaseTestCase
-from documents.models import DocumentType
+from documents.models import DocumentPageCachedImage, DocumentType
 from documents.settings import setting_language_choices
 from documents.tests import (
     TEST_DEU_DOCUMENT_PATH, TEST_DOCUMENT_TYPE_LABEL, TEST_SMALL_DOCUMENT_PATH
 )
+from documents.tests.test_models import GenericDocumentTestCase
+
+from ..events import event_ocr_document_version_finish
+from ..exceptions import OCRError
+from ..literals import (
+    DO_OCR_PAGE_MAX_RETRIES, PAGE_OCR_STATE_DONE, PAGE_OCR_STATE_ERROR
+)
+from ..models import DocumentPageOCRContent, DocumentPageOCRStatus
+from ..runtime import ocr_backend
+
+TEST_OCR_CONTENT = 'Mayan EDMS Documentation'
 
 
 class DocumentOCRTestCase(BaseTestCase):
@@ -75,3 +89,78 @@ class GermanOCRSupportTestCase(BaseTestCase):
         self.assertTrue(
             'Es bietet einen' in content
         )
+
+
+class DocumentPageOCRTestCase(GenericDocumentTestCase):
+    @mock.patch.object(ocr_backend, 'execute', return_value=TEST_OCR_CONTENT)
+    def test_page_fan_out(self, execute):
+        Action.objects.all().delete()
+        self.document.submit_for_ocr()
+
+        self.assertEqual(execute.call_count, self.document.pages.count())
+        self.assertEqual(
+            DocumentPageOCRStatus.objects.filter(
+                state=PAGE_OCR_STATE_DONE
+            ).count(), self.document.pages.count()
+        )
+        self.assertEqual(
+            self.document.pages.first().ocr_content.content, TEST_OCR_CONTENT
+        )
+        self.assertEqual(
+            Action.objects.first().verb,
+            event_ocr_document_version_finish.name
+        )
+
+    @mock.patch.object(ocr_backend, 'execute', side_effect=OCRError)
+    def test_page_retries(self, execute):
+        Action.objects.all().delete()
+        self.document.submit_for_ocr()
+
+        document_page = self.document.pages.first()
+
+        # First attempt plus the retries
+        self.assertEqual(execute.call_count, DO_OCR_PAGE_MAX_RETRIES + 1)
+        self.assertEqual(
+            document_page.ocr_status.state, PAGE_OCR_STATE_ERROR
+        )
+        self.assertEqual(self.document.latest_version.ocr_errors.count(), 1)
+        self.assertFalse(
+            Action.objects.filter(
+                verb=event_ocr_document_version_finish.name
+            ).exists()
+        )
+
+    @mock.patch.object(ocr_backend, 'execute', return_value=TEST_OCR_CONTENT)
+    def test_page_render_bypasses_image_cache(self, execute):
+        self.document.invalidate_cache()
+        self.document.submit_for_ocr()
+
+        image = execute.call_args[1]['image']
+
+        self.assertEqual(image.mode, 'L')
+        self.assertEqual(DocumentPageCachedImage.objects.count(), 0)
+
+    @mock.patch.object(ocr_backend, 'execute', return_value=TEST_OCR_CONTENT)
+    def test_page_lock_renewal(self, execute):
+        lock = mock.Mock()
+
+        DocumentPageOCRContent.objects.process_document_page(
+            document_page=self.document.pages.first(), lock=lock
+        )
+
+        self.assertEqual(lock.renew.call_count, 2)
+        self.assertEqual(
+            self.document.pages.first().ocr_content.content, TEST_OCR_CONTENT
+        )
+
+    @mock.patch.object(ocr_backend, 'execute', return_value=TEST_OCR_CONTENT)
+    def test_version_without_pages(self, execute):
+        self.document.latest_version.pages.all().delete()
+        Action.objects.all().delete()
+        self.document.submit_for_ocr()
+
+        self.assertEqual(execute.call_count, 0)
+        self.assertEqual(
+            Action.objects.first().verb,
+            event_ocr_document_version_finish.name
+        )
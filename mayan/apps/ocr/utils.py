@@ -1,9 +1,25 @@
 from __future__ import unicode_literals
 
+import logging
+
+from PIL import Image
+import yaml
+
 from django.apps import apps
 from django.utils.encoding import force_text
 from django.utils.html import conditional_escape
 
+from converter import converter_class
+from converter.literals import DEFAULT_PDFTOPPM_DPI
+from converter.settings import setting_graphics_backend_config
+from documents.runtime import cache_storage_backend
+from documents.settings import setting_disable_base_image_cache
+
+from .literals import OCR_RENDER_BINARIZE_THRESHOLD
+from .settings import setting_render_binarize, setting_render_dpi
+
+logger = logging.getLogger(__name__)
+
 
 def get_document_ocr_content(document):
     DocumentPageOCRContent = apps.get_model(
@@ -17,3 +33,65 @@ def get_document_ocr_content(document):
             pass
         else:
             yield conditional_escape(force_text(page_content))
+
+
+def get_document_page_ocr_image(document_page):
+    """
+    Return the image of a page prepared as OCR input. Starts from the base
+    page image, applies the stored transformations of the page, scales it
+    to OCR_RENDER_DPI and converts it to grayscale or black and white.
+    Nothing is written to the image cache.
+    """
+    DocumentPageCachedImage = apps.get_model(
+        app_label='documents', model_name='DocumentPageCachedImage'
+    )
+    Transformation = apps.get_model(
+        app_label='converter', model_name='Transformation'
+    )
+
+    cache_filename = document_page.cache_filename
+
+    if not setting_disable_base_image_cache.value and cache_storage_backend.exists(cache_filename):
+        DocumentPageCachedImage.objects.record_hit(filename=cache_filename)
+        with cache_storage_backend.open(cache_filename) as file_object:
+            converter = converter_class(file_object=file_object)
+            converter.seek(page_number=0)
+    else:
+        converter = converter_class(
+            file_object=document_page.document_version.get_intermidiate_file()
+        )
+        converter.seek(page_number=document_page.page_number - 1)
+
+    converter.transform_many(
+        transformations=Transformation.objects.get_for_model(
+            document_page, as_classes=True
+        )
+    )
+
+    image = converter.image
+
+    if not document_page.document_version.mimetype.startswith('image/'):
+        # Rasterized pages, scale from the rasterization resolution
+        source_dpi = int(
+            yaml.load(setting_graphics_backend_config.value).get(
+                'pdftoppm_dpi', DEFAULT_PDFTOPPM_DPI
+            )
+        )
+        scale = float(setting_render_dpi.value) / source_dpi
+
+        if scale != 1:
+            logger.debug('Scaling OCR image by: %s', scale)
+            image = image.resize(
+                (int(image.size[0] * scale), int(image.size[1] * scale)),
+                Image.ANTIALIAS
+            )
+
+    image = image.convert('L')
+
+    if setting_render_binarize.value:
+        image = image.point(
+            lambda value: 255 if value >= OCR_RENDER_BINARIZE_THRESHOLD else 0,
+            '1'
+        )
+
+    return image
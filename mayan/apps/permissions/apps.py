@@ -1,5 +1,8 @@
 from __future__ import unicode_literals
 
+from django.contrib.auth import get_user_model
+from django.contrib.auth.models import Group
+from django.db.models.signals import m2m_changed, post_delete
 from django.utils.translation import ugettext_lazy as _
 
 from common import (
@@ -8,7 +11,9 @@ from common import (
 from common.signals import perform_upgrade
 from rest_api.classes import APIEndPoint
 
-from .handlers import purge_permissions
+from .handlers import (
+    handler_invalidate_permission_snapshots, purge_permissions
+)
 from .links import (
     link_permission_grant, link_permission_revoke, link_role_create,
     link_role_delete, link_role_edit, link_role_list, link_role_members,
@@ -26,6 +31,8 @@ class PermissionsApp(MayanAppConfig):
         super(PermissionsApp, self).ready()
 
         Role = self.get_model('Role')
+        StoredPermission = self.get_model('StoredPermission')
+        User = get_user_model()
 
         APIEndPoint(app=self, version_string='1')
 
@@ -45,6 +52,36 @@ class PermissionsApp(MayanAppConfig):
         )
         menu_setup.bind_links(links=(link_role_list,))
 
+        m2m_changed.connect(
+            handler_invalidate_permission_snapshots,
+            dispatch_uid='permissions_handler_invalidate_permission_snapshots_role_groups',
+            sender=Role.groups.through
+        )
+        m2m_changed.connect(
+            handler_invalidate_permission_snapshots,
+            dispatch_uid='permissions_handler_invalidate_permission_snapshots_role_permissions',
+            sender=Role.permissions.through
+        )
+        m2m_changed.connect(
+            handler_invalidate_permission_snapshots,
+            dispatch_uid='permissions_handler_invalidate_permission_snapshots_user_groups',
+            sender=User.groups.through
+        )
         perform_upgrade.connect(
             purge_permissions, dispatch_uid='purge_permissions'
         )
+        post_delete.connect(
+            handler_invalidate_permission_snapshots,
+            dispatch_uid='permissions_handler_invalidate_permission_snapshots_group_delete',
+            sender=Group
+        )
+        post_delete.connect(
+            handler_invalidate_permission_snapshots,
+            dispatch_uid='permissions_handler_invalidate_permission_snapshots_role_delete',
+            sender=Role
+        )
+        post_delete.connect(
+            handler_invalidate_permission_snapshots,
+            dispatch_uid='permissions_handler_invalidate_permission_snapshots_stored_permission_delete',
+            sender=StoredPermission
+        )
@@ -2,6 +2,7 @@ from __future__ import unicode_literals
 
 import itertools
 import logging
+import threading
 
 from django.apps import apps
 from django.core.exceptions import PermissionDenied
@@ -147,3 +148,49 @@ class Permission(object):
     @property
     def uuid(self):
         return '%s.%s' % (self.namespace.name, self.name)
+
+
+class PermissionSnapshot(object):
+    """
+    The roles of a user and the permissions granted to them, resolved once
+    and kept in the user instance for the rest of the request. Access
+    control list grants are added as they are looked up. Snapshots are
+    discarded when roles, groups, permissions or access control lists
+    change.
+    """
+    _lock = threading.Lock()
+    _version = 0
+
+    @classmethod
+    def get_for_user(cls, user):
+        snapshot = getattr(user, '_permission_snapshot', None)
+
+        if snapshot is None or snapshot.version != cls._version:
+            snapshot = cls(user=user)
+            user._permission_snapshot = snapshot
+
+        return snapshot
+
+    @classmethod
+    def invalidate(cls):
+        with cls._lock:
+            cls._version += 1
+
+    def __init__(self, user):
+        Role = apps.get_model(app_label='permissions', model_name='Role')
+        StoredPermission = apps.get_model(
+            app_label='permissions', model_name='StoredPermission'
+        )
+
+        self.version = self.__class__._version
+        self.acl_permission_ids = {}
+        self.role_ids = frozenset(
+            Role.objects.filter(groups__user=user).values_list(
+                'pk', flat=True
+            )
+        )
+        self.stored_permission_ids = frozenset(
+            StoredPermission.objects.filter(
+                roles__in=self.role_ids
+            ).values_list('pk', flat=True)
+        )
@@ -2,6 +2,12 @@ from __future__ import unicode_literals
 
 from django.core import management
 
+from .classes import PermissionSnapshot
+
+
+def handler_invalidate_permission_snapshots(sender, **kwargs):
+    PermissionSnapshot.invalidate()
+
 
 def purge_permissions(**kwargs):
     management.call_command('purgepermissions')
@@ -8,7 +8,7 @@ from django.urls import reverse
 from django.utils.encoding import force_text, python_2_unicode_compatible
 from django.utils.translation import ugettext_lazy as _
 
-from .classes import Permission
+from .classes import Permission, PermissionSnapshot
 from .managers import RoleManager, StoredPermissionManager
 
 logger = logging.getLogger(__name__)
@@ -54,14 +54,12 @@ class StoredPermission(models.Model):
             return True
 
         # Request is one of the permission's holders?
-        for group in user.groups.all():
-            for role in group.roles.all():
-                if self in role.permissions.all():
-                    logger.debug(
-                        'Permission "%s" granted to user "%s" through role "%s"',
-                        self, user, role
-                    )
-                    return True
+        if self.pk in PermissionSnapshot.get_for_user(user=user).stored_permission_ids:
+            logger.debug(
+                'Permission "%s" granted to user "%s" through a role',
+                self, user
+            )
+            return True
 
         logger.debug(
             'Fallthru: Permission "%s" not granted to user "%s"', self, user
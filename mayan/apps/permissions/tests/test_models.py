@@ -29,3 +29,35 @@ class PermissionTestCase(BaseTestCase):
             )
         except PermissionDenied:
             self.fail('PermissionDenied exception was not expected.')
+
+    def test_permission_snapshot_reuse(self):
+        self.group.user_set.add(self.user)
+        self.role.permissions.add(permission_role_view.stored_permission)
+        self.role.groups.add(self.group)
+
+        Permission.check_permissions(
+            requester=self.user, permissions=(permission_role_view,)
+        )
+
+        with self.assertNumQueries(0):
+            Permission.check_permissions(
+                requester=self.user, permissions=(permission_role_view,)
+            )
+
+    def test_permission_snapshot_invalidation(self):
+        self.group.user_set.add(self.user)
+        self.role.groups.add(self.group)
+
+        with self.assertRaises(PermissionDenied):
+            Permission.check_permissions(
+                requester=self.user, permissions=(permission_role_view,)
+            )
+
+        self.role.permissions.add(permission_role_view.stored_permission)
+
+        try:
+            Permission.check_permissions(
+                requester=self.user, permissions=(permission_role_view,)
+            )
+        except PermissionDenied:
+            self.fail('PermissionDenied exception was not expected.')
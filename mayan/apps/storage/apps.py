@@ -5,5 +5,6 @@ from django.utils.translation import ugettext_lazy as _
 
 
 class StorageApp(apps.AppConfig):
+    has_tests = True
     name = 'storage'
     verbose_name = _('Storage')
@@ -1,51 +1,303 @@
 from __future__ import unicode_literals
 
+import bz2
+from io import BytesIO, RawIOBase, SEEK_CUR, SEEK_END, SEEK_SET
 import os
+import struct
 import zipfile
+import zlib
 
 try:
-    import zlib  # NOQA
-    COMPRESSION = zipfile.ZIP_DEFLATED
-except:
-    COMPRESSION = zipfile.ZIP_STORED
-
-try:
-    from cStringIO import StringIO
+    import lzma
 except ImportError:
-    from StringIO import StringIO
+    try:
+        from backports import lzma
+    except ImportError:
+        lzma = None
 
+from django.core.exceptions import ImproperlyConfigured
 from django.core.files import File
 from django.core.files.storage import FileSystemStorage
 
-from ..settings import FILESTORAGE_LOCATION
+from common.utils import TemporaryFile
+
+from ..literals import (
+    COMPRESSED_STORAGE_CODEC_BZ2, COMPRESSED_STORAGE_CODEC_IDS,
+    COMPRESSED_STORAGE_CODEC_LZMA, COMPRESSED_STORAGE_CODEC_ZLIB,
+    COMPRESSED_STORAGE_HEADER_FORMAT, COMPRESSED_STORAGE_INDEX_ENTRY_FORMAT,
+    COMPRESSED_STORAGE_LEGACY_MAGIC, COMPRESSED_STORAGE_MAGIC,
+    COMPRESSED_STORAGE_TRAILER_FORMAT
+)
+from ..settings import (
+    setting_compressed_storage_block_size, setting_compressed_storage_codec,
+    setting_filestorage_location
+)
+
+# Codec name: (compress function, decompress function)
+CODECS = {
+    COMPRESSED_STORAGE_CODEC_BZ2: (bz2.compress, bz2.decompress),
+    COMPRESSED_STORAGE_CODEC_ZLIB: (zlib.compress, zlib.decompress),
+}
+
+if lzma:
+    CODECS[COMPRESSED_STORAGE_CODEC_LZMA] = (lzma.compress, lzma.decompress)
+
+HEADER_SIZE = struct.calcsize(COMPRESSED_STORAGE_HEADER_FORMAT)
+INDEX_ENTRY_SIZE = struct.calcsize(COMPRESSED_STORAGE_INDEX_ENTRY_FORMAT)
+TRAILER_SIZE = struct.calcsize(COMPRESSED_STORAGE_TRAILER_FORMAT)
+
+
+class CompressedStorageFile(RawIOBase):
+    """
+    Read only, seekable file object over a compressed storage container.
+
+    The container is a header with the codec and the block size, the
+    independently compressed blocks of the content, an index with the
+    offset and length of each compressed block and a trailer with the
+    offset of the index and the uncompressed size. Only the blocks that
+    are read are decompressed and the last one is kept to serve sequential
+    reads.
+    """
+    @staticmethod
+    def read_trailer(file_object):
+        file_object.seek(-TRAILER_SIZE, SEEK_END)
+        index_offset, size, block_count, magic = struct.unpack(
+            COMPRESSED_STORAGE_TRAILER_FORMAT, file_object.read(TRAILER_SIZE)
+        )
+
+        if magic != COMPRESSED_STORAGE_MAGIC:
+            raise IOError('Invalid compressed storage file trailer.')
+
+        return index_offset, size, block_count
+
+    def __init__(self, file_object):
+        self.file_object = file_object
+
+        file_object.seek(0)
+        magic, codec_id, self.block_size = struct.unpack(
+            COMPRESSED_STORAGE_HEADER_FORMAT, file_object.read(HEADER_SIZE)
+        )
+
+        if magic != COMPRESSED_STORAGE_MAGIC:
+            raise IOError('Invalid compressed storage file header.')
+
+        for codec, value in COMPRESSED_STORAGE_CODEC_IDS.items():
+            if value == codec_id and codec in CODECS:
+                self.decompress = CODECS[codec][1]
+                break
+        else:
+            raise IOError(
+                'Compressed storage codec id {} is not available.'.format(
+                    codec_id
+                )
+            )
+
+        index_offset, self.size, block_count = CompressedStorageFile.read_trailer(
+            file_object=file_object
+        )
+
+        file_object.seek(index_offset)
+        index_data = file_object.read(block_count * INDEX_ENTRY_SIZE)
+        self.index = [
+            struct.unpack_from(
+                COMPRESSED_STORAGE_INDEX_ENTRY_FORMAT, index_data,
+                block_number * INDEX_ENTRY_SIZE
+            ) for block_number in range(block_count)
+        ]
+
+        self.block_data = b''
+        self.block_number = None
+        self.position = 0
+
+    def close(self):
+        if not self.closed:
+            self.file_object.close()
+            self.block_data = b''
+
+        super(CompressedStorageFile, self).close()
+
+    def get_block(self, block_number):
+        if block_number != self.block_number:
+            offset, length = self.index[block_number]
+            self.file_object.seek(offset)
+            self.block_data = self.decompress(self.file_object.read(length))
+            self.block_number = block_number
+
+        return self.block_data
+
+    def read(self, size=-1):
+        if size is None or size < 0:
+            size = self.size - self.position
+
+        result = []
+        while size > 0 and self.position < self.size:
+            block_number, block_offset = divmod(
+                self.position, self.block_size
+            )
+            data = self.get_block(block_number=block_number)[
+                block_offset:block_offset + size
+            ]
+            result.append(data)
+            self.position += len(data)
+            size -= len(data)
+
+        return b''.join(result)
+
+    def readable(self):
+        return True
+
+    def readinto(self, buffer):
+        data = self.read(len(buffer))
+        buffer[:len(data)] = data
+        return len(data)
+
+    def seek(self, offset, whence=SEEK_SET):
+        if whence == SEEK_SET:
+            position = offset
+        elif whence == SEEK_CUR:
+            position = self.position + offset
+        elif whence == SEEK_END:
+            position = self.size + offset
+        else:
+            raise ValueError('Invalid whence value: {}'.format(whence))
+
+        if position < 0:
+            raise ValueError('Negative seek position: {}'.format(position))
+
+        self.position = position
+        return self.position
+
+    def seekable(self):
+        return True
+
+    def tell(self):
+        return self.position
 
 
 class CompressedStorage(FileSystemStorage):
-    """Simple wrapper for the stock Django FileSystemStorage class"""
+    """
+    FileSystemStorage subclass that stores files compressed in blocks.
+    Files are compressed as they are saved without being loaded in memory
+    and are opened as seekable file objects that decompress blocks on
+    demand. Files saved by the previous ZIP based version of this backend
+    are still readable.
+    """
 
     separator = os.path.sep
 
     def __init__(self, *args, **kwargs):
+        self.block_size = kwargs.pop(
+            'block_size', setting_compressed_storage_block_size.value
+        )
+        self.codec = kwargs.pop(
+            'codec', setting_compressed_storage_codec.value
+        )
+
+        if self.codec not in CODECS:
+            raise ImproperlyConfigured(
+                'Compressed storage codec "{}" is not available.'.format(
+                    self.codec
+                )
+            )
+
         super(CompressedStorage, self).__init__(*args, **kwargs)
-        self.location = FILESTORAGE_LOCATION
+        self.location = kwargs.get(
+            'location', setting_filestorage_location.value
+        )
+
+    def _save(self, name, content):
+        compress = CODECS[self.codec][0]
 
-    def save(self, name, content):
-        descriptor = StringIO()
-        zf = zipfile.ZipFile(descriptor, mode='w', compression=COMPRESSION)
+        try:
+            content.seek(0)
+        except (AttributeError, IOError, ValueError):
+            pass
 
-        zf.writestr('document', content.read())
+        temporary_file = TemporaryFile()
+        try:
+            temporary_file.write(
+                struct.pack(
+                    COMPRESSED_STORAGE_HEADER_FORMAT, COMPRESSED_STORAGE_MAGIC,
+                    COMPRESSED_STORAGE_CODEC_IDS[self.codec], self.block_size
+                )
+            )
 
-        for file in zf.filelist:
-            file.create_system = 0
+            index = []
+            offset = HEADER_SIZE
+            size = 0
 
-        zf.close()
-        descriptor.seek(0)
-        return super(CompressedStorage, self).save(name, File(descriptor))
+            while True:
+                data = self._read_block(file_object=content)
+                if not data:
+                    break
+
+                size += len(data)
+                data = compress(data)
+                temporary_file.write(data)
+                index.append(
+                    struct.pack(
+                        COMPRESSED_STORAGE_INDEX_ENTRY_FORMAT, offset,
+                        len(data)
+                    )
+                )
+                offset += len(data)
+
+            temporary_file.write(b''.join(index))
+            temporary_file.write(
+                struct.pack(
+                    COMPRESSED_STORAGE_TRAILER_FORMAT, offset, size,
+                    len(index), COMPRESSED_STORAGE_MAGIC
+                )
+            )
+            temporary_file.seek(0)
+
+            return super(CompressedStorage, self)._save(
+                name, File(temporary_file)
+            )
+        finally:
+            temporary_file.close()
+
+    def _read_block(self, file_object):
+        # Blocks other than the last must have exactly block_size bytes
+        # for the offset calculations of the reader, read until full.
+        result = []
+        remaining = self.block_size
+
+        while remaining:
+            data = file_object.read(remaining)
+            if not data:
+                break
+
+            result.append(data)
+            remaining -= len(data)
+
+        return b''.join(result)
 
     def open(self, name, mode='rb'):
         storage_file = super(CompressedStorage, self).open(name, mode)
-        zf = zipfile.ZipFile(storage_file)
-        descriptor = StringIO()
-        descriptor.write(zf.read('document'))
-        descriptor.seek(0)
-        return File(descriptor)
+
+        if storage_file.read(len(COMPRESSED_STORAGE_LEGACY_MAGIC)) == COMPRESSED_STORAGE_LEGACY_MAGIC:
+            storage_file.seek(0)
+            zip_file = zipfile.ZipFile(storage_file.file)
+            descriptor = BytesIO(zip_file.read('document'))
+            zip_file.close()
+            storage_file.close()
+            return File(descriptor)
+
+        try:
+            return File(CompressedStorageFile(file_object=storage_file.file))
+        except Exception:
+            storage_file.close()
+            raise
+
+    def size(self, name):
+        with super(CompressedStorage, self).open(name, 'rb') as storage_file:
+            if storage_file.read(len(COMPRESSED_STORAGE_LEGACY_MAGIC)) == COMPRESSED_STORAGE_LEGACY_MAGIC:
+                storage_file.seek(0)
+                return zipfile.ZipFile(storage_file.file).getinfo(
+                    'document'
+                ).file_size
+
+            return CompressedStorageFile.read_trailer(
+                file_object=storage_file.file
+            )[1]
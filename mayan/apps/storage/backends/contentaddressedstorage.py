@@ -0,0 +1,165 @@
+from __future__ import unicode_literals
+
+import errno
+import hashlib
+from io import SEEK_SET
+import os
+import re
+import time
+import uuid
+
+from django.core.files import File
+
+from lock_manager.runtime import locking_backend
+
+from ..literals import (
+    CONTENT_ADDRESSED_STORAGE_LOCK_NAME_TEMPLATE,
+    CONTENT_ADDRESSED_STORAGE_LOCK_TIMEOUT,
+    CONTENT_ADDRESSED_STORAGE_NAME_REGEX,
+    CONTENT_ADDRESSED_STORAGE_TEMPORARY_DIRECTORY
+)
+
+from .compressedstorage import CompressedStorage
+from .filebasedstorage import FileBasedStorage
+
+
+class HashingFile(File):
+    """
+    File wrapper that calculates the SHA-256 hash of the data as it is read.
+    """
+    def __init__(self, *args, **kwargs):
+        super(HashingFile, self).__init__(*args, **kwargs)
+        self.hash_object = hashlib.sha256()
+
+    def read(self, *args, **kwargs):
+        data = self.file.read(*args, **kwargs)
+        self.hash_object.update(data)
+        return data
+
+    def seek(self, offset, whence=SEEK_SET):
+        # Storage backends rewind the content before copying it, start
+        # the hash again. Other seeks would make the hash invalid.
+        if offset or whence != SEEK_SET:
+            raise IOError('Only rewinding is supported.')
+
+        self.file.seek(offset, whence)
+        self.hash_object = hashlib.sha256()
+
+
+class ContentAddressedStorageMixin(object):
+    """
+    Mixin for FileSystemStorage subclasses that stores files under the
+    SHA-256 hash of their content. Saving content that is already stored
+    returns the name of the existing file instead of storing a new copy.
+    Files are shared and are never deleted when an object that references
+    them is deleted. Instead, delete_unreferenced() removes files that
+    nothing references and that were not saved recently, giving the
+    callers of save() time to commit their references.
+    """
+    name_regex = re.compile(CONTENT_ADDRESSED_STORAGE_NAME_REGEX)
+
+    def _acquire_lock(self, name):
+        # Reusing, storing and deleting the file of a content are
+        # serialized
+        return locking_backend.acquire_lock(
+            name=CONTENT_ADDRESSED_STORAGE_LOCK_NAME_TEMPLATE.format(
+                os.path.basename(name)
+            ), blocking_timeout=CONTENT_ADDRESSED_STORAGE_LOCK_TIMEOUT
+        )
+
+    def _save(self, name, content):
+        content = HashingFile(content)
+        # Write the content with the storage class being extended, then
+        # move it to its final name.
+        temporary_name = super(ContentAddressedStorageMixin, self)._save(
+            '{}/{}'.format(
+                CONTENT_ADDRESSED_STORAGE_TEMPORARY_DIRECTORY, uuid.uuid4()
+            ), content
+        )
+
+        name = self.get_content_name(
+            checksum=content.hash_object.hexdigest()
+        )
+
+        lock = self._acquire_lock(name=name)
+        try:
+            if self.exists(name):
+                self.delete(temporary_name)
+                # Mark the file as recently saved so that it is not deleted
+                # as unreferenced before the caller stores its reference.
+                os.utime(self.path(name), None)
+            else:
+                directory = os.path.dirname(self.path(name))
+                try:
+                    os.makedirs(directory)
+                except OSError as exception:
+                    if exception.errno != errno.EEXIST:
+                        raise
+
+                os.rename(self.path(temporary_name), self.path(name))
+        finally:
+            lock.release()
+
+        return name
+
+    def delete_unreferenced(self, name, age):
+        """
+        Delete the file `name` unless it was saved in the last `age`
+        seconds. The caller checks that nothing references the file.
+        Returns True if the file was deleted.
+        """
+        lock = self._acquire_lock(name=name)
+        try:
+            try:
+                modified_time = os.path.getmtime(self.path(name))
+            except OSError as exception:
+                if exception.errno != errno.ENOENT:
+                    raise
+
+                return False
+
+            if time.time() - modified_time < age:
+                return False
+
+            self.delete(name)
+            return True
+        finally:
+            lock.release()
+
+    def get_content_name(self, checksum):
+        return '{}/{}/{}'.format(checksum[0:2], checksum[2:4], checksum)
+
+    def get_content_names(self):
+        """
+        Return an iterator of the names of all the files stored
+        """
+        for path, directories, filenames in os.walk(self.location):
+            if path == self.location:
+                try:
+                    directories.remove(
+                        CONTENT_ADDRESSED_STORAGE_TEMPORARY_DIRECTORY
+                    )
+                except ValueError:
+                    pass
+
+            for filename in filenames:
+                name = os.path.relpath(
+                    os.path.join(path, filename), self.location
+                ).replace(os.path.sep, '/')
+
+                if self.is_content_name(name):
+                    yield name
+
+    def is_content_name(self, name):
+        return bool(self.name_regex.match(name))
+
+
+class ContentAddressedCompressedStorage(ContentAddressedStorageMixin, CompressedStorage):
+    """
+    Content addressed version of the compressed storage backend. Files are
+    named after the hash of their uncompressed content.
+    """
+
+
+class ContentAddressedStorage(ContentAddressedStorageMixin, FileBasedStorage):
+    """Content addressed version of the file based storage backend"""
@@ -0,0 +1,20 @@
+from __future__ import unicode_literals
+
+COMPRESSED_STORAGE_BLOCK_SIZE = 64 * 1024
+COMPRESSED_STORAGE_CODEC_BZ2 = 'bz2'
+COMPRESSED_STORAGE_CODEC_LZMA = 'lzma'
+COMPRESSED_STORAGE_CODEC_ZLIB = 'zlib'
+COMPRESSED_STORAGE_CODEC_IDS = {
+    COMPRESSED_STORAGE_CODEC_ZLIB: 1,
+    COMPRESSED_STORAGE_CODEC_BZ2: 2,
+    COMPRESSED_STORAGE_CODEC_LZMA: 3,
+}
+COMPRESSED_STORAGE_HEADER_FORMAT = '<8sBL'
+COMPRESSED_STORAGE_INDEX_ENTRY_FORMAT = '<QL'
+COMPRESSED_STORAGE_LEGACY_MAGIC = b'PK\x03\x04'
+COMPRESSED_STORAGE_MAGIC = b'MAYANCS1'
+COMPRESSED_STORAGE_TRAILER_FORMAT = '<QQL8s'
+CONTENT_ADDRESSED_STORAGE_LOCK_NAME_TEMPLATE = 'storage:content_{}'
+CONTENT_ADDRESSED_STORAGE_LOCK_TIMEOUT = 30
+CONTENT_ADDRESSED_STORAGE_NAME_REGEX = r'^[0-9a-f]{2}/[0-9a-f]{2}/[0-9a-f]{64}$'
+CONTENT_ADDRESSED_STORAGE_TEMPORARY_DIRECTORY = 'tmp'
@@ -7,8 +7,29 @@ from django.utils.translation import ugettext_lazy as _
 
 from smart_settings import Namespace
 
+from .literals import (
+    COMPRESSED_STORAGE_BLOCK_SIZE, COMPRESSED_STORAGE_CODEC_ZLIB
+)
+
 namespace = Namespace(name='storage', label=_('Storage'))
 setting_filestorage_location = namespace.add_setting(
     global_name='STORAGE_FILESTORAGE_LOCATION',
     default=os.path.join(settings.MEDIA_ROOT, 'document_storage'), is_path=True
 )
+setting_compressed_storage_block_size = namespace.add_setting(
+    global_name='STORAGE_COMPRESSED_STORAGE_BLOCK_SIZE',
+    default=COMPRESSED_STORAGE_BLOCK_SIZE, help_text=_(
+        'Size in bytes of the blocks in which the compressed storage '
+        'backend divides files before compressing them. Smaller blocks '
+        'make random reads cheaper, larger blocks compress better.'
+    )
+)
+setting_compressed_storage_codec = namespace.add_setting(
+    global_name='STORAGE_COMPRESSED_STORAGE_CODEC',
+    default=COMPRESSED_STORAGE_CODEC_ZLIB, help_text=_(
+        'Compression codec used by the compressed storage backend for new '
+        'files. Options are: zlib, bz2 and lzma. lzma requires Python 3 or '
+        'the backports.lzma package. Existing files are read with the '
+        'codec they were written with.'
+    )
+)
@@ -0,0 +1,144 @@
+from __future__ import unicode_literals
+
+import hashlib
+from io import BytesIO, SEEK_END
+import zipfile
+
+from django.core.files.base import ContentFile
+
+from common.tests import BaseTestCase
+from common.utils import fs_cleanup, mkdtemp
+from documents.tests import TEST_DOCUMENT_PATH
+
+from ..backends.compressedstorage import CODECS, CompressedStorage
+from ..backends.contentaddressedstorage import (
+    ContentAddressedCompressedStorage, ContentAddressedStorage
+)
+
+TEST_BLOCK_SIZE = 1024
+TEST_FILE_NAME = 'test_file'
+TEST_FILE_NAME_2 = 'test_file_2'
+
+
+class CompressedStorageTestCase(BaseTestCase):
+    def setUp(self):
+        super(CompressedStorageTestCase, self).setUp()
+        self.location = mkdtemp()
+
+        with open(TEST_DOCUMENT_PATH, 'rb') as file_object:
+            self.test_content = file_object.read()
+
+    def tearDown(self):
+        fs_cleanup(self.location)
+        super(CompressedStorageTestCase, self).tearDown()
+
+    def _get_storage(self, codec):
+        return CompressedStorage(
+            block_size=TEST_BLOCK_SIZE, codec=codec, location=self.location
+        )
+
+    def test_read(self):
+        for codec in CODECS:
+            storage = self._get_storage(codec=codec)
+            name = storage.save(TEST_FILE_NAME, ContentFile(self.test_content))
+
+            self.assertEqual(storage.size(name), len(self.test_content))
+
+            with storage.open(name) as file_object:
+                self.assertEqual(file_object.read(), self.test_content)
+
+            storage.delete(name)
+
+    def test_random_access(self):
+        storage = self._get_storage(codec='zlib')
+        name = storage.save(TEST_FILE_NAME, ContentFile(self.test_content))
+
+        with storage.open(name) as file_object:
+            file_object.seek(-TEST_BLOCK_SIZE * 2, SEEK_END)
+            self.assertEqual(
+                file_object.read(), self.test_content[-TEST_BLOCK_SIZE * 2:]
+            )
+
+            offset = TEST_BLOCK_SIZE * 3 - 10
+            file_object.seek(offset)
+            self.assertEqual(
+                file_object.read(TEST_BLOCK_SIZE + 20),
+                self.test_content[offset:offset + TEST_BLOCK_SIZE + 20]
+            )
+            self.assertEqual(
+                file_object.tell(), offset + TEST_BLOCK_SIZE + 20
+            )
+
+    def test_legacy_zip_file(self):
+        storage = self._get_storage(codec='zlib')
+
+        descriptor = BytesIO()
+        zip_file = zipfile.ZipFile(
+            descriptor, mode='w', compression=zipfile.ZIP_DEFLATED
+        )
+        zip_file.writestr('document', self.test_content)
+        zip_file.close()
+        descriptor.seek(0)
+
+        with open(storage.path(TEST_FILE_NAME), 'wb') as file_object:
+            file_object.write(descriptor.read())
+
+        self.assertEqual(storage.size(TEST_FILE_NAME), len(self.test_content))
+
+        with storage.open(TEST_FILE_NAME) as file_object:
+            self.assertEqual(file_object.read(), self.test_content)
+
+
+class ContentAddressedStorageTestCase(BaseTestCase):
+    def setUp(self):
+        super(ContentAddressedStorageTestCase, self).setUp()
+        self.location = mkdtemp()
+
+        with open(TEST_DOCUMENT_PATH, 'rb') as file_object:
+            self.test_content = file_object.read()
+
+    def tearDown(self):
+        fs_cleanup(self.location)
+        super(ContentAddressedStorageTestCase, self).tearDown()
+
+    def _test_storage(self, storage):
+        name = storage.save(TEST_FILE_NAME, ContentFile(self.test_content))
+        name_2 = storage.save(
+            TEST_FILE_NAME_2, ContentFile(self.test_content)
+        )
+
+        self.assertEqual(name, name_2)
+        self.assertEqual(
+            name, storage.get_content_name(
+                checksum=hashlib.sha256(self.test_content).hexdigest()
+            )
+        )
+        self.assertTrue(storage.is_content_name(name))
+
+        with storage.open(name) as file_object:
+            self.assertEqual(file_object.read(), self.test_content)
+
+        name_3 = storage.save(
+            TEST_FILE_NAME, ContentFile(self.test_content[:-1])
+        )
+        self.assertNotEqual(name, name_3)
+        self.assertEqual(
+            sorted(storage.get_content_names()), sorted((name, name_3))
+        )
+
+        # Recently saved files are kept until they are old enough
+        self.assertFalse(storage.delete_unreferenced(name=name, age=60))
+        self.assertTrue(storage.exists(name))
+        self.assertTrue(storage.delete_unreferenced(name=name, age=0))
+        self.assertFalse(storage.exists(name))
+        self.assertFalse(storage.delete_unreferenced(name=name, age=0))
+
+    def test_compressed_storage(self):
+        self._test_storage(
+            storage=ContentAddressedCompressedStorage(location=self.location)
+        )
+
+    def test_file_based_storage(self):
+        storage = ContentAddressedStorage()
+        storage.location = self.location
+        self._test_storage(storage=storage)
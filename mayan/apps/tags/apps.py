@@ -10,6 +10,7 @@ from common import (
     MayanAppConfig, menu_facet, menu_object, menu_main, menu_multi_item,
     menu_sidebar
 )
+from document_indexing.classes import IndexRebuildPrefetch
 from documents.search import document_page_search, document_search
 from navigation import SourceColumn
 from rest_api.classes import APIEndPoint
@@ -56,6 +57,8 @@ class TagsApp(MayanAppConfig):
             lambda document: DocumentTag.objects.filter(documents=document)
         )
 
+        IndexRebuildPrefetch(lookup='tags')
+
         ModelPermission.register(
             model=Document, permissions=(
                 permission_tag_attach, permission_tag_remove,
@@ -93,6 +93,7 @@ python-magic==0.4.13
 pytz==2016.7
 requests==2.18.4 
 sh==1.12.11
+whoosh==2.7.4
 """.split()
 
 with open('README.rst') as f: